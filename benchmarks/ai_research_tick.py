@@ -0,0 +1,72 @@
+"""
+End-to-end cost of the weekly tick, GameState.advance_weeks, with a large AI grid: RP income, project work,
+completions, purchases (research path planner) and engineer allocation for every AI team.
+
+Run from the project root:  python -m benchmarks.ai_research_tick [--teams 59] [--weeks 24] [--repeat 5]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("F1_LOG_CONSOLE", "0")
+
+from src.database.team_database import TeamDatabase
+from src.managers.rd_manager import RDManager
+from src.models.game_state import GameState
+
+
+def build_league(ai_teams: int, seed: int = 0) -> GameState:
+    """A new game with the stock AI grid topped up to `ai_teams` teams by cloning the stock teams."""
+    random.seed(seed) # AI purchases fall back to random picks
+    state = GameState()
+    state.team_name = "Ferrari"
+    state.initialize_ai_grid()
+    for name in itertools.cycle(TeamDatabase.get_team_names()):
+        if len(state.ai_teams) >= ai_teams:
+            break
+        team = TeamDatabase.get_initial_team(name)
+        clone = f"{name} {len(state.ai_teams)}"
+        rd = RDManager(team["car"], is_ai=True)
+        rd.team_name = clone
+        rd.difficulty = state.difficulty
+        rd.update_availability()
+        state.ai_teams[clone] = {"car": team["car"], "drivers": team["drivers"], "rd_manager": rd}
+    return state
+
+
+def run(ai_teams: int, weeks: int, weekly: bool) -> float:
+    """Seconds to advance a fresh league by `weeks`, one advance_weeks(1) per week or a single advance_weeks(weeks)."""
+    state = build_league(ai_teams)
+    start = time.perf_counter()
+    if weekly:
+        for _ in range(weeks):
+            state.advance_weeks(1)
+    else:
+        state.advance_weeks(weeks)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, nargs="+", default=[9, 59])
+    parser.add_argument("--weeks", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    build_league(1) # Warm the shared caches (R&D tree, planner tables, calendar) so they aren't charged to a run
+
+    print(f"{args.weeks} weeks from a new game; best of {args.repeat}")
+    print(f"{'AI teams':>8} {'mode':<18} {'total ms':>9} {'ms / week':>10} {'us / team-week':>15}")
+    for ai_teams in args.teams:
+        for weekly, mode in ((True, "advance_weeks(1)"), (False, f"advance_weeks({args.weeks})")):
+            best = min(run(ai_teams, args.weeks, weekly) for _ in range(args.repeat))
+            per_week = best / args.weeks
+            print(f"{ai_teams:>8} {mode:<18} {best * 1e3:>9.1f} {per_week * 1e3:>10.2f} {per_week / ai_teams * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
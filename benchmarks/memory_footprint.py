@@ -0,0 +1,69 @@
+"""
+Memory footprint of a league (one GameState: player team, AI grid with R&D trees, staff market)
+and of bulk model objects, measured with tracemalloc.
+
+Run from the project root:  python -m benchmarks.memory_footprint [--leagues 10] [--staff 10000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("F1_LOG_CONSOLE", "0")
+
+from src.models.game_state import GameState
+from src.models.car.car import Car
+from src.models.personnel.driver import Driver
+from src.models.personnel.head_of_aero import HeadOfAerodynamics
+from src.simulators.race_simulator import RaceEntry
+
+
+def measure(build):
+    """Bytes still allocated after build() returns (its result is kept alive while measuring)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def build_league():
+    state = GameState()
+    state.initialize_ai_grid()
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--leagues", type=int, default=10)
+    parser.add_argument("--staff", type=int, default=10_000)
+    args = parser.parse_args()
+
+    build_league() # Warm the shared caches (R&D tree, calendar, team DB) so they aren't charged to a league
+
+    rows = [
+        ("league (GameState + AI grid)", 1, measure(build_league)),
+        (f"{args.leagues} leagues", args.leagues, measure(lambda: [build_league() for _ in range(args.leagues)])),
+        (f"{args.staff} drivers", args.staff,
+         measure(lambda: [Driver(f"Driver {i}", 1_000_000, 70, 85, 80, 75, age=25) for i in range(args.staff)])),
+        (f"{args.staff} department leads", args.staff,
+         measure(lambda: [HeadOfAerodynamics(f"Lead {i}", 1_000_000, 70, 80) for i in range(args.staff)])),
+        (f"{args.staff} cars", args.staff, measure(lambda: [Car() for _ in range(args.staff)])),
+    ]
+    driver, car = Driver("Probe", 1, 1, 1, 1, 1), Car()
+    rows.append((f"{args.staff} race entries", args.staff,
+                 measure(lambda: [RaceEntry(driver, car, "Probe") for _ in range(args.staff)])))
+
+    print(f"{'workload':<34} {'total KiB':>12} {'bytes / item':>14}")
+    for name, items, size in rows:
+        print(f"{name:<34} {size / 1024:>12.1f} {size / items:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-lap cost and race log memory of RaceSimulator.run_race as the grid grows, default engine against large-grid
+mode (incremental running order, lazily built standings), with the same seeded rolls so both give the same race.
+
+Run from the project root:  python -m benchmarks.race_scaling [--sizes 20 200 2000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("F1_LOG_CONSOLE", "0")
+
+from src.database.track_database import TrackDatabase
+from src.models.car.car import Car
+from src.models.personnel.driver import Driver
+from src.simulators.ai_strategy import build_ai_strategy, safe_stint_laps
+from src.simulators.race_simulator import RaceSimulator, RaceEntry
+
+
+def build_grid(size: int, track, seed: int = 0):
+    """`size` drivers with varied stats, two per car, each with an AI strategy."""
+    rng = random.Random(seed)
+    safe = safe_stint_laps(track)
+    grid = []
+    for i in range(size):
+        if i % 2 == 0:
+            car = Car()
+            for stat_path in Car.STAT_PATHS:
+                component, stat = stat_path.split(".")
+                setattr(getattr(car, component), stat, rng.randint(40, 95))
+        driver = Driver(f"Driver {i}", 1_000_000, 75, rng.randint(60, 99), rng.randint(60, 99), rng.randint(60, 99))
+        grid.append((driver, car, f"Team {i // 2}", build_ai_strategy(track, rng, safe)))
+    return grid
+
+
+def run(grid, track, large_grid: bool, seed: int):
+    entries = [RaceEntry(driver, car, team, strategy) for driver, car, team, strategy in grid]
+    simulator = RaceSimulator(entries, track, random.Random(seed), large_grid=large_grid)
+    start = time.perf_counter()
+    results = simulator.run_race()
+    return time.perf_counter() - start, results
+
+
+def log_size(grid, track, large_grid: bool) -> int:
+    """Bytes the race's result (mostly its lap log) keeps allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    _, results = run(grid, track, large_grid, 0)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    track = TrackDatabase.get_calendar()[0]
+    print(f"{track.name}, {track.laps} laps; best of {args.repeat}")
+    print(f"{'entries':>8} {'mode':<11} {'ms / lap':>10} {'us / entry-lap':>15} {'speedup':>8} {'log MiB':>9}")
+    for size in args.sizes:
+        grid = build_grid(size, track)
+        best = {}
+        for large_grid in (False, True):
+            timings = [run(grid, track, large_grid, seed)[0] for seed in range(args.repeat)]
+            best[large_grid] = min(timings) / track.laps
+        _, default = run(grid, track, False, 0)
+        _, large = run(grid, track, True, 0)
+        # Same rolls, same race: the large-grid log must read back exactly like the default one
+        if default["standings"] != large["standings"] or default["log"] != list(large["log"]):
+            raise SystemExit(f"large-grid results differ from the default engine at {size} entries")
+        for large_grid, mode in ((False, "default"), (True, "large_grid")):
+            per_lap = best[large_grid]
+            speedup = f"{best[False] / per_lap:.1f}x" if large_grid else ""
+            memory = log_size(grid, track, large_grid) / 2 ** 20
+            print(f"{size:>8} {mode:<11} {per_lap * 1e3:>10.3f} {per_lap / size * 1e6:>15.2f} {speedup:>8} {memory:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
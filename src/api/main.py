@@ -1,21 +1,35 @@
+import time
+_BOOT_STARTED = time.perf_counter()
+
 import os
-import sys
-from fastapi import FastAPI, HTTPException
+import hmac
+import importlib
+import json
+import functools
+import threading
+from fastapi import FastAPI, HTTPException, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-
-# Add the project root to the python path so 'from src...' works
-# We need to figure out the path properly based on directory structure
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-# Add desktop folder too just in case 
-sys.path.append("/Users/pierschatham/Desktop/projects/F1_TeamPrinciple")
+from typing import Optional, TYPE_CHECKING
 
-from src.models.game_state import GameState
+from src.utils.startup_report import StartupReport
+from src.utils.event_log import event_log
+from src.utils.metrics import metrics
+from src.utils.profiler import StackSampler, MemoryTracker, DEBUG_TOKEN
 from src.utils.save_load_manager import SaveLoadManager
-from src.simulators.race_simulator import RaceSimulator
 from src.database.track_database import TrackDatabase
-from src.models.personnel.driver import Driver
+from src.database.race_history import RaceHistory
+from src.database.telemetry_archive import TelemetryArchive
+
+# The game model (managers, simulators, R&D tree) and the catalogs' team/market data are imported in the startup
+# warm-up and in the handlers, so they aren't part of the "imports" phase of a cold start
+if TYPE_CHECKING:
+    from src.database.catalog import CatalogPayload
+    from src.models.game_state import GameState
+
+startup_report = StartupReport(origin=_BOOT_STARTED)
+startup_report.record("imports", _BOOT_STARTED, time.perf_counter())
 
 app = FastAPI(title="F1 Team Principal API", version="1.0.0")
 
@@ -29,36 +43,98 @@ app.add_middleware(
 )
 
 # Global in-memory game state
-# We keep a placeholder default state until 'load' or 'new_game' is called.
-game_state = GameState()
+# Nothing is built until 'load' or 'new_game' is called (or the last slot is recovered).
+game_state: Optional["GameState"] = None
 save_manager = SaveLoadManager()
 is_game_loaded = False # Useful flag for the frontend to know if menu is needed
+_state_lock = threading.Lock() # Serializes auto-recovery between the warm-up thread and the first requests
+
+_histories: dict[str, RaceHistory] = {} # Save slot -> its open race history store
+_histories_lock = threading.Lock()
+
+# Set F1_WARM_START=0 to skip recovering the last active slot in the background at boot
+WARM_START = os.environ.get("F1_WARM_START", "1") != "0"
 
 def _ensure_state(allow_missing=False):
     """Auto-recovers the GameState from disk if the backend restarts during a session."""
     global game_state, is_game_loaded
     if not is_game_loaded:
-        last_slot = save_manager.get_last_active_slot()
-        if last_slot:
-            data = save_manager.load_game(last_slot)
-            if data:
-                game_state = GameState()
-                game_state.load_from_dict(data)
-                is_game_loaded = True
+        with _state_lock:
+            if not is_game_loaded:
+                last_slot = save_manager.get_last_active_slot()
+                if last_slot:
+                    data = save_manager.load_game(last_slot)
+                    if data:
+                        from src.models.game_state import GameState
+                        recovered = GameState()
+                        recovered.load_from_dict(data)
+                        game_state = recovered
+                        is_game_loaded = True
                 
         if not is_game_loaded and not allow_missing:
             raise HTTPException(status_code=400, detail="No active game loaded and no save found.")
 
-# --- Dummy Rookie Pool generator ---
-def get_rookie_pool():
-    return [
-        Driver("Liam Lawson", 1_500_000, 78, 80, 75, 74),
-        Driver("Oliver Bearman", 1_200_000, 76, 79, 72, 70),
-        Driver("Kimi Antonelli", 1_800_000, 79, 83, 70, 71),
-        Driver("Jack Doohan", 1_000_000, 75, 76, 74, 75),
-        Driver("Theo Pourchaire", 1_100_000, 77, 78, 76, 74),
-        Driver("Felipe Drugovich", 1_000_000, 76, 75, 78, 77)
-    ]
+def _history(slot: Optional[str] = None) -> RaceHistory:
+    """
+    Race history of a save slot (default: the active one, without recovering its GameState).
+    Raises a 404 when there is no active slot.
+    """
+    slot = slot or (game_state.save_slot if is_game_loaded else save_manager.get_last_active_slot())
+    if not slot:
+        raise HTTPException(status_code=404, detail="No active save slot")
+    with _histories_lock:
+        if slot not in _histories:
+            _histories[slot] = RaceHistory(save_manager.history_path(slot))
+        return _histories[slot]
+
+def _telemetry(slot: Optional[str] = None) -> TelemetryArchive:
+    """Lap telemetry archive of a save slot (default: the active one). Raises a 404 when there is no active slot."""
+    slot = slot or (game_state.save_slot if is_game_loaded else save_manager.get_last_active_slot())
+    if not slot:
+        raise HTTPException(status_code=404, detail="No active save slot")
+    return TelemetryArchive(save_manager.telemetry_dir(slot))
+
+def _exclusive_state(endpoint):
+    """Runs an endpoint that replaces the global GameState under the state lock, so a warm-up can't clobber it."""
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with _state_lock:
+            return endpoint(*args, **kwargs)
+    return wrapper
+
+def _warm_last_slot():
+    """Background warm-up: imports the game model and parses the last active save before the first request needs them."""
+    with startup_report.phase("game_modules"):
+        importlib.import_module("src.models.game_state")
+    with startup_report.phase("warm_last_slot"):
+        try:
+            _ensure_state(allow_missing=True)
+        except Exception as e:
+            event_log.error("api", "warm_start_failed", f"Warm start failed: {e}")
+    event_log.info("api", "startup", startup_report.format())
+
+@app.on_event("startup")
+def _prebuild_reference_data():
+    """Builds the static catalogs and the R&D tree while the server boots instead of on the first request."""
+    with startup_report.phase("catalogs"):
+        from src.database.catalog import ReferenceCatalog
+        ReferenceCatalog.warm()
+    with startup_report.phase("rd_tree"):
+        from src.managers.rd_manager import RDManager
+        RDManager.load_tree_definitions()
+    startup_report.mark_ready()
+    
+    if WARM_START:
+        threading.Thread(target=_warm_last_slot, name="warm-start", daemon=True).start()
+    else:
+        event_log.info("api", "startup", startup_report.format())
+
+def _catalog_response(payload: "CatalogPayload", if_none_match: Optional[str]) -> Response:
+    """Serves a pre-serialized reference payload, answering 304 when the client already holds it."""
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if payload.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
 
 # --- Pydantic Models for Input ---
 class RaceSimRequest(BaseModel):
@@ -72,6 +148,11 @@ class RDAllocateRequest(BaseModel):
     node_id: str
     new_amount: int
 
+class RDOptimizeRequest(BaseModel):
+    horizon: int = 3
+    stat_weights: Optional[dict[str, float]] = None # e.g. {"aero.downforce": 2.0}. Defaults to all stats equal
+    apply: bool = False
+
 class HireRequest(BaseModel):
     slot: str
     staff_id: str
@@ -79,6 +160,19 @@ class HireRequest(BaseModel):
 class FireRequest(BaseModel):
     slot: str
 
+class WhatIfAction(BaseModel):
+    type: str # "hire", "fire", "start_project", "allocate", "advance_weeks" or "race"
+    slot: Optional[str] = None
+    staff_id: Optional[str] = None
+    node_id: Optional[str] = None
+    engineers: Optional[int] = None
+    weeks: int = 1
+    d1_strategy: Optional[list[dict]] = None # Race strategies default to the AI's plan for the track
+    d2_strategy: Optional[list[dict]] = None
+
+class WhatIfRequest(BaseModel):
+    actions: list[WhatIfAction]
+
 class LoadRequest(BaseModel):
     slot: str
 
@@ -105,10 +199,11 @@ def manual_save_game():
     return {"status": "success", "slot": game_state.save_slot}
 
 @app.post("/api/quit")
+@_exclusive_state
 def quit_game():
     """Unloads the game state and returns to main menu context."""
     global game_state, is_game_loaded
-    game_state = GameState()
+    game_state = None
     is_game_loaded = False
     save_manager.clear_last_active_slot()
     return {"status": "success"}
@@ -126,12 +221,70 @@ def get_game_state():
 def get_saves():
     return {"saves": save_manager.get_save_slots()}
 
+@app.get("/api/debug/startup")
+def get_startup_report():
+    """Per-phase timing breakdown of the last cold start."""
+    return startup_report.to_dict()
+
+@app.get("/api/metrics")
+def get_metrics(format: str = "prometheus"):
+    """In-process span latencies and counters, in Prometheus text format (or format=json for a summary)."""
+    if format == "json":
+        return metrics.snapshot()
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+_profile_lock = threading.Lock() # One profiling session at a time
+memory_tracker = MemoryTracker()
+
+def _require_debug_token(token: Optional[str]):
+    """Debug endpoints stay hidden unless F1_DEBUG_TOKEN is set and the caller sends it in X-Debug-Token."""
+    if not DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token.encode(), DEBUG_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid debug token.")
+
+@app.get("/api/debug/profile")
+def profile_server(seconds: float = 10.0, interval_ms: float = 5.0, include_idle: bool = False,
+                   format: str = "json", x_debug_token: Optional[str] = Header(None)):
+    """Samples every worker thread's stack for `seconds` and returns collapsed stacks (format=collapsed for flamegraph.pl)."""
+    _require_debug_token(x_debug_token)
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    try:
+        sampler = StackSampler(interval=max(1.0, interval_ms) / 1000)
+        report = sampler.sample(min(max(seconds, 0.1), 60.0), include_idle=include_idle)
+    finally:
+        _profile_lock.release()
+    if format == "collapsed":
+        return Response(content=report["collapsed"], media_type="text/plain")
+    return report
+
+@app.get("/api/debug/memory")
+def memory_snapshot_diff(seconds: float = 0.0, top: int = 25, stop: bool = False,
+                         x_debug_token: Optional[str] = Header(None)):
+    """
+    tracemalloc diff of the top allocating sites. The first call starts tracing; later calls report growth since
+    the previous one (or over `seconds`). stop=true ends tracing.
+    """
+    _require_debug_token(x_debug_token)
+    if stop:
+        memory_tracker.stop()
+        return {"status": "tracing_stopped"}
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    try:
+        return memory_tracker.diff(seconds=min(max(seconds, 0.0), 60.0), top=max(1, min(top, 200)))
+    finally:
+        _profile_lock.release()
+
 @app.post("/api/load")
+@_exclusive_state
 def load_game(req: LoadRequest):
     global game_state, is_game_loaded
     data = save_manager.load_game(req.slot)
     if not data:
         raise HTTPException(status_code=404, detail="Save not found")
+    from src.models.game_state import GameState
     game_state = GameState()
     game_state.load_from_dict(data)
     is_game_loaded = True
@@ -139,26 +292,26 @@ def load_game(req: LoadRequest):
     return {"status": "success"}
 
 @app.get("/api/teams/available")
-def get_available_teams():
-    from src.database.team_database import TeamDatabase
-    teams = TeamDatabase.get_initial_teams()
-    return {"teams": list(teams.keys())}
+def get_available_teams(if_none_match: Optional[str] = Header(None)):
+    from src.database.catalog import ReferenceCatalog
+    return _catalog_response(ReferenceCatalog.teams(), if_none_match)
     
 @app.get("/api/drivers/available")
-def get_available_drivers():
-    pool = get_rookie_pool()
-    return {"drivers": [d.to_dict() for d in pool]}
+def get_available_drivers(if_none_match: Optional[str] = Header(None)):
+    from src.database.catalog import ReferenceCatalog
+    return _catalog_response(ReferenceCatalog.rookies(), if_none_match)
 
 @app.post("/api/new_game/existing")
+@_exclusive_state
 def new_game_existing(req: NewGameExistingRequest):
     global game_state, is_game_loaded
     from src.database.team_database import TeamDatabase
+    from src.models.game_state import GameState
     
-    db = TeamDatabase.get_initial_teams()
-    if req.team_name not in db:
+    team_data = TeamDatabase.get_initial_team(req.team_name)
+    if team_data is None:
         raise HTTPException(status_code=404, detail="Team not found in DB")
         
-    team_data = db[req.team_name]
     game_state = GameState()
     game_state.team_name = req.team_name
     game_state.difficulty = req.difficulty.capitalize()
@@ -176,17 +329,22 @@ def new_game_existing(req: NewGameExistingRequest):
     game_state.save_slot = req.save_slot
     save_manager.set_last_active_slot(req.save_slot)
     save_manager.save_game(req.save_slot, game_state.to_dict())
+    _history(req.save_slot).clear() # A new career starts with an empty history
+    _telemetry(req.save_slot).clear()
     return {"status": "success"}
 
 @app.post("/api/new_game/custom")
+@_exclusive_state
 def new_game_custom(req: NewGameCustomRequest):
     global game_state, is_game_loaded
+    from src.models.game_state import GameState
     game_state = GameState()
     game_state.team_name = req.team_name
     game_state.difficulty = req.difficulty.capitalize()
     
-    # 1. Grab Drivers
-    pool = get_rookie_pool()
+    # 1. Grab Drivers (fresh instances, the cached catalog is only for display)
+    from src.database.market_database import MarketDatabase
+    pool = MarketDatabase.get_rookie_pool()
     d1 = next((d for d in pool if d.name == req.driver1_name), pool[0])
     d2 = next((d for d in pool if d.name == req.driver2_name), pool[1])
     game_state.drivers = [d1, d2]
@@ -221,13 +379,15 @@ def new_game_custom(req: NewGameCustomRequest):
     game_state.save_slot = req.save_slot
     save_manager.set_last_active_slot(req.save_slot)
     save_manager.save_game(req.save_slot, game_state.to_dict())
+    _history(req.save_slot).clear() # A new career starts with an empty history
+    _telemetry(req.save_slot).clear()
     return {"status": "success"}
 
 @app.get("/api/calendar")
-def get_calendar():
+def get_calendar(if_none_match: Optional[str] = Header(None)):
     """Returns the static 10-race calendar with track metadata."""
-    calendar = TrackDatabase.get_calendar()
-    return {"tracks": [t.to_dict() for t in calendar]}
+    from src.database.catalog import ReferenceCatalog
+    return _catalog_response(ReferenceCatalog.calendar(), if_none_match)
 
 @app.post("/api/season/advance")
 def advance_season():
@@ -238,28 +398,111 @@ def advance_season():
     # Calculate Prize Money
     team_points = game_state.championship_manager.constructor_standings.get(game_state.team_name, 0)
     prize_money = 50_000_000 + (team_points * 200_000)
-    game_state.finance_manager.balance += prize_money
+    game_state.stamp_finances()
+    game_state.finance_manager.add_funds(prize_money, "prize", f"Season {game_state.season} constructors' prize")
     
-    game_state.championship_manager.end_season()
-    game_state.process_yearly_aging()
-    game_state.season += 1
-    game_state.current_race_index = 0
+    game_state.own("championship_manager").end_season()
+    game_state.roll_over_season()
     save_manager.save_game(game_state.save_slot, game_state.to_dict())
     return {"status": "success", "prize_money": prize_money}
 
+MAX_PROJECTION_SEASONS = 100_000
+
+@app.get("/api/championship/projection")
+def project_championship(seasons: int = 10_000, workers: Optional[int] = None, seed: Optional[int] = None,
+                         stream: bool = False):
+    """
+    Monte Carlo projection of the rest of the season: title probabilities and expected final points per driver
+    and constructor. With stream=true the response is NDJSON progress lines followed by the result line.
+    """
+    _ensure_state()
+    if not 1 <= seasons <= MAX_PROJECTION_SEASONS:
+        raise HTTPException(status_code=400, detail=f"seasons must be between 1 and {MAX_PROJECTION_SEASONS}.")
+    calendar = TrackDatabase.get_calendar()
+    if game_state.current_race_index >= len(calendar):
+        return {"status": "season_complete"}
+
+    from src.simulators.season_projection import SeasonProjection
+    with metrics.span("championship.projection_compile"):
+        projection = SeasonProjection.from_game_state(game_state, calendar)
+
+    if stream:
+        def ndjson():
+            with metrics.span("championship.projection"):
+                for update in projection.run(seasons, workers, seed):
+                    yield json.dumps(update) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    with metrics.span("championship.projection"):
+        result = projection.project(seasons, workers, seed)
+    return {"status": "success", **result}
+
+MAX_SENSITIVITY_SAMPLES = 2_000
+
+@app.get("/api/analysis/sensitivity")
+def analyze_sensitivity(driver: int = 0, race_index: Optional[int] = None, samples: int = 200, step: int = 2,
+                        workers: Optional[int] = None, seed: Optional[int] = None, precision: Optional[float] = None,
+                        antithetic: bool = False):
+    """
+    Change in a player driver's expected finishing position and points per +1 of each car and driver stat at a
+    calendar race (default: the next one), from common-random-number finite differences. With `precision`,
+    `samples` is a cap and the run stops once every position derivative's 95% interval is that narrow.
+    """
+    _ensure_state()
+    if not 2 <= samples <= MAX_SENSITIVITY_SAMPLES:
+        raise HTTPException(status_code=400, detail=f"samples must be between 2 and {MAX_SENSITIVITY_SAMPLES}.")
+    if not 0 <= driver < len(game_state.drivers):
+        raise HTTPException(status_code=400, detail="Invalid driver index.")
+    if step < 1:
+        raise HTTPException(status_code=400, detail="step must be at least 1.")
+    if precision is not None and precision <= 0:
+        raise HTTPException(status_code=400, detail="precision must be positive.")
+    calendar = TrackDatabase.get_calendar()
+    race_index = game_state.current_race_index if race_index is None else race_index
+    if not 0 <= race_index < len(calendar):
+        raise HTTPException(status_code=400, detail="Invalid race index.")
+
+    from src.simulators.sensitivity import SensitivityAnalysis
+    analysis = SensitivityAnalysis.from_game_state(game_state, calendar[race_index], driver, step)
+    with metrics.span("analysis.sensitivity"):
+        result = analysis.run(samples, workers, seed, precision, antithetic)
+    return {"status": "success", **result}
+
 @app.post("/api/cheat/money")
 def cheat_money():
     """Adds $10M to budget."""
     _ensure_state()
+    game_state.stamp_finances()
     game_state.finance_manager.cheat_add_funds(10_000_000)
     save_manager.save_game(game_state.save_slot, game_state.to_dict())
     return {"status": "success", "new_balance": game_state.finance_manager.balance}
 
+@app.get("/api/finance")
+def get_finance_summary(season: Optional[int] = None):
+    """Balance, cost cap headroom and per-category totals for a season (default: the current one) and all-time."""
+    _ensure_state()
+    finance = game_state.finance_manager
+    return {
+        "status": "success",
+        "balance": finance.balance,
+        "cost_cap": finance.cost_cap,
+        "spent_under_cap": finance.spent_under_cap,
+        "cost_cap_headroom": finance.cost_cap_headroom(),
+        "season": finance.season_summary(season if season is not None else game_state.season),
+        "all_time": dict(finance.totals)
+    }
+
+@app.get("/api/finance/ledger")
+def get_finance_ledger(season: Optional[int] = None, category: Optional[str] = None, limit: int = 50):
+    """Most recent itemized transactions (seasons older than the kept window only exist as totals)."""
+    _ensure_state()
+    return {"status": "success", "transactions": game_state.finance_manager.transactions(season, category, limit)}
+
 @app.post("/api/rd/start")
 def start_rd_project(request: RDBuyRequest):
     """Attempts to start an R&D project."""
     _ensure_state()
-    if game_state.rd_manager.start_project(request.node_id):
+    if game_state.own("rd_manager").start_project(request.node_id):
         save_manager.save_game(game_state.save_slot, game_state.to_dict())
         return {"status": "success"}
         
@@ -269,139 +512,270 @@ def start_rd_project(request: RDBuyRequest):
 def allocate_rd_project(request: RDAllocateRequest):
     """Attempts to assign or unassign engineers to an active R&D project."""
     _ensure_state()
-    if game_state.rd_manager.allocate_engineers(request.node_id, request.new_amount):
+    if game_state.own("rd_manager").allocate_engineers(request.node_id, request.new_amount):
         save_manager.save_game(game_state.save_slot, game_state.to_dict())
         return {"status": "success"}
         
     raise HTTPException(status_code=400, detail="Not enough free engineers or node not active.")
 
+@app.post("/api/rd/optimize")
+def optimize_rd_allocation(request: RDOptimizeRequest):
+    """Suggests (and optionally applies) the engineer split that maximizes stat gain within the horizon."""
+    _ensure_state()
+    from src.managers.rd_allocator import EngineerAllocationSolver
+    
+    if request.horizon < 1:
+        raise HTTPException(status_code=400, detail="Horizon must be at least 1 race.")
+    plan = EngineerAllocationSolver.solve(game_state.rd_manager, request.horizon, request.stat_weights)
+    if request.apply:
+        if not game_state.own("rd_manager").apply_allocation(plan["allocation"]):
+            raise HTTPException(status_code=400, detail="Could not apply the suggested allocation.")
+        save_manager.save_game(game_state.save_slot, game_state.to_dict())
+    return {"status": "success", **plan}
+
+@app.get("/api/rd/plan")
+def plan_rd_path(k: int = 3, budget: Optional[int] = None, time_budget_ms: float = 100.0):
+    """Best k research orders for the rest of the season, scored by lap time saved on the remaining calendar."""
+    _ensure_state()
+    from src.managers.rd_planner import RDPathPlanner
+    
+    budget = game_state.rd_manager.resource_points if budget is None else budget
+    planner = RDPathPlanner(game_state.rd_manager, start_race_index=game_state.current_race_index)
+    plans = planner.plan(budget, k=max(1, min(k, 10)), time_budget_ms=min(time_budget_ms, 1000.0))
+    return {"status": "success", "budget": budget, "plans": plans}
+
+@app.get("/api/rd/impact")
+def get_rd_impact(nodes: Optional[str] = None, available_only: bool = False):
+    """
+    Expected lap-time change of each R&D node on each calendar track for the current car and leads, plus the
+    nodes ranked by race time gained over the rest of the season. nodes is a comma-separated id list.
+    """
+    _ensure_state()
+    rd = game_state.rd_manager
+    if nodes:
+        node_ids = [node_id for node_id in nodes.split(",") if node_id]
+        unknown = [node_id for node_id in node_ids if node_id not in rd.nodes]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown node(s): {', '.join(unknown)}")
+    elif available_only:
+        node_ids = list(rd.available_nodes)
+    else:
+        node_ids = list(rd.nodes)
+    
+    tire_management = sum(d.tire_management for d in game_state.drivers) / max(1, len(game_state.drivers))
+    with metrics.span("rd.impact_matrix"):
+        matrix = rd.impact_matrix(tire_management=tire_management)
+    return {
+        "status": "success",
+        **matrix.to_dict(node_ids),
+        "ranking": [{"node_id": node_id, "race_seconds_gained": round(gain, 3)}
+                    for node_id, gain in matrix.ranking(node_ids, game_state.current_race_index)]
+    }
+
+@app.get("/api/rd/eta")
+def get_rd_eta():
+    """Forecasts when each active R&D project completes at its current engineer allocation."""
+    _ensure_state()
+    calendar = TrackDatabase.get_calendar()
+    forecasts = game_state.rd_manager.get_project_forecasts()
+    for forecast in forecasts.values():
+        eta = forecast["races_remaining"]
+        # Projects are advanced after each race, so an ETA of 1 lands after the upcoming race
+        race_index = game_state.current_race_index + eta - 1 if eta is not None else None
+        forecast["completes_after_race_index"] = race_index
+        forecast["completes_after_track"] = calendar[race_index].name if race_index is not None and race_index < len(calendar) else None
+    return {"projects": forecasts, "next_completion_in": game_state.rd_manager.next_completion_in()}
+
+@app.get("/api/rd/activity")
+def get_rd_activity(after: int = 0, limit: int = 50, include_ai: bool = False):
+    """R&D activity feed (purchases and completions) from the event log. Poll with after=<last seq> for new events."""
+    _ensure_state()
+    limit = max(1, min(limit, 500))
+    if include_ai:
+        events = event_log.records("rd", after=after, limit=limit)
+    else:
+        events = event_log.records("rd", after=after, limit=limit, team=game_state.team_name)
+    return {"events": events, "last_seq": events[-1]["seq"] if events else after}
+
 # --- Staff Market Endpoints ---
 @app.get("/api/staff/market")
-def get_staff_market():
-    """Returns the available free agents."""
+def get_staff_market(pool_limit: int = 25):
+    """
+    Returns the listed free agents plus the top pool_limit generated agents per role by rating.
+    Browse the rest of the pool with /api/staff/market/query.
+    """
     _ensure_state()
-        
-    market = {}
-    for role, lst in game_state.staff_market.items():
-        market[role] = [s.to_dict() for s in lst]
-    return {"market": market}
+    return {"market": game_state.staff_market.to_dict(pool_limit=max(0, min(pool_limit, 200)))}
+
+@app.get("/api/staff/market/query")
+def query_staff_market(role: Optional[str] = None, sort: str = "rating", order: str = "desc", limit: int = 25,
+                       cursor: Optional[str] = None, min_rating: Optional[int] = None,
+                       min_expertise: Optional[int] = None, max_salary: Optional[int] = None,
+                       min_age: Optional[float] = None, max_age: Optional[float] = None):
+    """Filtered, sorted page of free agents. Pass next_cursor back as cursor to fetch the following page."""
+    _ensure_state()
+    try:
+        page = game_state.own("staff_market").query( # Returned generated agents get listed
+            role=role, sort=sort, descending=order != "asc", limit=max(1, min(limit, 200)), cursor=cursor,
+            min_rating=min_rating, min_expertise=min_expertise, max_salary=max_salary, min_age=min_age, max_age=max_age
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "results": [dict(s.to_dict(), role=game_state.staff_market.role_of(s.id)) for s in page["results"]],
+        "next_cursor": page["next_cursor"]
+    }
 
 @app.post("/api/staff/hire")
 def hire_staff(req: HireRequest):
     """Hires a staff member from the market and optionally fires/replaces the incumbent."""
     _ensure_state()
-    # Find the target staff in the market
-    target_role = None
-    target_staff = None
-    
-    for r, lst in game_state.staff_market.items():
-        for s in lst:
-            if s.id == req.staff_id:
-                target_role = r
-                target_staff = s
-                break
-        if target_staff:
-            break
-            
-    if not target_staff:
-        raise HTTPException(status_code=404, detail="Staff member not found in market.")
-        
-    # Determine the slot to replace
-    incumbent = None
-    if req.slot == "driver_0":
-        incumbent = game_state.drivers[0]
-    elif req.slot == "driver_1":
-        incumbent = game_state.drivers[1]
-    elif req.slot == "technical_director":
-        incumbent = game_state.technical_director
-    elif req.slot == "head_of_aero":
-        incumbent = game_state.head_of_aero
-    elif req.slot == "powertrain_lead":
-        incumbent = game_state.powertrain_lead
-    else:
-        raise HTTPException(status_code=400, detail="Invalid slot.")
-        
-    # Calculate costs
-    signing_bonus = int(target_staff.salary * 0.5)
-    severance = 0
-    if incumbent:
-        severance = int(incumbent.salary * incumbent.contract_length_years * 0.5)
-        
-    total_cost = signing_bonus + severance
-    
-    if not game_state.finance_manager.spend(total_cost):
-        raise HTTPException(status_code=400, detail=f"Cannot afford ${total_cost:,} total cost (Signing + Severance).")
-        
-    # Execute the swap
-    game_state.staff_market[target_role].remove(target_staff)
-    if incumbent:
-        # Put the incumbent back into the market
-        market_list_key = target_role # Will be the same type
-        if market_list_key not in game_state.staff_market:
-            game_state.staff_market[market_list_key] = []
-        game_state.staff_market[market_list_key].append(incumbent)
-        
-    # Assign the new staff
-    if req.slot == "driver_0":
-        game_state.drivers[0] = target_staff
-    elif req.slot == "driver_1":
-        game_state.drivers[1] = target_staff
-    elif req.slot == "technical_director":
-        game_state.technical_director = target_staff
-    elif req.slot == "head_of_aero":
-        game_state.head_of_aero = target_staff
-        game_state.relink_rd_manager()
-    elif req.slot == "powertrain_lead":
-        game_state.powertrain_lead = target_staff
-        game_state.relink_rd_manager()
+    try:
+        costs = game_state.hire_staff(req.slot, req.staff_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
         
     save_manager.save_game(game_state.save_slot, game_state.to_dict())
-    return {"status": "success", "signing_bonus": signing_bonus, "severance": severance}
+    return {"status": "success", **costs}
 
 @app.post("/api/staff/fire")
 def fire_staff(req: FireRequest):
     """Fires a staff member without directly replacing them (if allowed). Drivers cannot be fired without replacement."""
     _ensure_state()
-    if req.slot in ["driver_0", "driver_1"]:
-        raise HTTPException(status_code=400, detail="Drivers must be replaced via hiring, cannot be left empty.")
-        
-    incumbent = None
-    market_list_key = ""
-    
-    if req.slot == "technical_director":
-        incumbent = game_state.technical_director
-        market_list_key = "technical_directors"
-    elif req.slot == "head_of_aero":
-        incumbent = game_state.head_of_aero
-        market_list_key = "head_of_aero"
-    elif req.slot == "powertrain_lead":
-        incumbent = game_state.powertrain_lead
-        market_list_key = "powertrain_leads"
-    else:
-        raise HTTPException(status_code=400, detail="Invalid slot.")
-        
-    if not incumbent:
-        raise HTTPException(status_code=400, detail="Slot is already empty.")
-        
-    severance = int(incumbent.salary * incumbent.contract_length_years * 0.5)
-    if not game_state.finance_manager.spend(severance):
-        raise HTTPException(status_code=400, detail=f"Cannot afford ${severance:,} severance.")
-        
-    # Execute firing
-    game_state.staff_market[market_list_key].append(incumbent)
-    
-    if req.slot == "technical_director":
-        game_state.technical_director = None
-    elif req.slot == "head_of_aero":
-        game_state.head_of_aero = None
-        game_state.relink_rd_manager()
-    elif req.slot == "powertrain_lead":
-        game_state.powertrain_lead = None
-        game_state.relink_rd_manager()
+    try:
+        severance = game_state.fire_staff(req.slot)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
         
     save_manager.save_game(game_state.save_slot, game_state.to_dict())
     return {"status": "success", "severance": severance}
 
+# --- What-if Analysis ---
+MAX_WHAT_IF_ACTIONS = 50
+MAX_WHAT_IF_WEEKS = 52
+
+def _what_if_summary(state: "GameState") -> dict:
+    """The figures a what-if compares before and after its actions."""
+    from src.models.game_state import GameState
+    standings = state.championship_manager
+    return {
+        "season": state.season,
+        "race_index": state.current_race_index,
+        "balance": state.finance_manager.balance,
+        "cost_cap_headroom": state.finance_manager.cost_cap_headroom(),
+        "car": state.car.to_dict(),
+        "car_overall": state.car.get_overall_performance(),
+        "resource_points": state.rd_manager.resource_points,
+        "active_projects": dict(state.rd_manager.active_projects),
+        "team_points": standings.constructor_standings.get(state.team_name, 0),
+        "driver_points": {d.name: standings.driver_standings.get(d.name, 0) for d in state.drivers},
+        "staff": {slot: (member.name if member else None)
+                  for slot, member in ((slot, state.get_staff_in_slot(slot)) for slot in GameState.SLOT_ROLES)}
+    }
+
+def _apply_what_if(state: "GameState", action: WhatIfAction) -> dict:
+    """Applies one action to a forked state, mirroring the matching live endpoint. Raises ValueError/KeyError."""
+    if action.type == "hire":
+        return state.hire_staff(action.slot, action.staff_id)
+    if action.type == "fire":
+        return {"severance": state.fire_staff(action.slot)}
+    if action.type == "start_project":
+        if not state.own("rd_manager").start_project(action.node_id):
+            raise ValueError("Not enough Resource Points or invalid node.")
+        return {}
+    if action.type == "allocate":
+        if not state.own("rd_manager").allocate_engineers(action.node_id, action.engineers or 0):
+            raise ValueError("Not enough free engineers or node not active.")
+        return {}
+    if action.type == "advance_weeks":
+        if not 1 <= action.weeks <= MAX_WHAT_IF_WEEKS:
+            raise ValueError(f"weeks must be between 1 and {MAX_WHAT_IF_WEEKS}.")
+        state.advance_weeks(action.weeks)
+        return {}
+    if action.type == "race":
+        calendar = TrackDatabase.get_calendar()
+        if state.current_race_index >= len(calendar):
+            raise ValueError("The season is complete.")
+        from src.simulators.race_weekend import run_race_weekend
+        from src.simulators.ai_strategy import build_ai_strategy
+        track = calendar[state.current_race_index]
+        weekend = run_race_weekend(state, track, action.d1_strategy or build_ai_strategy(track),
+                                   action.d2_strategy or build_ai_strategy(track))
+        state.advance_week()
+        state.current_race_index += 1
+        return {"track": track.name, "results": [
+            {"driver": s["driver"], "team": s["team"], "dnf": s["dnf"]} for s in weekend["results"]["standings"]
+        ]}
+    raise ValueError(f"Unknown what-if action '{action.type}'.")
+
+@app.post("/api/what_if")
+def what_if(req: WhatIfRequest):
+    """
+    Plays a list of actions (hires, R&D, weeks, races) on a copy-on-write fork of the game and reports the state
+    before and after. The live game, its save, race history and event feed are untouched.
+    """
+    _ensure_state()
+    if not 1 <= len(req.actions) <= MAX_WHAT_IF_ACTIONS:
+        raise HTTPException(status_code=400, detail=f"Between 1 and {MAX_WHAT_IF_ACTIONS} actions are allowed.")
+    fork = game_state.fork()
+    before = _what_if_summary(fork)
+    steps = []
+    with metrics.span("what_if.run"), event_log.muted():
+        for index, action in enumerate(req.actions):
+            try:
+                steps.append({"type": action.type, **_apply_what_if(fork, action)})
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=f"Action {index} ({action.type}): {e.args[0]}")
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Action {index} ({action.type}): {e}")
+    return {"status": "success", "before": before, "after": _what_if_summary(fork), "steps": steps}
+
+
+@app.get("/api/history/races")
+def get_race_history(season: Optional[int] = None, track: Optional[str] = None, limit: int = 50):
+    """Stored races of the active save, most recent first, with their winners."""
+    return {"status": "success", "races": _history().races(season, track, limit)}
+
+@app.get("/api/history/races/{race_id}")
+def get_race_record(race_id: int):
+    """Full classification and lap summary of one stored race."""
+    race = _history().race(race_id)
+    if race is None:
+        raise HTTPException(status_code=404, detail="Race not found")
+    return {"status": "success", "race": race}
+
+@app.get("/api/history/drivers/{driver_name}")
+def get_driver_career(driver_name: str, season: Optional[int] = None):
+    """Career (or single season) stats for a driver: starts, wins, podiums, points, DNFs, average finish."""
+    return {"status": "success", "career": _history().driver_career(driver_name, season)}
+
+@app.get("/api/history/teams/{team_name}")
+def get_team_record(team_name: str, season: Optional[int] = None):
+    """The same aggregates across every car a team has entered."""
+    return {"status": "success", "record": _history().team_record(team_name, season)}
+
+@app.get("/api/history/head_to_head")
+def get_head_to_head(driver_a: str, driver_b: str, season: Optional[int] = None):
+    """Finishing comparison of two drivers over the races they both started."""
+    return {"status": "success", "head_to_head": _history().head_to_head(driver_a, driver_b, season)}
+
+@app.get("/api/race/{race_id}/laps")
+def get_race_laps(race_id: int, from_lap: Optional[int] = Query(None, alias="from"),
+                  to_lap: Optional[int] = Query(None, alias="to"), drivers: Optional[str] = None):
+    """
+    Per-lap telemetry of a stored race (lap and total time, position, wear, compound, stops) as columns per driver,
+    sliced to laps from..to and a comma-separated driver list, straight from the memory-mapped archive.
+    """
+    names = [name.strip() for name in drivers.split(",") if name.strip()] if drivers else None
+    try:
+        laps = _telemetry().read_laps(race_id, from_lap, to_lap, names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if laps is None:
+        raise HTTPException(status_code=404, detail="No telemetry for this race")
+    return {"status": "success", **laps}
 
 @app.get("/api/race/tire_estimates")
 def get_tire_estimates():
@@ -414,18 +788,19 @@ def get_tire_estimates():
     track = calendar[game_state.current_race_index]
     multiplier = track.tire_wear_multiplier
     
-    # We define the max "safe" wear as around 60%, before the cliff hits.
-    # Base wear is 2.1 per lap at 1.0x multiplier.
-    base_wear_per_lap = 2.1 * multiplier
-    
-    from src.models.car.tire.tire_compound import COMPOUNDS
+    # Laps until the tire model's safe wear (~65%, just past the cliff): the theoretical optimal stop window
+    from src.models.car.tire import tire_model
     
     estimates = {}
-    for name, compound in COMPOUNDS.items():
-        wear_per_lap = base_wear_per_lap * compound.wear_rate
-        # Calculate how many laps it takes to hit 65% wear (the theoretical optimal stop window)
-        estimated_laps = int(65.0 / wear_per_lap) if wear_per_lap > 0 else 0
-        estimates[name] = {"laps": estimated_laps, "pace": compound.pace_advantage}
+    for name in tire_model.COMPOUNDS:
+        table = tire_model.stint_table(name, multiplier, max_laps=track.laps)
+        estimated_laps = table.safe_laps()
+        estimates[name] = {
+            "laps": estimated_laps,
+            "pace": table.compound.pace_advantage,
+            # Pace gain minus wear losses over that stint (capped at race distance)
+            "stint_time_delta": round(table.stint_time(min(estimated_laps, track.laps)), 3)
+        }
         
     return {
         "status": "success",
@@ -436,6 +811,7 @@ def get_tire_estimates():
     }
 
 @app.post("/api/race/simulate")
+@metrics.timed("race.simulate")
 def simulate_race(request: RaceSimRequest):
     """Calculates Quali grid, runs the RaceSimulator, updates Championship points, and advances time."""
     _ensure_state()
@@ -445,94 +821,37 @@ def simulate_race(request: RaceSimRequest):
         return {"status": "season_complete"}
         
     track = calendar[game_state.current_race_index]
-    # Compile strategies for entries
-    player_d1_name = game_state.drivers[0].name
-    player_d2_name = game_state.drivers[1].name
-    
-    # We must rebuild entries with the explicit strategies injected
-    from src.simulators.race_simulator import RaceEntry
-    
-    entries = []
-    # Player Team
-    entries.append(RaceEntry(game_state.drivers[0], game_state.car, game_state.team_name, request.d1_strategy))
-    entries.append(RaceEntry(game_state.drivers[1], game_state.car, game_state.team_name, request.d2_strategy))
-    
-    # AI Teams (Adaptive strategy generation)
-    import random
-    from src.models.car.tire.tire_compound import COMPOUNDS
-    
-    base_wear_per_lap = 2.0 * track.tire_wear_multiplier
-    safe_soft = int(65.0 / (base_wear_per_lap * COMPOUNDS["Soft"].wear_rate))
-    safe_med = int(65.0 / (base_wear_per_lap * COMPOUNDS["Medium"].wear_rate))
-    safe_hard = int(65.0 / (base_wear_per_lap * COMPOUNDS["Hard"].wear_rate))
+    from src.simulators.race_weekend import run_race_weekend
+    weekend = run_race_weekend(game_state, track, request.d1_strategy, request.d2_strategy)
+    grid, results = weekend["grid"], weekend["results"]
     
-    for team_name, data in game_state.ai_teams.items():
-        # Generate varied AI strategies per driver
-        for d in data["drivers"]:
-            target_laps = track.laps
-            ai_strat = []
-            
-            # Simple AI rules: try to make it on a 1 or 2 stop, randomly choosing
-            num_stops = random.choice([1, 2, 2]) # Bias towards 2 stops for safety
-            
-            # 15% chance to do a really dumb strategy (staying out too long on Softs)
-            if random.random() < 0.15:
-                laps_first = min(target_laps - 1, int(safe_soft * 1.5))
-                ai_strat.append({"compound": "Soft", "laps": laps_first})
-                if target_laps - laps_first > 0:
-                    ai_strat.append({"compound": "Hard", "laps": target_laps - laps_first})
-            else:
-                if num_stops == 1:
-                    # Medium -> Hard
-                    laps_first = min(safe_med + random.randint(-2, 3), target_laps - 1)
-                    ai_strat.append({"compound": "Medium", "laps": laps_first})
-                    if target_laps - laps_first > 0:
-                        ai_strat.append({"compound": "Hard", "laps": target_laps - laps_first})
-                else:
-                    # Soft -> Medium -> Medium OR Soft -> Hard -> Soft
-                    if random.choice([True, False]):
-                        laps_first = min(safe_soft + random.randint(-1, 2), target_laps - 2)
-                        laps_second = min(safe_med + random.randint(-2, 2), (target_laps - laps_first) - 1)
-                        if laps_second <= 0: laps_second = 1
-                        ai_strat.append({"compound": "Soft", "laps": laps_first})
-                        ai_strat.append({"compound": "Medium", "laps": laps_second})
-                        if target_laps - laps_first - laps_second > 0:
-                            ai_strat.append({"compound": "Medium", "laps": target_laps - laps_first - laps_second})
-                    else:
-                        laps_first = min(safe_soft + random.randint(-1, 2), target_laps - 2)
-                        laps_second = min(safe_hard + random.randint(-2, 5), (target_laps - laps_first) - 1)
-                        if laps_second <= 0: laps_second = 1
-                        ai_strat.append({"compound": "Soft", "laps": laps_first})
-                        ai_strat.append({"compound": "Hard", "laps": laps_second})
-                        if target_laps - laps_first - laps_second > 0:
-                            ai_strat.append({"compound": "Soft", "laps": target_laps - laps_first - laps_second})
-            
-            entries.append(RaceEntry(d, data["car"], team_name, ai_strat))
-    
-    # Simple Quali pace sort
-    q_sim = RaceSimulator(entries, track)
-    for e in entries:
-        e.current_lap_time = q_sim._calculate_lap_time(e)
-    entries = sorted(entries, key=lambda e: e.current_lap_time)
-    
-    grid = [{"driver": e.driver.name, "team": e.team_name, "time": f"{e.current_lap_time:.3f}"} for e in entries]
-
-    # Full Simulation
-    simulator = RaceSimulator(entries, track)
-    results = simulator.run_race()
-    
-    # Payout Points
-    game_state.championship_manager.score_points(results["standings"])
+    with metrics.span("race.history_write"):
+        history = _history(game_state.save_slot)
+        replaced = history.race_id(game_state.season, game_state.current_race_index)
+        race_id = history.record_race(
+            game_state.season, game_state.current_race_index, track.name, track.laps,
+            grid, results["standings"], results["log"]
+        )
+    with metrics.span("race.telemetry_write"):
+        telemetry = _telemetry(game_state.save_slot)
+        telemetry.remove(replaced)
+        telemetry.write_race(race_id, results["log"])
     
     # Time progression (Player & AI)
-    game_state.advance_week()
+    with metrics.span("race.advance_week"):
+        game_state.advance_week()
     
     game_state.current_race_index += 1
     
-    save_manager.save_game(game_state.save_slot, game_state.to_dict())
+    with metrics.span("race.to_dict"):
+        state_data = game_state.to_dict()
+    with metrics.span("race.save_write"):
+        save_manager.save_game(game_state.save_slot, state_data)
+    metrics.inc("f1_race_simulations_total", track=track.name)
 
     return {
         "status": "success",
+        "race_id": race_id,
         "track": track.name,
         "grid": grid,
         "race_results": results["standings"],
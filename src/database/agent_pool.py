@@ -0,0 +1,205 @@
+import math
+import random
+from array import array
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from src.models.personnel.staff_member import StaffMember
+from src.models.personnel.driver import Driver
+from src.models.personnel.technical_director import TechnicalDirector
+from src.models.personnel.head_of_aero import HeadOfAerodynamics
+from src.models.personnel.powertrain_lead import PowertrainLead
+
+# Market roles in id order: a generated agent's id is "fa<season>-<role index>-<row>"
+ROLES = ("drivers", "technical_directors", "head_of_aero", "powertrain_leads")
+ROLE_CLASSES = (Driver, TechnicalDirector, HeadOfAerodynamics, PowertrainLead)
+
+# Role-specific stats, in constructor argument order
+ROLE_STATS = (
+    ("speed", "consistency", "tire_management"),
+    ("aero_expertise", "chassis_expertise", "powertrain_expertise"),
+    ("expertise",),
+    ("expertise",)
+)
+
+# Agents generated per role each season
+DEFAULT_POOL_SIZES: Dict[str, int] = {"drivers": 400, "technical_directors": 200, "head_of_aero": 200, "powertrain_leads": 200}
+
+FIRST_NAMES = (
+    "Alex", "Ben", "Carlos", "Daniel", "Elias", "Felix", "Gabriel", "Hugo", "Ivan", "Jonas", "Kai", "Luca",
+    "Marco", "Nico", "Oscar", "Pablo", "Quentin", "Rafael", "Sam", "Tomas", "Umberto", "Victor", "William",
+    "Xavier", "Yuki", "Zane", "Anna", "Beatriz", "Chloe", "Diana", "Elena", "Freya", "Greta", "Hanna",
+    "Isabel", "Julia", "Katrin", "Laura", "Maya", "Nadia", "Olivia", "Paula", "Rosa", "Sofia", "Tess", "Vera"
+)
+LAST_NAMES = (
+    "Adler", "Barros", "Castro", "Dufour", "Eriksen", "Fischer", "Garcia", "Hartmann", "Ito", "Jensen",
+    "Kowalski", "Lindqvist", "Moreau", "Novak", "Okafor", "Petrov", "Quinn", "Rossi", "Silva", "Tanaka",
+    "Ueda", "Varga", "Walsh", "Yilmaz", "Zimmer", "Bianchi", "Costa", "Dubois", "Evans", "Ferreira",
+    "Gomez", "Hughes", "Ibarra", "Jovanovic", "Keller", "Larsen", "Martin", "Nielsen", "Ortega", "Price",
+    "Ricci", "Schmidt", "Torres", "Vidal", "Weber", "Young"
+)
+
+# Per role: (age min, age mode, age max), (rating mean, rating sd at peak), peak age, salary at rating 70, salary growth per point
+PROFILES = (
+    ((17, 23, 38), (68.0, 7.0), 27.0, 600_000, 0.085),
+    ((38, 50, 68), (74.0, 8.0), 52.0, 2_500_000, 0.08),
+    ((32, 47, 66), (72.0, 8.0), 48.0, 1_200_000, 0.075),
+    ((32, 47, 66), (72.0, 8.0), 48.0, 1_200_000, 0.075)
+)
+
+
+def _clamp(value: float, low: int, high: int) -> int:
+    return max(low, min(high, int(round(value))))
+
+
+class AgentColumns:
+    """
+    One role's generated agents stored column-wise in typed arrays (a few dozen bytes per agent instead of
+    a few hundred for a StaffMember). Rows become real model objects only through materialize().
+    """
+
+    __slots__ = ("role_index", "prefix", "first", "last", "salary", "rating", "age", "contract", "stats", "taken")
+
+    def __init__(self, role_index: int, season: int):
+        self.role_index = role_index
+        self.prefix = f"fa{season}-{role_index}-"
+        self.first = array('H')
+        self.last = array('H')
+        self.salary = array('l')
+        self.rating = array('B')
+        self.age = array('B')
+        self.contract = array('B')
+        self.stats = tuple(array('B') for _ in ROLE_STATS[role_index])
+        self.taken = bytearray() # 1 once the row has left the pool (hired, or materialized into the market)
+
+    def __len__(self) -> int:
+        return len(self.rating)
+
+    def staff_id(self, row: int) -> str:
+        return f"{self.prefix}{row}"
+
+    def is_live(self, row: int) -> bool:
+        return 0 <= row < len(self.taken) and not self.taken[row]
+
+    def live_rows(self) -> Iterator[int]:
+        return (row for row, taken in enumerate(self.taken) if not taken)
+
+    def value(self, row: int, field: str) -> float:
+        """Column value for StaffMarket sorting/filtering, matching StaffMarket.sort_value on the materialized object."""
+        if field == "rating":
+            return self.rating[row]
+        if field == "salary":
+            return self.salary[row]
+        if field == "age":
+            return float(self.age[row])
+        if field == "expertise":
+            return max(stat[row] for stat in self.stats) if self.role_index == 1 else self.stats[0][row]
+        raise KeyError(field)
+
+    def fork(self) -> 'AgentColumns':
+        """Copy sharing the generated columns (never written after generation) with its own taken flags."""
+        clone = AgentColumns.__new__(AgentColumns)
+        for attr in AgentColumns.__slots__:
+            setattr(clone, attr, getattr(self, attr))
+        clone.taken = bytearray(self.taken)
+        return clone
+
+    def materialize(self, row: int) -> StaffMember:
+        """Builds the model object for a row (the pool itself is left untouched)."""
+        member = ROLE_CLASSES[self.role_index](
+            f"{FIRST_NAMES[self.first[row]]} {LAST_NAMES[self.last[row]]}",
+            self.salary[row], self.rating[row], *(stat[row] for stat in self.stats),
+            age=self.age[row], contract_length_years=self.contract[row]
+        )
+        member.id = self.staff_id(row)
+        return member
+
+
+class AgentPool:
+    """
+    A season's procedurally generated free agents, one AgentColumns per role.
+
+    Generation is seeded by (seed, season), so a save only needs those plus the rows already taken off the pool
+    (to_dict/from_dict) instead of every agent.
+    """
+
+    def __init__(self, seed: int, season: int, sizes: Optional[Dict[str, int]] = None):
+        self.seed = seed
+        self.season = season
+        self.sizes = dict(DEFAULT_POOL_SIZES if sizes is None else sizes)
+        self.columns = tuple(AgentColumns(i, season) for i in range(len(ROLES)))
+        rng = random.Random(f"free-agents:{seed}:{season}")
+        for role_index, role in enumerate(ROLES):
+            AgentPool._generate(rng, self.columns[role_index], self.sizes.get(role, 0))
+
+    @staticmethod
+    def _generate(rng: random.Random, columns: AgentColumns, count: int):
+        (age_min, age_mode, age_max), (rating_mean, rating_sd), peak_age, base_salary, salary_growth = PROFILES[columns.role_index]
+        gauss, triangular, randrange, uniform = rng.gauss, rng.triangular, rng.randrange, rng.uniform
+        stat_columns = columns.stats
+        for _ in range(count):
+            age = int(triangular(age_min, age_max, age_mode))
+            # Ability peaks around peak_age and tails off either side
+            rating = _clamp(gauss(rating_mean - abs(age - peak_age) * 0.35, rating_sd), 40, 97)
+            columns.first.append(randrange(len(FIRST_NAMES)))
+            columns.last.append(randrange(len(LAST_NAMES)))
+            columns.rating.append(rating)
+            columns.age.append(age)
+            columns.contract.append(randrange(1, 5))
+            for stat in stat_columns:
+                stat.append(_clamp(gauss(rating, 4.0), 30, 99))
+            # Log-normal-ish pay: exponential in rating with +-20% negotiation noise, rounded to 10k
+            salary = base_salary * math.exp(salary_growth * (rating - 70)) * uniform(0.8, 1.2)
+            columns.salary.append(int(round(salary, -4)))
+        columns.taken = bytearray(count)
+
+    def __len__(self) -> int:
+        return sum(len(columns) - sum(columns.taken) for columns in self.columns)
+
+    def locate(self, staff_id: str) -> Optional[Tuple[str, int]]:
+        """(role, row) of a live generated agent, or None if the id isn't one of this season's pool rows."""
+        prefix = f"fa{self.season}-"
+        if not staff_id.startswith(prefix):
+            return None
+        try:
+            role_index, row = (int(part) for part in staff_id[len(prefix):].split("-"))
+        except ValueError:
+            return None
+        if 0 <= role_index < len(ROLES) and self.columns[role_index].is_live(row):
+            return ROLES[role_index], row
+        return None
+
+    def role_columns(self, role: str) -> AgentColumns:
+        return self.columns[ROLES.index(role)]
+
+    def take(self, role: str, row: int):
+        self.role_columns(role).taken[row] = 1
+
+    def release(self, role: str, row: int):
+        self.role_columns(role).taken[row] = 0
+
+    def fork(self) -> 'AgentPool':
+        """Copy for a GameState fork: hires and views on either side don't show up on the other."""
+        clone = AgentPool.__new__(AgentPool)
+        clone.seed = self.seed
+        clone.season = self.season
+        clone.sizes = self.sizes
+        clone.columns = tuple(columns.fork() for columns in self.columns)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "season": self.season,
+            "sizes": self.sizes,
+            "taken": {role: [row for row, taken in enumerate(self.columns[i].taken) if taken]
+                      for i, role in enumerate(ROLES)}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AgentPool':
+        pool = cls(data["seed"], data["season"], data.get("sizes"))
+        for role, rows in data.get("taken", {}).items():
+            if role in ROLES:
+                for row in rows:
+                    pool.take(role, row)
+        return pool
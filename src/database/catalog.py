@@ -0,0 +1,63 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from src.database.track_database import TrackDatabase
+from src.database.team_database import TeamDatabase
+from src.database.market_database import MarketDatabase
+
+
+class CatalogPayload:
+    """A pre-serialized, immutable JSON response body together with its strong ETag."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, data: Dict[str, Any]):
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        object.__setattr__(self, "body", body)
+        object.__setattr__(self, "etag", '"' + hashlib.sha1(body).hexdigest() + '"')
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogPayload is read-only")
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True if an If-None-Match request header already names this payload (-> 304)."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == "*" or tag == self.etag:
+                return True
+        return False
+
+
+class ReferenceCatalog:
+    """
+    Process-wide cache of the static reference data served to the menus.
+    Each payload is built exactly once; the game itself still asks the databases for fresh, mutable instances.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def calendar() -> CatalogPayload:
+        return CatalogPayload({"tracks": [t.to_dict() for t in TrackDatabase.get_calendar()]})
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def teams() -> CatalogPayload:
+        return CatalogPayload({"teams": list(TeamDatabase.get_team_names())})
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def rookies() -> CatalogPayload:
+        return CatalogPayload({"drivers": [d.to_dict() for d in MarketDatabase.get_rookie_pool()]})
+
+    @staticmethod
+    def warm():
+        """Builds every payload up front so the first request is served straight from memory."""
+        ReferenceCatalog.calendar()
+        ReferenceCatalog.teams()
+        ReferenceCatalog.rookies()
@@ -7,6 +7,18 @@ from src.models.personnel.powertrain_lead import PowertrainLead
 class MarketDatabase:
     """Contains the initial pool of free agents available to hire."""
     
+    @staticmethod
+    def get_rookie_pool() -> List[Driver]:
+        """Fresh rookie Drivers offered when founding a custom team."""
+        return [
+            Driver("Liam Lawson", 1_500_000, 78, 80, 75, 74),
+            Driver("Oliver Bearman", 1_200_000, 76, 79, 72, 70),
+            Driver("Kimi Antonelli", 1_800_000, 79, 83, 70, 71),
+            Driver("Jack Doohan", 1_000_000, 75, 76, 74, 75),
+            Driver("Theo Pourchaire", 1_100_000, 77, 78, 76, 74),
+            Driver("Felipe Drugovich", 1_000_000, 76, 75, 78, 77)
+        ]
+
     @staticmethod
     def get_free_agents() -> Dict[str, List[Any]]:
         return {
@@ -0,0 +1,235 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Sequence
+
+from src.managers.championship_manager import ChampionshipManager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    id INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    track TEXT NOT NULL,
+    laps INTEGER NOT NULL,
+    recorded_at REAL NOT NULL,
+    UNIQUE (season, round)
+);
+CREATE INDEX IF NOT EXISTS races_by_track ON races (track, season);
+
+CREATE TABLE IF NOT EXISTS results (
+    race_id INTEGER NOT NULL REFERENCES races (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    grid INTEGER,
+    driver TEXT NOT NULL,
+    team TEXT NOT NULL,
+    total_time REAL NOT NULL,
+    gap REAL,
+    stops INTEGER NOT NULL,
+    dnf INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (race_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_driver ON results (driver, race_id);
+CREATE INDEX IF NOT EXISTS results_by_team ON results (team, race_id);
+
+CREATE TABLE IF NOT EXISTS lap_summary (
+    race_id INTEGER NOT NULL REFERENCES races (id) ON DELETE CASCADE,
+    lap INTEGER NOT NULL,
+    leader TEXT NOT NULL,
+    leader_gap REAL,
+    fastest_driver TEXT,
+    fastest_lap REAL,
+    pit_stops INTEGER NOT NULL,
+    retirements INTEGER NOT NULL,
+    PRIMARY KEY (race_id, lap)
+) WITHOUT ROWID;
+"""
+
+# Aggregate career columns shared by the driver and team queries
+_CAREER_COLUMNS = """
+    COUNT(*) AS starts,
+    COALESCE(SUM(r.position = 1), 0) AS wins,
+    COALESCE(SUM(r.position <= 3), 0) AS podiums,
+    COALESCE(SUM(r.points > 0), 0) AS points_finishes,
+    COALESCE(SUM(r.points), 0) AS points,
+    COALESCE(SUM(r.dnf), 0) AS dnfs,
+    COALESCE(SUM(r.grid = 1), 0) AS poles,
+    MIN(r.position) AS best_finish,
+    AVG(r.position) AS average_finish,
+    AVG(r.grid) AS average_grid,
+    COUNT(DISTINCT ra.season) AS seasons
+"""
+
+
+class RaceHistory:
+    """
+    Append-only store of every simulated race for one save slot, in its own SQLite file next to the save.
+
+    Races are keyed by (season, round). Re-simulating a round that is already stored (after reloading an older
+    save) supersedes that race. Results are indexed by driver and team, so the career and head-to-head queries
+    read only the matching rows and never need the GameState save.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock() # One connection, shared by the API's worker threads
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA foreign_keys = ON")
+            self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def clear(self):
+        """Drops every stored race (a new game started in this slot)."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM races")
+
+    # --- Recording ---
+
+    def record_race(self, season: int, round_index: int, track_name: str, laps: int,
+                    grid: Sequence[Dict[str, Any]], standings: Sequence[Dict[str, Any]],
+                    race_log: Sequence[Dict[str, Any]]) -> int:
+        """
+        Stores one race from the simulate_race outputs: the qualifying grid, the final standings and the
+        lap-by-lap log (reduced to one summary row per lap). Returns the race id.
+        """
+        grid_position = {(g["driver"], g["team"]): position for position, g in enumerate(grid, start=1)}
+        points_system = ChampionshipManager.POINTS_SYSTEM
+        winner_time = standings[0]["total_time"] if standings else 0.0
+
+        results = [(
+            position, grid_position.get((s["driver"], s["team"])), s["driver"], s["team"], s["total_time"],
+            None if s["dnf"] else s["total_time"] - winner_time, s["stops"], int(s["dnf"]),
+            points_system[position - 1] if position <= len(points_system) else 0
+        ) for position, s in enumerate(standings, start=1)]
+        laps_rows = [self._summarize_lap(lap) for lap in race_log]
+
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM races WHERE season = ? AND round = ?", (season, round_index))
+            race_id = self._db.execute(
+                "INSERT INTO races (season, round, track, laps, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                (season, round_index, track_name, laps, time.time())
+            ).lastrowid
+            self._db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [(race_id, *row) for row in results]
+            )
+            self._db.executemany(
+                "INSERT INTO lap_summary VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [(race_id, *row) for row in laps_rows]
+            )
+        return race_id
+
+    @staticmethod
+    def _summarize_lap(lap_data: Dict[str, Any]) -> tuple:
+        """(lap, leader, gap to second, fastest driver, fastest lap, pit stops so far, retirements so far)."""
+        standings = lap_data["standings"]
+        running = [s for s in standings if s["interval"] != "DNF"]
+        second_gap = running[1]["interval"] if len(running) > 1 else None
+        timed = [s for s in running if s["lap_time"] > 0]
+        fastest = min(timed, key=lambda s: s["lap_time"]) if timed else None
+        return (
+            lap_data["lap"], standings[0]["driver"], second_gap,
+            fastest["driver"] if fastest else None, fastest["lap_time"] if fastest else None,
+            sum(s["stops"] for s in standings), len(standings) - len(running)
+        )
+
+    # --- Queries ---
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def race_id(self, season: int, round_index: int) -> Optional[int]:
+        """Id of the stored race for (season, round), if any."""
+        found = self._query("SELECT id FROM races WHERE season = ? AND round = ?", (season, round_index))
+        return found[0]["id"] if found else None
+
+    def races(self, season: Optional[int] = None, track: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent races first, with their winners."""
+        clauses, params = [], []
+        if season is not None:
+            clauses.append("ra.season = ?"); params.append(season)
+        if track is not None:
+            clauses.append("ra.track = ?"); params.append(track)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"""
+            SELECT ra.id, ra.season, ra.round, ra.track, ra.laps, r.driver AS winner, r.team AS winning_team
+            FROM races ra JOIN results r ON r.race_id = ra.id AND r.position = 1
+            {where} ORDER BY ra.season DESC, ra.round DESC LIMIT ?
+        """, (*params, limit))
+
+    def race(self, race_id: int) -> Optional[Dict[str, Any]]:
+        """One race with its full classification and lap summary, or None if the id isn't stored."""
+        found = self._query("SELECT id, season, round, track, laps, recorded_at FROM races WHERE id = ?", (race_id,))
+        if not found:
+            return None
+        race = found[0]
+        race["results"] = self._query(
+            "SELECT position, grid, driver, team, total_time, gap, stops, dnf, points FROM results "
+            "WHERE race_id = ? ORDER BY position", (race_id,)
+        )
+        for result in race["results"]:
+            result["dnf"] = bool(result["dnf"])
+        race["laps_summary"] = self._query(
+            "SELECT lap, leader, leader_gap, fastest_driver, fastest_lap, pit_stops, retirements FROM lap_summary "
+            "WHERE race_id = ? ORDER BY lap", (race_id,)
+        )
+        return race
+
+    def _career(self, column: str, name: str, season: Optional[int]) -> Dict[str, Any]:
+        season_clause = "AND ra.season = ?" if season is not None else ""
+        params = (name, season) if season is not None else (name,)
+        stats = self._query(f"""
+            SELECT {_CAREER_COLUMNS}
+            FROM results r JOIN races ra ON ra.id = r.race_id
+            WHERE r.{column} = ? {season_clause}
+        """, params)[0]
+        if stats["average_finish"] is not None:
+            stats["average_finish"] = round(stats["average_finish"], 2)
+        if stats["average_grid"] is not None:
+            stats["average_grid"] = round(stats["average_grid"], 2)
+        stats[column] = name
+        stats["season"] = season
+        return stats
+
+    def driver_career(self, driver: str, season: Optional[int] = None) -> Dict[str, Any]:
+        """Starts, wins, podiums, points, DNFs, poles, best and average finish for a driver (all seasons or one)."""
+        career = self._career("driver", driver, season)
+        career["teams"] = [row["team"] for row in self._query(
+            "SELECT team FROM results WHERE driver = ? GROUP BY team ORDER BY MIN(race_id)", (driver,)
+        )]
+        return career
+
+    def team_record(self, team: str, season: Optional[int] = None) -> Dict[str, Any]:
+        """The same aggregates over every car a team entered (each car's start counts)."""
+        return self._career("team", team, season)
+
+    def head_to_head(self, driver_a: str, driver_b: str, season: Optional[int] = None) -> Dict[str, Any]:
+        """How two drivers finished in the races they both started."""
+        season_clause = "AND ra.season = ?" if season is not None else ""
+        params = (driver_b, driver_a, season) if season is not None else (driver_b, driver_a)
+        row = self._query(f"""
+            SELECT COUNT(*) AS races,
+                   COALESCE(SUM(a.position < b.position), 0) AS a_ahead,
+                   COALESCE(SUM(b.position < a.position), 0) AS b_ahead,
+                   COALESCE(SUM(a.points), 0) AS a_points,
+                   COALESCE(SUM(b.points), 0) AS b_points,
+                   AVG(b.position - a.position) AS average_position_delta
+            FROM results a
+            JOIN results b ON b.race_id = a.race_id AND b.driver = ?
+            JOIN races ra ON ra.id = a.race_id
+            WHERE a.driver = ? {season_clause}
+        """, params)[0]
+        delta = row.pop("average_position_delta")
+        return {
+            "driver_a": driver_a, "driver_b": driver_b, "season": season, "races": row["races"],
+            "ahead": {driver_a: row["a_ahead"], driver_b: row["b_ahead"]},
+            "points": {driver_a: row["a_points"], driver_b: row["b_points"]},
+            # Positive when driver_a usually finishes ahead
+            "average_position_delta": round(delta, 2) if delta is not None else None
+        }
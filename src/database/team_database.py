@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from src.models.car.car import Car
 from src.models.personnel.driver import Driver
 
@@ -13,8 +14,22 @@ class TeamDatabase:
         c.powertrain.power_output = power; c.powertrain.reliability = rel
         return c
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_team_names() -> Tuple[str, ...]:
+        """Grid order of the team names, built once per process (menus only need the names)."""
+        return tuple(TeamDatabase.get_initial_teams().keys())
+
+    @staticmethod
+    def get_initial_team(team_name: str) -> Optional[Dict[str, Any]]:
+        """Fresh, mutable car and drivers for a single team, or None if the name is unknown."""
+        if team_name not in TeamDatabase.get_team_names():
+            return None
+        return TeamDatabase.get_initial_teams()[team_name]
+
     @staticmethod
     def get_initial_teams() -> Dict[str, Dict[str, Any]]:
+        """Builds brand new mutable Car/Driver instances. Only call this when a new game needs them."""
         return {
             "Red Bull Racing": {
                 "budget": 140_000_000,
@@ -0,0 +1,135 @@
+import mmap
+import os
+import struct
+from typing import Dict, Any, Optional, Sequence
+
+from src.models.car.tire.tire_compound import COMPOUNDS
+
+MAGIC = b"F1LT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH") # magic, version, entries, laps
+NAME = struct.Struct("<48s48s") # driver, team (UTF-8, NUL padded)
+# One entry on one lap: cumulative time, lap time, tire wear, position, compound code, stops, flags
+RECORD = struct.Struct("<dffBBBB")
+FLAG_DNF = 1
+
+COMPOUND_CODES = {name: code for code, name in enumerate(COMPOUNDS)}
+COMPOUND_NAMES = list(COMPOUNDS)
+
+
+class TelemetryArchive:
+    """
+    Per-lap, per-entry race telemetry in fixed-width binary files, one file per stored race (named by its
+    RaceHistory id) in a directory beside the save.
+
+    File layout: header, then one NAME row per entry (the entry order of the race's first lap), then RECORD rows
+    lap-major, so (lap, entry) sits at a computable offset. Reads memory-map the file and unpack only the rows in
+    the requested lap window and driver subset; nothing is kept in RAM between requests.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, race_id: int) -> str:
+        return os.path.join(self.directory, f"{race_id}.lap")
+
+    def exists(self, race_id: int) -> bool:
+        return os.path.exists(self.path(race_id))
+
+    def remove(self, race_id: Optional[int]):
+        """Deletes a race's telemetry (superseded races, new games). Missing files are ignored."""
+        if race_id is not None:
+            try:
+                os.remove(self.path(race_id))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".lap"):
+                os.remove(os.path.join(self.directory, filename))
+
+    # --- Writing ---
+
+    def write_race(self, race_id: int, race_log: Sequence[Dict[str, Any]]):
+        """Archives the lap-by-lap standings RaceSimulator.run_race produced for its race_log."""
+        if not race_log:
+            return
+        entries = [(s["driver"], s["team"]) for s in race_log[0]["standings"]]
+        index = {entry: i for i, entry in enumerate(entries)}
+        body = bytearray(HEADER.size + NAME.size * len(entries) + RECORD.size * len(entries) * len(race_log))
+        HEADER.pack_into(body, 0, MAGIC, VERSION, len(entries), len(race_log))
+        offset = HEADER.size
+        for driver, team in entries:
+            NAME.pack_into(body, offset, driver.encode()[:48], team.encode()[:48])
+            offset += NAME.size
+
+        records_start = offset
+        for lap_number, lap in enumerate(race_log):
+            row = records_start + lap_number * len(entries) * RECORD.size
+            for position, s in enumerate(lap["standings"], start=1):
+                dnf = s["interval"] == "DNF"
+                RECORD.pack_into(
+                    body, row + index[(s["driver"], s["team"])] * RECORD.size,
+                    s["total_time"], s["lap_time"], s["wear"], min(position, 255),
+                    COMPOUND_CODES.get(s["compound"], 255), min(s["stops"], 255), FLAG_DNF if dnf else 0
+                )
+
+        # Written beside the target and renamed, so readers never map a half-written file
+        path = self.path(race_id)
+        with open(path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+
+    # --- Reading ---
+
+    def read_laps(self, race_id: int, first_lap: Optional[int] = None, last_lap: Optional[int] = None,
+                  drivers: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Columns per driver for laps first_lap..last_lap (1-based, inclusive, clamped to the race), optionally only
+        for the named drivers. Returns None when the race has no telemetry. Raises ValueError on an empty window.
+        """
+        try:
+            f = open(self.path(race_id), "rb")
+        except FileNotFoundError:
+            return None
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, version, entry_count, lap_count = HEADER.unpack_from(view, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Unsupported telemetry file for race {race_id}.")
+            first = max(1, first_lap or 1)
+            last = min(lap_count, last_lap or lap_count)
+            if first > last:
+                raise ValueError(f"Empty lap window {first_lap}..{last_lap} (race has {lap_count} laps).")
+
+            names = []
+            for i in range(entry_count):
+                driver, team = NAME.unpack_from(view, HEADER.size + i * NAME.size)
+                names.append((driver.rstrip(b"\0").decode(errors="ignore"), team.rstrip(b"\0").decode(errors="ignore")))
+            wanted = set(drivers) if drivers else None
+            selected = [i for i, (driver, _) in enumerate(names) if wanted is None or driver in wanted]
+
+            records_start = HEADER.size + NAME.size * entry_count
+            series = {i: {"team": names[i][1], "lap_time": [], "total_time": [], "position": [], "wear": [],
+                          "compound": [], "stops": [], "dnf": []} for i in selected}
+            for lap in range(first, last + 1):
+                row = records_start + (lap - 1) * entry_count * RECORD.size
+                for i in selected:
+                    total, lap_time, wear, position, compound, stops, flags = RECORD.unpack_from(view, row + i * RECORD.size)
+                    columns = series[i]
+                    columns["lap_time"].append(round(lap_time, 3))
+                    columns["total_time"].append(round(total, 3))
+                    columns["position"].append(position)
+                    columns["wear"].append(round(wear, 2))
+                    columns["compound"].append(COMPOUND_NAMES[compound] if compound < len(COMPOUND_NAMES) else None)
+                    columns["stops"].append(stops)
+                    columns["dnf"].append(bool(flags & FLAG_DNF))
+
+        return {
+            "race_id": race_id,
+            "laps": lap_count,
+            "from": first,
+            "to": last,
+            "drivers": {names[i][0]: series[i] for i in selected}
+        }
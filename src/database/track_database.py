@@ -1,11 +1,17 @@
-from typing import List
+from functools import lru_cache
+from typing import Tuple
 from src.models.world.track import Track
 
 class TrackDatabase:
     """Hardcoded 10-race calendar with varying characteristics for MVP."""
     
     @staticmethod
-    def get_calendar() -> List[Track]:
+    @lru_cache(maxsize=None)
+    def get_calendar() -> Tuple[Track, ...]:
+        """
+        Builds the calendar once per process and returns the shared, read-only tuple.
+        Tracks are reference data: callers must never mutate them.
+        """
         calendar = [
             Track("Bahrain International Circuit", "Bahrain", laps=57, base_lap_time=93.0, 
                   aero_weight=1.0, chassis_weight=1.0, powertrain_weight=1.0),
@@ -88,4 +94,4 @@ class TrackDatabase:
         for t in calendar:
             t.tire_wear_multiplier = wear_multipliers.get(t.name, 1.0)
             
-        return calendar
+        return tuple(calendar)
@@ -0,0 +1,162 @@
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.managers.rd_manager import RDManager
+
+
+class AIResearchEngine:
+    """
+    Batched weekly R&D for every AI team at once.
+
+    Invested work, workloads and effective engineer rates live in flat team x node arrays (cell = team * node_count
+    + node), and each team keeps the list of its in-progress cells. A week is two passes over those: RP income for
+    every team and work for every in-progress cell (plain loops over the arrays, no per-node objects touched). Only
+    teams that actually have an event this week - a project crossing its workload, enough RP to buy a node, or idle
+    engineers - are handed back to their RDManager, which runs the exact same completion, purchase and allocation
+    code as the per-object path, after which only that team's in-progress cells are reloaded. Outcomes (including
+    the order of random draws) are therefore identical to calling advance_time(1) + update_availability() team by
+    team.
+
+    The arrays are built once per set of managers and kept across calls (GameState holds the engine): sync() picks
+    up RP income and balance changes, and serves() tells whether the managers are still the same objects. The
+    managers must not be changed in place outside the engine; forks, loads and new grids replace them instead.
+    Call flush() before reading the managers again; until then RP and invested work are only current in the arrays.
+
+    The array passes are a small part of a week: most of it goes to the handed-back teams' purchases (a path planner
+    run each), engineer allocations and event logging. benchmarks/ai_research_tick.py measures about 5 ms a week for
+    59 AI teams, roughly twice the random-pick AI this replaced.
+    """
+
+    def __init__(self, teams: Sequence[Tuple['RDManager', int]]):
+        """teams: (AI RDManager, weekly RP income) pairs, in the order the per-object loop would visit them."""
+        self.managers: List['RDManager'] = [rd for rd, _ in teams]
+        self.income = array('q', (weekly_rp for _, weekly_rp in teams))
+        self.rp = array('q', (rd.resource_points for rd in self.managers))
+
+        self.node_ids: List[str] = list(self.managers[0].nodes) if self.managers else []
+        self.node_index: Dict[str, int] = {node_id: n for n, node_id in enumerate(self.node_ids)}
+        self.node_count = len(self.node_ids)
+        cells = len(self.managers) * self.node_count
+        self.invested = array('d', bytes(8 * cells))
+        self.workload = array('d', bytes(8 * cells))
+        self.rate = array('q', bytes(8 * cells))
+        self.purchase_threshold = array('d', bytes(8 * len(self.managers)))
+        self.idle_engineers = bytearray(len(self.managers)) # 1 if the AI would reallocate idle engineers
+        self.active_cells: List[List[int]] = [[] for _ in self.managers] # In-progress cells per team
+
+        for t in range(len(self.managers)):
+            self._load_team(t)
+
+    def serves(self, managers: Sequence['RDManager']) -> bool:
+        """Whether the engine was built for exactly these manager objects, in this order."""
+        return len(managers) == len(self.managers) and all(a is b for a, b in zip(managers, self.managers))
+
+    def sync(self, incomes: Sequence[int]):
+        """Picks up each team's current weekly RP income and RP balance (staff changes move the income)."""
+        for t, rd in enumerate(self.managers):
+            self.income[t] = incomes[t]
+            self.rp[t] = rd.resource_points
+
+    # --- Loading / flushing rows between the arrays and the RDManager objects ---
+
+    def _load_team(self, t: int):
+        """Reloads a team's in-progress cells and purchase triggers after its RDManager ran."""
+        rd = self.managers[t]
+        base = t * self.node_count
+        cells = []
+        for node_id, engineers in rd.active_projects.items():
+            node = rd.nodes[node_id]
+            cell = base + self.node_index[node_id]
+            self.invested[cell] = node.invested_work
+            self.workload[cell] = node.base_workload
+            self.rate[cell] = rd.effective_engineers(engineers)
+            cells.append(cell)
+        self.active_cells[t] = cells
+        self.rp[t] = rd.resource_points
+
+        # Same trigger conditions as RDManager.next_ai_action_in / _auto_select_project
+        self.purchase_threshold[t] = math.inf
+        self.idle_engineers[t] = 0
+        if rd.available_nodes:
+            self.purchase_threshold[t] = max(101, min(node.rp_cost for node in rd.available_nodes.values()))
+            if rd.active_projects and rd.total_engineers - sum(rd.active_projects.values()) > 0:
+                self.idle_engineers[t] = 1
+
+    def _flush_team(self, t: int):
+        rd = self.managers[t]
+        rd.resource_points = self.rp[t]
+        base = t * self.node_count
+        for node_id in rd.active_projects:
+            rd.nodes[node_id].invested_work = self.invested[base + self.node_index[node_id]]
+
+    def flush(self):
+        """Writes RP and invested work back into every RDManager."""
+        for t in range(len(self.managers)):
+            self._flush_team(t)
+
+    # --- Time advancement ---
+
+    def next_event_in(self) -> Optional[int]:
+        """Weeks until any team has something to do (a completion, a purchase or idle engineers), or None."""
+        best: Optional[int] = None
+        for cells in self.active_cells:
+            for cell in cells:
+                remaining = self.workload[cell] - self.invested[cell]
+                rate = self.rate[cell]
+                if remaining <= 0:
+                    return 1
+                if rate > 0:
+                    eta = math.ceil(remaining / rate)
+                    if best is None or eta < best:
+                        best = eta
+        for t in range(len(self.managers)):
+            if self.idle_engineers[t]:
+                return 1
+            threshold = self.purchase_threshold[t]
+            if threshold == math.inf:
+                continue
+            if self.rp[t] + self.income[t] >= threshold:
+                return 1
+            if self.income[t] > 0:
+                eta = math.ceil((threshold - self.rp[t]) / self.income[t])
+                if best is None or eta < best:
+                    best = eta
+        return best
+
+    def advance(self, weeks: int = 1):
+        """
+        Advances every team by `weeks` in one batched step. Callers must not skip past an event:
+        use weeks=1, or at most next_event_in() (GameState.advance_weeks does this).
+        """
+        if weeks <= 0 or not self.managers:
+            return
+        # 1. RP income for every team
+        income = self.income
+        rp = self.rp
+        for t in range(len(rp)):
+            rp[t] += income[t] * weeks
+
+        # 2. Work for every in-progress cell, noting teams with a completion
+        invested, rate, workload = self.invested, self.rate, self.workload
+        event_teams = set()
+        for t, cells in enumerate(self.active_cells):
+            for cell in cells:
+                invested[cell] += rate[cell] * weeks
+                if invested[cell] >= workload[cell]:
+                    event_teams.add(t)
+
+        # 3. Teams able to buy a node or with idle engineers
+        threshold = self.purchase_threshold
+        for t in range(len(rp)):
+            if self.idle_engineers[t] or rp[t] >= threshold[t]:
+                event_teams.add(t)
+
+        # 4. Hand eventful teams to their RDManager, in the same order as the per-object loop
+        for t in sorted(event_teams):
+            self._flush_team(t)
+            rd = self.managers[t]
+            rd.advance_time(0) # Work is already applied; this completes anything over its workload
+            rd.update_availability()
+            self._load_team(t)
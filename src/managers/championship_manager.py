@@ -52,6 +52,14 @@ class ChampionshipManager:
         self.driver_standings = {}
         self.constructor_standings = {}
 
+    def fork(self) -> 'ChampionshipManager':
+        """Independent copy of the standings for a GameState fork."""
+        clone = ChampionshipManager.__new__(ChampionshipManager)
+        clone.__dict__.update(self.__dict__)
+        clone.driver_standings = dict(self.driver_standings)
+        clone.constructor_standings = dict(self.constructor_standings)
+        return clone
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "driver_standings": self.driver_standings,
@@ -1,58 +1,169 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from src.utils.event_log import event_log
+
+# Ledger categories. Spending is recorded as negative amounts, income as positive.
+CATEGORIES = ("salary", "signing_bonus", "severance", "prize", "development", "cheat", "other")
+
+# Seasons of itemized transactions a save keeps; older seasons survive only as per-category totals
+KEEP_SEASONS = 2
+
 
 class FinanceManager:
-    """Manages the team's balance and adherence to the cost cap."""
-    
+    """
+    Manages the team's balance and adherence to the cost cap, and keeps a ledger of every transaction.
+
+    Each ledger entry is (season, race, category, amount, note). Running totals per category, overall and per
+    season, are updated as entries are recorded, so dashboard and cost-cap figures never rescan the ledger.
+    compact() drops the itemized entries of old seasons while their season totals stay.
+    """
+
     def __init__(self, initial_budget: int = 140_000_000, cost_cap: int = 140_000_000):
         self.balance = initial_budget
         self.cost_cap = cost_cap
         self.spent_under_cap = 0 # Track how much of the balance spent counts towards the cap
-        
-    def spend(self, amount: int, counts_towards_cap: bool = True) -> bool:
+
+        self.ledger: List[Tuple[int, int, str, int, str]] = []
+        self.season = 1 # Stamp for new entries; GameState keeps it in step with the calendar
+        self.race_index = 0
+        self.totals: Dict[str, int] = {}
+        self.season_totals: Dict[int, Dict[str, int]] = {}
+        self.compacted_through = 0 # Seasons up to and including this one are summaries only
+
+    def set_clock(self, season: int, race_index: int):
+        """Stamps subsequent transactions with this season and race."""
+        self.season = season
+        self.race_index = race_index
+
+    def _record(self, category: str, amount: int, note: str = ""):
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown ledger category '{category}'.")
+        self.ledger.append((self.season, self.race_index, category, amount, note))
+        self._add_total(self.season, category, amount)
+
+    def _add_total(self, season: int, category: str, amount: int):
+        self.totals[category] = self.totals.get(category, 0) + amount
+        season_totals = self.season_totals.setdefault(season, {})
+        season_totals[category] = season_totals.get(category, 0) + amount
+
+    def charge(self, items: Sequence[Tuple[int, str, str]], counts_towards_cap: bool = True) -> bool:
         """
-        Attempts to spend money. 
+        Pays several costs as one all-or-nothing spend, recording each (amount, category, note) item separately.
         Returns True if successful, False if insufficient funds or it breaches the cap.
         """
+        amount = sum(item[0] for item in items)
         if amount > self.balance:
-            print("Insufficient funds!")
+            event_log.warning("finance", "insufficient_funds", "Insufficient funds!", amount=amount, balance=self.balance)
             return False
-            
+
         if counts_towards_cap and (self.spent_under_cap + amount) > self.cost_cap:
-            print("Warning: This would breach the cost cap!")
+            event_log.warning("finance", "cost_cap_breach", "Warning: This would breach the cost cap!",
+                              amount=amount, spent_under_cap=self.spent_under_cap, cost_cap=self.cost_cap)
             return False
-            
+
         self.balance -= amount
         if counts_towards_cap:
             self.spent_under_cap += amount
-            
+        for item_amount, category, note in items:
+            self._record(category, -item_amount, note)
+
         return True
-        
-    def add_funds(self, amount: int):
+
+    def spend(self, amount: int, counts_towards_cap: bool = True, category: str = "development", note: str = "") -> bool:
+        """
+        Attempts to spend money.
+        Returns True if successful, False if insufficient funds or it breaches the cap.
+        """
+        return self.charge([(amount, category, note)], counts_towards_cap)
+
+    def add_funds(self, amount: int, category: str = "prize", note: str = ""):
         """Adds funds to the balance (e.g., from sponsorships/prize money)."""
         self.balance += amount
-        
+        self._record(category, amount, note)
+
     def cheat_set_cost_cap(self, new_cap: int):
         """Cheat menu function to alter the cost cap mid-game."""
         self.cost_cap = new_cap
-        
+
     def cheat_add_funds(self, amount: int):
         """Cheat menu function to add infinite money."""
-        self.balance += amount
+        self.add_funds(amount, "cheat")
+
+    # --- Aggregates (O(1) in the ledger size) ---
+
+    def category_total(self, category: str, season: Optional[int] = None) -> int:
+        """Net amount booked to a category, all-time or for one season (negative = money spent)."""
+        if season is None:
+            return self.totals.get(category, 0)
+        return self.season_totals.get(season, {}).get(category, 0)
+
+    def season_summary(self, season: Optional[int] = None) -> Dict[str, Any]:
+        """Per-category totals, income, spending and net for a season (default: the current one)."""
+        season = self.season if season is None else season
+        by_category = dict(self.season_totals.get(season, {}))
+        return {
+            "season": season,
+            "by_category": by_category,
+            "income": sum(v for v in by_category.values() if v > 0),
+            "spending": -sum(v for v in by_category.values() if v < 0),
+            "net": sum(by_category.values()),
+            "itemized": season > self.compacted_through
+        }
+
+    def cost_cap_headroom(self) -> int:
+        return self.cost_cap - self.spent_under_cap
+
+    def transactions(self, season: Optional[int] = None, category: Optional[str] = None,
+                     limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent itemized entries first, optionally filtered."""
+        found = []
+        for entry_season, race, entry_category, amount, note in reversed(self.ledger):
+            if (season is None or entry_season == season) and (category is None or entry_category == category):
+                found.append({"season": entry_season, "race": race, "category": entry_category,
+                              "amount": amount, "note": note})
+                if len(found) >= limit:
+                    break
+        return found
+
+    def compact(self, keep_seasons: int = KEEP_SEASONS):
+        """Drops itemized entries older than the last keep_seasons seasons, leaving their season totals."""
+        cutoff = self.season - keep_seasons
+        if cutoff > self.compacted_through:
+            self.ledger = [entry for entry in self.ledger if entry[0] > cutoff]
+            self.compacted_through = cutoff
+
+    def fork(self) -> 'FinanceManager':
+        """Independent copy for a GameState fork (ledger entries are immutable tuples and stay shared)."""
+        clone = FinanceManager.__new__(FinanceManager)
+        clone.__dict__.update(self.__dict__)
+        clone.ledger = list(self.ledger)
+        clone.totals = dict(self.totals)
+        clone.season_totals = {season: dict(totals) for season, totals in self.season_totals.items()}
+        return clone
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize for save/load."""
         return {
             "balance": self.balance,
             "cost_cap": self.cost_cap,
-            "spent_under_cap": self.spent_under_cap
+            "spent_under_cap": self.spent_under_cap,
+            "ledger": [list(entry) for entry in self.ledger],
+            "season_totals": {str(season): dict(totals) for season, totals in self.season_totals.items()},
+            "compacted_through": self.compacted_through,
+            "clock": [self.season, self.race_index]
         }
-        
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FinanceManager':
         """Deserialize from save/load."""
         manager = cls(
-            initial_budget=data.get('balance', 140_000_000), 
+            initial_budget=data.get('balance', 140_000_000),
             cost_cap=data.get('cost_cap', 140_000_000)
         )
         manager.spent_under_cap = data.get('spent_under_cap', 0)
+        manager.ledger = [tuple(entry) for entry in data.get('ledger', [])]
+        for season, totals in data.get('season_totals', {}).items():
+            for category, amount in totals.items():
+                manager._add_total(int(season), category, amount)
+        manager.compacted_through = data.get('compacted_through', 0)
+        manager.set_clock(*data.get('clock', [1, 0]))
         return manager
@@ -0,0 +1,113 @@
+import math
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+
+from src.managers.rd_effects import EffectTable
+
+if TYPE_CHECKING:
+    from src.managers.rd_manager import RDManager
+
+# Every car stat an R&D effect can touch, weighted equally unless the caller says otherwise
+DEFAULT_STAT_WEIGHTS: Dict[str, float] = {
+    "aero.downforce": 1.0,
+    "aero.drag_efficiency": 1.0,
+    "chassis.weight_reduction": 1.0,
+    "chassis.tire_preservation": 1.0,
+    "powertrain.power_output": 1.0,
+    "powertrain.reliability": 1.0
+}
+
+
+class EngineerAllocationSolver:
+    """
+    Splits an RDManager's engineers across its active projects to maximize the weighted stat gain
+    that actually lands within a horizon of N races.
+
+    A project only pays out when advance_time pushes invested_work over base_workload, so each project
+    has an exact minimum integer crew (after the AI difficulty multiplier) that finishes it in time.
+    Choosing which projects to crew is then a 0/1 knapsack over engineers, solved by DP over the reachable
+    crew totals - at most O(projects x engineers), and only a few entries for the usual handful of projects.
+    """
+
+    @staticmethod
+    def project_value(rd_manager: 'RDManager', node_id: str, stat_weights: Dict[str, float]) -> float:
+        """Weighted stat gain of completing a node, department lead bonuses included."""
+        return EffectTable.dot(rd_manager.get_effect_vector(rd_manager.nodes[node_id]), stat_weights)
+
+    @staticmethod
+    def minimum_crew(rd_manager: 'RDManager', remaining_work: float, horizon: int) -> Optional[int]:
+        """Smallest whole number of engineers that completes `remaining_work` within `horizon` races."""
+        if remaining_work <= 0:
+            return 0
+        if horizon <= 0:
+            return None
+        # Invert the (possibly truncating) difficulty multiplier: start from the unmodified crew, then fix up
+        crew = max(1, math.ceil(remaining_work / horizon))
+        while crew > 1 and rd_manager.effective_engineers(crew - 1) * horizon >= remaining_work:
+            crew -= 1
+        while rd_manager.effective_engineers(crew) * horizon < remaining_work:
+            crew += 1
+            if crew > rd_manager.total_engineers:
+                return None
+        return crew
+
+    @staticmethod
+    def solve(rd_manager: 'RDManager', horizon: int = 3,
+              stat_weights: Optional[Dict[str, float]] = None,
+              total_engineers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns {"allocation": {node_id: engineers}, "completes": [node_ids finishing within horizon],
+                 "expected_gain": weighted stat gain of those completions}.
+        Every engineer is assigned as long as at least one project is active.
+        """
+        weights = stat_weights or DEFAULT_STAT_WEIGHTS
+        capacity = rd_manager.total_engineers if total_engineers is None else total_engineers
+
+        # 1. Cost (minimum crew) and value of every project that can land inside the horizon
+        projects: List[Dict[str, Any]] = []
+        for node_id in rd_manager.active_projects:
+            node = rd_manager.nodes[node_id]
+            remaining = node.base_workload - node.invested_work
+            projects.append({
+                "node_id": node_id,
+                "remaining": remaining,
+                "value": EngineerAllocationSolver.project_value(rd_manager, node_id, weights),
+                "crew": EngineerAllocationSolver.minimum_crew(rd_manager, remaining, horizon)
+            })
+
+        # 2. 0/1 knapsack over engineers, kept sparse: reachable[used] = (value, chosen indices) of the best set of
+        # projects using exactly `used` engineers. A team only runs a handful of projects, so this stays far smaller
+        # than one entry per engineer.
+        reachable: Dict[int, Tuple[float, Tuple[int, ...]]] = {0: (0.0, ())}
+        for i, p in enumerate(projects):
+            if p["crew"] is None or p["crew"] > capacity or p["value"] <= 0:
+                continue
+            crew = p["crew"]
+            for used, (value, chosen) in list(reachable.items()):
+                total = used + crew
+                if total <= capacity and (total not in reachable or value + p["value"] > reachable[total][0]):
+                    reachable[total] = (value + p["value"], chosen + (i,))
+        used, (expected_gain, chosen) = max(reachable.items(), key=lambda r: (r[1][0], -r[0]))
+
+        allocation = {p["node_id"]: 0 for p in projects}
+        for i in chosen:
+            allocation[projects[i]["node_id"]] = projects[i]["crew"]
+        leftover = capacity - used
+
+        # 3. Spare engineers: make progress on the best-value project we couldn't finish in time,
+        # otherwise pull the slowest chosen project forward.
+        if leftover > 0 and projects:
+            unfinished = [p for i, p in enumerate(projects) if i not in chosen and p["remaining"] > 0]
+            if unfinished:
+                target = max(unfinished, key=lambda p: (p["value"] / p["remaining"], -p["remaining"]))
+            elif chosen:
+                target = max((projects[i] for i in chosen), key=lambda p: p["remaining"] / max(1, allocation[p["node_id"]]))
+            else:
+                target = projects[0]
+            allocation[target["node_id"]] += leftover
+
+        return {
+            "allocation": allocation,
+            "completes": [projects[i]["node_id"] for i in chosen],
+            "expected_gain": expected_gain,
+            "horizon": horizon
+        }
@@ -0,0 +1,97 @@
+from typing import Dict, Any, Iterable, Optional, Sequence, Tuple
+
+from src.models.car.car import Car
+from src.utils.event_log import event_log
+
+StatVector = Tuple[int, ...]
+
+# Components whose Department Head adds a synergy bonus to positive effects
+BONUS_COMPONENTS = ("aero", "powertrain")
+
+
+class CompiledEffect:
+    """
+    One node's effects as Car.STAT_PATHS-ordered vectors: the base changes plus a 0/1 mask per bonus department
+    marking the positive entries its lead boosts. Negative effects (tradeoffs) are never boosted.
+    """
+
+    __slots__ = ("base", "aero_mask", "powertrain_mask")
+
+    def __init__(self, effects: Dict[str, int]):
+        base = [0] * len(Car.STAT_PATHS)
+        for stat_path, value in effects.items():
+            base[EffectTable.STAT_INDEX[stat_path]] += value
+        self.base: StatVector = tuple(base)
+        self.aero_mask: StatVector = EffectTable.positive_mask(self.base, "aero")
+        self.powertrain_mask: StatVector = EffectTable.positive_mask(self.base, "powertrain")
+
+    def delta(self, aero_bonus: int = 0, powertrain_bonus: int = 0) -> StatVector:
+        """The stat changes completing this node applies, with the department bonuses folded in."""
+        if not aero_bonus and not powertrain_bonus:
+            return self.base
+        return tuple(value + aero_bonus * a + powertrain_bonus * p
+                     for value, a, p in zip(self.base, self.aero_mask, self.powertrain_mask))
+
+
+class EffectTable:
+    """
+    R&D effects compiled once per tree load. Stat paths like "aero.downforce" are resolved to positions in
+    Car.STAT_PATHS up front, so applying a node (or valuing a whole set of nodes) is plain vector arithmetic
+    instead of string parsing and reflection.
+    """
+
+    STAT_INDEX: Dict[str, int] = {stat_path: i for i, stat_path in enumerate(Car.STAT_PATHS)}
+    ZERO: StatVector = (0,) * len(Car.STAT_PATHS)
+
+    def __init__(self, tree_definitions: Iterable[Dict[str, Any]] = ()):
+        self.effects: Dict[str, CompiledEffect] = {}
+        for node_data in tree_definitions:
+            self.effects[node_data["id"]] = EffectTable.compile(node_data["effects"], node_data["id"])
+
+    @staticmethod
+    def positive_mask(base: Sequence[int], component: str) -> StatVector:
+        return tuple(1 if value > 0 and stat_path.startswith(component + ".") else 0
+                     for stat_path, value in zip(Car.STAT_PATHS, base))
+
+    @staticmethod
+    def compile(effects: Dict[str, int], node_id: Optional[str] = None) -> CompiledEffect:
+        """
+        Compiles one effects dict. Stat paths the Car does not have are logged and dropped, so a typo in one
+        node's effects costs that effect rather than the whole tree.
+        """
+        unknown = [stat_path for stat_path in effects if stat_path not in EffectTable.STAT_INDEX]
+        if unknown:
+            event_log.warning("rd", "unknown_stat_path", f"Ignoring unknown R&D stat path(s) on {node_id or 'node'}: "
+                              f"{', '.join(unknown)}", node_id=node_id, stat_paths=unknown)
+            effects = {stat_path: value for stat_path, value in effects.items() if stat_path not in unknown}
+        return CompiledEffect(effects)
+
+    def get(self, node_id: str, effects: Optional[Dict[str, int]] = None) -> CompiledEffect:
+        """The compiled effect of a node. Nodes missing from the tree are compiled from `effects` and kept."""
+        compiled = self.effects.get(node_id)
+        if compiled is None:
+            compiled = EffectTable.compile(effects or {}, node_id)
+            self.effects[node_id] = compiled
+        return compiled
+
+    def node_delta(self, node_id: str, aero_bonus: int = 0, powertrain_bonus: int = 0) -> StatVector:
+        return self.get(node_id).delta(aero_bonus, powertrain_bonus)
+
+    def net_effect(self, node_ids: Iterable[str], aero_bonus: int = 0, powertrain_bonus: int = 0) -> StatVector:
+        """Summed stat change of completing every node in node_ids, without touching a Car."""
+        total = list(self.ZERO)
+        for node_id in node_ids:
+            for i, value in enumerate(self.node_delta(node_id, aero_bonus, powertrain_bonus)):
+                total[i] += value
+        return tuple(total)
+
+    @staticmethod
+    def to_effects(vector: Sequence[int]) -> Dict[str, int]:
+        """Back to the {"aero.downforce": 10, ...} form used by the API, dropping zero entries."""
+        return {stat_path: value for stat_path, value in zip(Car.STAT_PATHS, vector) if value}
+
+    @staticmethod
+    def dot(vector: Sequence[int], stat_weights: Dict[str, float]) -> float:
+        """Weighted value of a stat vector."""
+        return sum(value * stat_weights.get(stat_path, 0.0)
+                   for stat_path, value in zip(Car.STAT_PATHS, vector) if value)
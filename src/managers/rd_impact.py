@@ -0,0 +1,99 @@
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from src.models.car.car import Car
+from src.models.car.tire import tire_model
+from src.models.world.track import Track
+from src.simulators.race_simulator import RaceSimulator
+
+if TYPE_CHECKING:
+    from src.managers.rd_manager import RDManager
+
+TIRE_STAT = Car.STAT_PATHS.index("chassis.tire_preservation")
+# Compound the wear term plans the race on (the AI's one-stop opener; stint lengths scale alike for every compound)
+REFERENCE_COMPOUND = "Medium"
+
+
+@lru_cache(maxsize=4096)
+def tire_cost_per_lap(track: Track, tire_preservation: float, tire_management: float) -> float:
+    """
+    Average seconds per lap the race loses to tire wear and the stops it forces: the race split into equal
+    REFERENCE_COMPOUND stints, each ending at or before the tire model's safe wear.
+    """
+    table = tire_model.stint_table(REFERENCE_COMPOUND, track.tire_wear_multiplier, tire_preservation,
+                                   tire_management, track.laps)
+    stints = math.ceil(track.laps / max(1, table.safe_laps()))
+    base, extra = divmod(track.laps, stints)
+    # `extra` stints run one lap longer (none when the laps split evenly, e.g. a single stint of the whole race)
+    wear_loss = (stints - extra) * table.penalty[base]
+    if extra:
+        wear_loss += extra * table.penalty[base + 1]
+    return (wear_loss + (stints - 1) * RaceSimulator.PIT_LOSS) / track.laps
+
+
+class UpgradeImpactMatrix:
+    """
+    Expected lap-time change (seconds, negative = faster) of completing each R&D node, on each track.
+
+    The car-performance part of _calculate_lap_time is linear in the stats, so it is one product of the
+    node x stat effect matrix (department lead bonuses folded in) with the stat x track coefficient matrix. On top
+    of that, a node changing chassis.tire_preservation changes how fast the tires wear; that term is not linear
+    and depends on the car's current preservation and the drivers' tire management, which is why a matrix belongs
+    to one car version (see RDManager.impact_matrix).
+    """
+
+    def __init__(self, rd_manager: 'RDManager', tracks: Sequence[Track], tire_management: float = 0.0):
+        self.tracks = list(tracks)
+        self.node_ids: List[str] = list(rd_manager.nodes)
+        self._row = {node_id: i for i, node_id in enumerate(self.node_ids)}
+
+        # node x stat
+        effects = [rd_manager.get_effect_vector(rd_manager.nodes[node_id]) for node_id in self.node_ids]
+        # stat x track
+        coefficients = [[0.0] * len(self.tracks) for _ in Car.STAT_PATHS]
+        for t, track in enumerate(self.tracks):
+            for stat_path, coefficient in RaceSimulator.stat_lap_time_coefficients(track).items():
+                coefficients[Car.STAT_PATHS.index(stat_path)][t] = coefficient
+
+        pace = [[sum(change * coefficients[s][t] for s, change in enumerate(vector) if change)
+                 for t in range(len(self.tracks))] for vector in effects]
+
+        preservation = rd_manager.car.chassis.tire_preservation
+        current = [tire_cost_per_lap(track, preservation, tire_management) for track in self.tracks]
+        wear_rows: Dict[int, List[float]] = {0: [0.0] * len(self.tracks)}
+        for vector in effects:
+            change = vector[TIRE_STAT]
+            if change not in wear_rows:
+                wear_rows[change] = [tire_cost_per_lap(track, preservation + change, tire_management) - now
+                                     for track, now in zip(self.tracks, current)]
+
+        self.pace = pace
+        self.wear = [wear_rows[vector[TIRE_STAT]] for vector in effects]
+        self.lap_delta = [[p + w for p, w in zip(pace_row, wear_row)] for pace_row, wear_row in zip(pace, self.wear)]
+
+    def cell(self, node_id: str, track_index: int) -> float:
+        return self.lap_delta[self._row[node_id]][track_index]
+
+    def race_delta(self, node_id: str, track_indexes: Optional[Sequence[int]] = None) -> float:
+        """Race time change summed over every lap of the given tracks (default: all of them)."""
+        row = self.lap_delta[self._row[node_id]]
+        indexes = range(len(self.tracks)) if track_indexes is None else track_indexes
+        return sum(row[t] * self.tracks[t].laps for t in indexes)
+
+    def ranking(self, node_ids: Optional[Sequence[str]] = None, start_index: int = 0) -> List[Tuple[str, float]]:
+        """(node_id, race seconds gained from start_index on) best first. Gains are positive."""
+        indexes = range(start_index, len(self.tracks))
+        candidates = self.node_ids if node_ids is None else node_ids
+        return sorted(((node_id, -self.race_delta(node_id, indexes)) for node_id in candidates),
+                      key=lambda item: item[1], reverse=True)
+
+    def to_dict(self, node_ids: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        rows = self.node_ids if node_ids is None else node_ids
+        return {
+            "tracks": [track.name for track in self.tracks],
+            "nodes": {node_id: {
+                "lap_delta": [round(value, 4) for value in self.lap_delta[self._row[node_id]]],
+                "tire_wear": [round(value, 4) for value in self.wear[self._row[node_id]]]
+            } for node_id in rows}
+        }
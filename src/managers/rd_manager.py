@@ -1,8 +1,17 @@
 import os
 import json
-from typing import Dict, Any, List
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from src.models.car.rd_node import RDNode
 from src.models.car.car import Car
+from src.managers.rd_allocator import EngineerAllocationSolver
+from src.managers.rd_effects import EffectTable, StatVector
+from src.utils.event_log import event_log
+from src.managers.rd_planner import RDPathPlanner
+from src.managers.rd_impact import UpgradeImpactMatrix
+from src.database.track_database import TrackDatabase
+from src.models.world.track import Track
 
 class RDManager:
     """
@@ -10,28 +19,58 @@ class RDManager:
     processing time progression, and applying stats to the Car.
     """
     
+    AI_ALLOCATION_HORIZON = 3 # Races ahead the AI looks when splitting engineers across projects
+    # Search nodes the AI's research path search may expand per purchase beyond its first, greedy descent. A node
+    # count, not a clock, so seeded AI research doesn't depend on machine speed or load. Backtracking barely improves
+    # the plans the AI actually starts from and is what made a 50-team weekly tick expensive, so the AI takes the
+    # greedy plan (about 50us on the shared planner tables)
+    AI_PLANNER_EXPANSIONS = 0
+    
     def __init__(self, car: Car, is_ai: bool = False):
         self.car = car
         self.is_ai = is_ai
+        self.team_name: Optional[str] = None # Will be set by GameState; tags this manager's log events
+        self.race_index = 0 # Calendar position the AI plans its research from; kept current by GameState
         self.difficulty = "Normal" # "Easy", "Normal", "Hard" (Only affects AI)
         self.resource_points: int = 500
         self.total_engineers: int = 100
         self.nodes: Dict[str, RDNode] = {}
         self.active_projects: Dict[str, int] = {} # Dict mapping node_id -> number of allocated engineers
         
+        # Incremental availability index (see _rebuild_availability_index)
+        self._dependents: Dict[str, List[str]] = {}     # node_id -> node_ids that require it
+        self._unmet_dependencies: Dict[str, int] = {}   # node_id -> number of requirements not yet COMPLETED
+        self._tree_order: Dict[str, int] = {}           # node_id -> position in rd_tree.json (stable AI ordering)
+        self.available_nodes: Dict[str, RDNode] = {}    # Ordered set of nodes currently AVAILABLE
+        self.effect_table = EffectTable()               # Compiled node effects, shared by every manager (see compiled_effects)
+        
         self.head_of_aero = None      # Will be set by GameState
         self.powertrain_lead = None   # Will be set by GameState
+        self._impact_cache: Optional[Tuple[tuple, UpgradeImpactMatrix]] = None # (car version and inputs, matrix)
         self._initialize_default_tree()
 
-    def _initialize_default_tree(self):
-        """Loads the defined research tree from the database JSON file."""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load_tree_definitions() -> Tuple[Dict[str, Any], ...]:
+        """Parses rd_tree.json once per process. The returned definitions are shared and must not be mutated."""
         # Find path to the database relative to this file
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         json_path = os.path.join(base_dir, "database", "rd_tree.json")
         
+        with open(json_path, 'r') as f:
+            return tuple(json.load(f))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def compiled_effects() -> EffectTable:
+        """The tree's effects compiled to stat vectors, once per process."""
+        return EffectTable(RDManager.load_tree_definitions())
+
+    def _initialize_default_tree(self):
+        """Builds this manager's nodes from the (cached) research tree definitions."""
         try:
-            with open(json_path, 'r') as f:
-                tree_data = json.load(f)
+            tree_data = RDManager.load_tree_definitions()
+            self.effect_table = RDManager.compiled_effects()
                 
             for node_data in tree_data:
                 node = RDNode(
@@ -58,19 +97,48 @@ class RDManager:
                 self.nodes[node.node_id] = node
                 
         except Exception as e:
-            print(f"Error loading R&D json tree: {e}")
+            event_log.error("rd", "tree_load_failed", f"Error loading R&D json tree: {e}", error=str(e))
+            
+        self._rebuild_availability_index()
 
-    def update_availability(self):
-        """Iterates through nodes and unlocks them if dependencies are met."""
-        available_nodes = []
+    def _rebuild_availability_index(self):
+        """
+        Full O(tree) rebuild of the reverse-dependency map and unmet-requirement counters.
+        Only needed when node states are replaced wholesale (tree creation, loading a save);
+        afterwards completions only touch their direct dependents.
+        """
+        self._dependents = {node_id: [] for node_id in self.nodes}
+        self._unmet_dependencies = {}
+        self._tree_order = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self.available_nodes = {}
+        
         for node in self.nodes.values():
-            if node.state == "LOCKED":
-                # Check if all dependencies are COMPLETED
-                deps_met = all(self.nodes[dep].state == "COMPLETED" for dep in node.dependencies)
-                if deps_met:
-                    node.state = "AVAILABLE"
+            unmet = 0
+            for dep in node.dependencies:
+                if dep in self._dependents:
+                    self._dependents[dep].append(node.node_id)
+                # Unknown requirements can never be met, so they keep the node locked
+                if dep not in self.nodes or self.nodes[dep].state != "COMPLETED":
+                    unmet += 1
+            self._unmet_dependencies[node.node_id] = unmet
+            
+            if node.state == "LOCKED" and unmet == 0:
+                node.state = "AVAILABLE"
             if node.state == "AVAILABLE":
-                available_nodes.append(node)
+                self.available_nodes[node.node_id] = node
+
+    def _unlock_dependents(self, node: RDNode):
+        """Decrements the unmet counters of a newly completed node's dependents, unlocking any that reach zero."""
+        for dependent_id in self._dependents.get(node.node_id, ()):
+            self._unmet_dependencies[dependent_id] -= 1
+            dependent = self.nodes[dependent_id]
+            if self._unmet_dependencies[dependent_id] == 0 and dependent.state == "LOCKED":
+                dependent.state = "AVAILABLE"
+                self.available_nodes[dependent_id] = dependent
+
+    def update_availability(self):
+        """Lets the AI react to the currently available nodes. Unlocking itself is maintained incrementally."""
+        available_nodes = sorted(self.available_nodes.values(), key=lambda n: self._tree_order[n.node_id])
                 
         # Autonomous AI logic
         if self.is_ai and available_nodes:
@@ -83,15 +151,23 @@ class RDManager:
         if self.resource_points > 100:
             affordable = [n for n in available_nodes if self.resource_points >= n.rp_cost]
             if affordable:
-                choice = random.choice(affordable)
-                self.start_project(choice.node_id)
+                # Start the first step of the best research plan we can afford (when every step still waits for a
+                # running project, save the RP for it); fall back to a random pick if nothing affordable actually
+                # makes the car faster
+                planner = RDPathPlanner(self, start_race_index=self.race_index)
+                plans = planner.plan(self.resource_points, k=1, time_budget_ms=None,
+                                     max_expansions=self.AI_PLANNER_EXPANSIONS)
+                if plans and plans[0]["order"]:
+                    self.start_project(plans[0]["order"][0])
+                else:
+                    choice = random.choice(affordable)
+                    self.start_project(choice.node_id)
                 
-        # Allocate any free engineers to active projects
+        # Rebalance the whole workforce whenever engineers are sitting idle
         free_engineers = self.total_engineers - sum(self.active_projects.values())
         if free_engineers > 0 and self.active_projects:
-            # Just dump them all into a random active project
-            target_id = random.choice(list(self.active_projects.keys()))
-            self.allocate_engineers(target_id, self.active_projects[target_id] + free_engineers)
+            plan = EngineerAllocationSolver.solve(self, horizon=self.AI_ALLOCATION_HORIZON)
+            self.apply_allocation(plan["allocation"])
 
     def allocate_engineers(self, node_id: str, new_amount: int) -> bool:
         """Assigns a specific number of engineers to an active project."""
@@ -110,6 +186,17 @@ class RDManager:
         self.active_projects[node_id] = new_amount
         return True
 
+    def apply_allocation(self, allocation: Dict[str, int]) -> bool:
+        """Replaces the engineer split across active projects in one go (e.g. from EngineerAllocationSolver)."""
+        if any(node_id not in self.active_projects or amount < 0 for node_id, amount in allocation.items()):
+            return False
+        new_projects = dict(self.active_projects)
+        new_projects.update(allocation)
+        if sum(new_projects.values()) > self.total_engineers:
+            return False
+        self.active_projects = new_projects
+        return True
+
     def start_project(self, node_id: str, bypass_funds: bool = False) -> bool:
         """Attempts to purchase an R&D project with Resource Points."""
         node = self.nodes.get(node_id)
@@ -122,35 +209,107 @@ class RDManager:
             self.resource_points -= node.rp_cost
             
         node.state = "IN_PROGRESS"
+        self.available_nodes.pop(node_id, None)
         self.active_projects[node_id] = 0 # Initially 0 engineers assigned
         
-        if self.is_ai:
-            print(f"[{'AI'}] purchased project: {node.name}")
+        event_log.info(self.log_category, "purchased", f"[{self.team_name or 'AI'}] purchased project: {node.name}"
+                       if self.is_ai else f"Purchased project: {node.name}",
+                       team=self.team_name, node_id=node_id, node_name=node.name, rp_cost=node.rp_cost)
         
         # Lock out mutually exclusive options
         for ex_id in node.mutually_exclusive:
             if ex_id in self.nodes:
                 self.nodes[ex_id].state = "MUTUALLY_LOCKED"
+                self.available_nodes.pop(ex_id, None)
                 
         self.update_availability()
         return True
 
+    @property
+    def log_category(self) -> str:
+        """Event log category: AI teams log under "rd.ai" so they can be filtered or sampled separately."""
+        return "rd.ai" if self.is_ai else "rd"
+
+    def effective_engineers(self, engineers: int) -> int:
+        """Engineers' actual work rate per race, after the AI difficulty multiplier."""
+        # Difficulty modifier for AI AI baseline engineers effectively do more or less work
+        if self.is_ai:
+            if self.difficulty.lower() == "easy":
+                return int(engineers * 0.75) # 25% slower
+            elif self.difficulty.lower() == "hard":
+                return int(engineers * 1.25) # 25% faster
+        return engineers
+
+    def forecast_completion(self, node_id: str) -> Optional[int]:
+        """
+        Number of time units (races) until an active project completes at its current allocation,
+        or None if it is not active or has no effective engineers.
+        """
+        if node_id not in self.active_projects:
+            return None
+        node = self.nodes[node_id]
+        remaining = node.base_workload - node.invested_work
+        if remaining <= 0:
+            return 1 # Already paid for, it completes on the next tick
+        rate = self.effective_engineers(self.active_projects[node_id])
+        if rate <= 0:
+            return None
+        return math.ceil(remaining / rate)
+
+    def get_project_forecasts(self) -> Dict[str, Dict[str, Any]]:
+        """ETA data for every active project, keyed by node_id."""
+        forecasts = {}
+        for node_id, engineers in self.active_projects.items():
+            node = self.nodes[node_id]
+            forecasts[node_id] = {
+                "name": node.name,
+                "engineers": engineers,
+                "effective_engineers": self.effective_engineers(engineers),
+                "invested_work": node.invested_work,
+                "base_workload": node.base_workload,
+                "races_remaining": self.forecast_completion(node_id)
+            }
+        return forecasts
+
+    def next_completion_in(self) -> Optional[int]:
+        """Time units until the earliest active project completes (None if nothing is progressing)."""
+        etas = [eta for eta in (self.forecast_completion(n) for n in self.active_projects) if eta is not None]
+        return min(etas) if etas else None
+
+    def next_ai_action_in(self, weekly_rp: int) -> Optional[int]:
+        """
+        Weeks of RP income until _auto_select_project would act again (buy a node or reassign engineers),
+        ignoring completions. None if the AI would stay idle forever at this income.
+        """
+        if not self.is_ai or not self.available_nodes:
+            return None
+        if self.active_projects and self.total_engineers - sum(self.active_projects.values()) > 0:
+            return 1
+        threshold = max(101, min(n.rp_cost for n in self.available_nodes.values()))
+        if self.resource_points + weekly_rp >= threshold:
+            return 1
+        if weekly_rp <= 0:
+            return None
+        return math.ceil((threshold - self.resource_points) / weekly_rp)
+
+    def fast_forward(self, max_time_units: int) -> int:
+        """
+        Jumps straight to the next project completion instead of stepping race by race,
+        never going further than max_time_units. Returns the number of time units advanced.
+        """
+        step = self.next_completion_in()
+        step = max_time_units if step is None else min(step, max_time_units)
+        if step > 0:
+            self.advance_time(step)
+        return step
+
     def advance_time(self, time_units: int = 1):
         """Advances active projects based on assigned engineers. 1 time_unit = 1 Race."""
         completed_this_tick = []
         
         for node_id, engineers in self.active_projects.items():
             node = self.nodes[node_id]
-            
-            # Difficulty modifier for AI AI baseline engineers effectively do more or less work
-            effective_engineers = engineers
-            if self.is_ai:
-                if self.difficulty.lower() == "easy":
-                    effective_engineers = int(effective_engineers * 0.75) # 25% slower
-                elif self.difficulty.lower() == "hard":
-                    effective_engineers = int(effective_engineers * 1.25) # 25% faster
-            
-            node.invested_work += (effective_engineers * time_units)
+            node.invested_work += (self.effective_engineers(engineers) * time_units)
             
             if node.invested_work >= node.base_workload:
                 completed_this_tick.append(node_id)
@@ -161,44 +320,71 @@ class RDManager:
     def _complete_project(self, node: RDNode):
         """Applies the effects of a completed node to the car, including Department Head bonuses."""
         node.state = "COMPLETED"
-        print(f"R&D Completed: {node.name}")
         
         # Remove from active queue
         if node.node_id in self.active_projects:
             del self.active_projects[node.node_id]
         
-        for stat_path, value in node.effects.items():
-            bonus = 0
-            # Apply Department Head Synergy Bonuses dynamically
-            if stat_path.startswith("aero.") and self.head_of_aero:
-                bonus = self.head_of_aero.get_rd_bonus()
-            elif stat_path.startswith("powertrain.") and self.powertrain_lead:
-                bonus = self.powertrain_lead.get_rd_bonus()
-                
-            # If the value is negative (a tradeoff), don't boost the negative effect.
-            # E.g. Downforce +10, Drag -5. We want Downforce +15, Drag -5.
-            if value > 0:
-                self._apply_effect(stat_path, value + bonus)
-                if bonus > 0:
-                    print(f"  (Department Synergy Bonus: +{bonus})")
-            else:
-                self._apply_effect(stat_path, value)
+        # Bonuses only boost positive effects, never tradeoffs.
+        # E.g. Downforce +10, Drag -5. We want Downforce +15, Drag -5.
+        delta = self.get_effect_vector(node)
+        self.car.apply_stat_delta(delta)
+        event_log.info(self.log_category, "completed", f"R&D Completed: {node.name}",
+                       team=self.team_name, node_id=node.node_id, node_name=node.name, effects=EffectTable.to_effects(delta))
             
-        self.update_availability() # Unlock subsequent tree nodes
+        self._unlock_dependents(node) # Unlock subsequent tree nodes
+        self.update_availability()
         
-    def _apply_effect(self, stat_path: str, value_change: int):
-        """Reflection hack to easily apply paths like 'aero.downforce' to the Car object."""
-        try:
-            category, stat = stat_path.split('.')
-            module = getattr(self.car, category) # e.g., self.car.aero
-            current_val = getattr(module, stat)
-            
-            # Clamp limits. If they hit 100 on the old system, let them push to 150+ now.
-            new_val = current_val + value_change
-            setattr(module, stat, new_val)
-            print(f"  Applied [{stat_path}]: {value_change}")
-        except Exception as e:
-            print(f"Error applying R&D effect {stat_path}: {e}")
+    def get_department_bonuses(self) -> Tuple[int, int]:
+        """(aero, powertrain) Department Head Synergy Bonuses, read at apply time so staff changes count immediately."""
+        aero_bonus = self.head_of_aero.get_rd_bonus() if self.head_of_aero else 0
+        powertrain_bonus = self.powertrain_lead.get_rd_bonus() if self.powertrain_lead else 0
+        return aero_bonus, powertrain_bonus
+
+    def get_department_bonus(self, stat_path: str) -> int:
+        """Department Head Synergy Bonus added to a positive effect on this stat path."""
+        if stat_path.startswith("aero.") and self.head_of_aero:
+            return self.head_of_aero.get_rd_bonus()
+        elif stat_path.startswith("powertrain.") and self.powertrain_lead:
+            return self.powertrain_lead.get_rd_bonus()
+        return 0
+
+    def get_effect_vector(self, node: RDNode) -> StatVector:
+        """Car.STAT_PATHS-ordered stat changes completing this node would apply right now, bonuses included."""
+        return self.effect_table.get(node.node_id, node.effects).delta(*self.get_department_bonuses())
+
+    def get_effective_effects(self, node: RDNode) -> Dict[str, int]:
+        """The stat changes completing this node would apply right now, department bonuses included."""
+        return EffectTable.to_effects(self.get_effect_vector(node))
+
+    def get_net_effect(self, node_ids: List[str]) -> StatVector:
+        """Combined stat change of completing all of node_ids with the current leads, without touching the car."""
+        return self.effect_table.net_effect(node_ids, *self.get_department_bonuses())
+
+    def fork(self, car: Car) -> 'RDManager':
+        """
+        Copy of this manager developing `car` (a GameState fork's copy of the car). Node progress, projects and
+        availability are its own; the tree structure, dependents map and compiled effects stay shared.
+        """
+        clone = RDManager.__new__(RDManager)
+        clone.__dict__.update(self.__dict__)
+        clone.car = car
+        clone.nodes = {node_id: node.copy() for node_id, node in self.nodes.items()}
+        clone.active_projects = dict(self.active_projects)
+        clone._unmet_dependencies = dict(self._unmet_dependencies)
+        clone.available_nodes = {node_id: clone.nodes[node_id] for node_id in self.available_nodes}
+        return clone
+
+    def impact_matrix(self, tracks: Optional[Sequence[Track]] = None, tire_management: float = 0.0) -> UpgradeImpactMatrix:
+        """
+        Lap-time change of every node on every track (default: the calendar) for the current car. Kept until the
+        car's stats (any completed node), the department leads' bonuses or the inputs change.
+        """
+        tracks = tuple(TrackDatabase.get_calendar() if tracks is None else tracks)
+        key = (self.car.get_stat_vector(), self.get_department_bonuses(), tracks, tire_management)
+        if self._impact_cache is None or self._impact_cache[0] != key:
+            self._impact_cache = (key, UpgradeImpactMatrix(self, tracks, tire_management))
+        return self._impact_cache[1]
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state for save file."""
@@ -226,3 +412,5 @@ class RDManager:
             node_id = node_data["node_id"]
             if node_id in self.nodes:
                 self.nodes[node_id].load_from_dict(node_data)
+                
+        self._rebuild_availability_index()
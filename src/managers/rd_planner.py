@@ -0,0 +1,272 @@
+import heapq
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from src.database.track_database import TrackDatabase
+from src.models.car.car import Car
+from src.models.world.track import Track
+from src.simulators.race_simulator import RaceSimulator
+
+if TYPE_CHECKING:
+    from src.managers.rd_manager import RDManager
+
+
+@lru_cache(maxsize=64)
+def _calendar_stat_values(start_index: int) -> Tuple[float, ...]:
+    """Race time (seconds, summed over every remaining lap) that +1 of each stat saves from start_index on."""
+    return _stat_values_for(TrackDatabase.get_calendar()[start_index:])
+
+
+def _stat_values_for(tracks: Sequence[Track]) -> Tuple[float, ...]:
+    """Per-stat race time values in Car.STAT_PATHS order, matching the R&D effect vectors."""
+    totals: Dict[str, float] = {stat_path: 0.0 for stat_path in Car.STAT_PATHS}
+    for track in tracks:
+        for stat_path, coefficient in RaceSimulator.stat_lap_time_coefficients(track).items():
+            totals[stat_path] -= coefficient * track.laps
+    return tuple(totals[stat_path] for stat_path in Car.STAT_PATHS)
+
+
+class PlannerTables:
+    """
+    The parts of a planning problem that research progress doesn't change: every node's track-weighted value (with
+    one pair of department bonuses), RP cost and locks_out conflicts, plus a dependency-respecting order of the
+    whole tree that reaches high value-per-RP nodes early. A planner only has to filter these down to its
+    candidates, so the AI can plan every purchase without rebuilding them (see for_manager).
+    """
+
+    def __init__(self, rd_manager: 'RDManager', stat_values: Sequence[float], bonuses: Tuple[int, int]):
+        nodes = rd_manager.nodes
+        effects = rd_manager.effect_table
+        self.value: Dict[str, float] = {
+            n: sum(change * weight for change, weight in zip(effects.get(n, node.effects).delta(*bonuses), stat_values)
+                   if change)
+            for n, node in nodes.items()
+        }
+        self.cost: Dict[str, int] = {n: node.rp_cost for n, node in nodes.items()}
+        self.requires: Dict[str, Tuple[str, ...]] = {n: tuple(node.dependencies) for n, node in nodes.items()}
+        self.conflicts: Dict[str, set] = {n: set() for n in nodes}
+        for n, node in nodes.items():
+            for ex in node.mutually_exclusive:
+                if ex in self.conflicts:
+                    self.conflicts[n].add(ex)
+                    self.conflicts[ex].add(n)
+
+        # Nodes with unknown requirements never become ready, so they are left out (they can't be planned anyway)
+        waiting = {n: len(node.dependencies) for n, node in nodes.items()}
+        ready = [n for n in nodes if waiting[n] == 0]
+        self.order: List[str] = []
+        while ready:
+            ready.sort(key=lambda n: self.value[n] / max(1, self.cost[n]))
+            step = ready.pop()
+            self.order.append(step)
+            for dependent in rd_manager._dependents.get(step, ()):
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        # Optimistic value of researching a node and everything that (transitively) requires it. It only decides
+        # which branch the search tries first, so dependents a given state can no longer research may be counted
+        self.subtree_bound: Dict[str, float] = {}
+        for n in reversed(self.order):
+            dependents = rd_manager._dependents.get(n, ())
+            self.subtree_bound[n] = max(0.0, self.value[n]) + sum(self.subtree_bound[d] for d in dependents
+                                                                  if d in self.subtree_bound)
+        # Best-first order for the fractional bound: positive value per RP
+        self.by_density: List[str] = sorted((n for n in self.order if self.value[n] > 0),
+                                            key=lambda n: self.value[n] / max(1, self.cost[n]), reverse=True)
+
+    @classmethod
+    def for_manager(cls, rd_manager: 'RDManager', start_race_index: int) -> 'PlannerTables':
+        """
+        Tables for a manager planning from start_race_index. Managers on the process-wide compiled tree (every
+        manager of a game) share one set per calendar position and department bonuses; any other tree gets its own.
+        """
+        bonuses = rd_manager.get_department_bonuses()
+        if rd_manager.effect_table is rd_manager.compiled_effects():
+            return _shared_tables(start_race_index, bonuses)
+        return cls(rd_manager, _calendar_stat_values(start_race_index), bonuses)
+
+
+@lru_cache(maxsize=256)
+def _shared_tables(start_index: int, bonuses: Tuple[int, int]) -> PlannerTables:
+    """PlannerTables of the default tree, built from a fresh manager (node progress doesn't enter them)."""
+    from src.managers.rd_manager import RDManager # rd_manager imports this module
+    return PlannerTables(RDManager(Car()), _calendar_stat_values(start_index), bonuses)
+
+
+class RDPathPlanner:
+    """
+    Searches the R&D dependency DAG for the research orders that buy the most race time over the rest of the calendar.
+
+    A plan is a set of not-yet-researched nodes that is closed under `requires`, contains no `locks_out` pair
+    and fits the RP budget. Because _calculate_lap_time is linear in the car stats, a plan's score is the sum of
+    its nodes' track-weighted lap-time gains. The search is a depth-first branch-and-bound over nodes in
+    dependency order, pruned by a fractional-knapsack bound and cut off by a wall-clock budget (interactive use)
+    or a search-node budget (deterministic: the same tree and RP always give the same plan).
+    """
+
+    def __init__(self, rd_manager: 'RDManager', start_race_index: int = 0, tracks: Optional[Sequence[Track]] = None):
+        self.rd_manager = rd_manager
+        if tracks is not None:
+            tables = PlannerTables(rd_manager, _stat_values_for(tracks), rd_manager.get_department_bonuses())
+        else:
+            tables = PlannerTables.for_manager(rd_manager, start_race_index)
+        self.value = tables.value
+        self.cost = tables.cost
+        self._requires = tables.requires
+        self._conflicts = tables.conflicts
+
+        # One pass in dependency order: completed nodes and running projects are sunk work that already satisfies
+        # requirements; nodes behind a mutually locked node can never be researched
+        nodes = rd_manager.nodes
+        self._done = set()
+        self._candidates: List[str] = []
+        unreachable = set()
+        for node_id in tables.order:
+            node = nodes[node_id]
+            if node.state in ("COMPLETED", "IN_PROGRESS"):
+                self._done.add(node_id)
+            elif node.state == "MUTUALLY_LOCKED" or (unreachable and not unreachable.isdisjoint(node.dependencies)):
+                unreachable.add(node_id)
+            else:
+                self._candidates.append(node_id)
+        candidate_set = set(self._candidates)
+
+        # The tables' search and bound orders, restricted to this state's candidates
+        self._by_density = [n for n in tables.by_density if n in candidate_set]
+        self._position = {n: i for i, n in enumerate(self._candidates)}
+        self._subtree_bound = tables.subtree_bound
+
+    def _bound(self, index: int, budget: int, chosen: set, excluded: set) -> float:
+        """Fractional knapsack over the positive-value nodes still undecided and not ruled out."""
+        bound = 0.0
+        for n in self._by_density:
+            if self._position[n] < index or n in excluded:
+                continue
+            if self.cost[n] <= budget:
+                bound += self.value[n]
+                budget -= self.cost[n]
+            else:
+                return bound + self.value[n] * budget / self.cost[n]
+        return bound
+
+    def plan(self, budget: int, k: int = 3, time_budget_ms: Optional[float] = 50.0,
+             max_expansions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns up to k plans, best first: {"order": [node_ids in research order], "rp_cost", "race_time_gain"}.
+        race_time_gain is the total seconds saved across every remaining lap of the calendar.
+        The search stops at time_budget_ms or once max_expansions search nodes beyond the first, greedy descent have
+        been expanded, whichever comes first (None: no limit). That descent always completes under max_expansions,
+        so a node budget always yields a plan when one exists.
+        """
+        if max_expansions == 0:
+            value, chosen = self._greedy_descent(budget)
+            return [self._plan_entry(value, chosen)]
+
+        deadline = time.perf_counter() + time_budget_ms / 1000 if time_budget_ms is not None else None
+        expansions_left = [max_expansions if max_expansions is not None else -1]
+        best: List[Tuple[float, int, Tuple[str, ...]]] = [] # min-heap of (value, tiebreak, chosen)
+        counter = [0]
+        candidates = self._candidates
+
+        def record(value: float, chosen: Tuple[str, ...]):
+            counter[0] += 1
+            entry = (value, -counter[0], chosen)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif value > best[0][0]:
+                heapq.heapreplace(best, entry)
+
+        cost, node_value, requires, done = self.cost, self.value, self._requires, self._done
+        conflicts, subtree_bound, dependents = self._conflicts, self._subtree_bound, self.rd_manager._dependents
+
+        def search(index: int, budget_left: int, value: float, chosen: List[str], chosen_set: set, excluded: set):
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+            if best:
+                if expansions_left[0] == 0:
+                    return
+                expansions_left[0] -= 1
+            if index == len(candidates):
+                record(value, tuple(chosen))
+                return
+            if len(best) == k and value + self._bound(index, budget_left, chosen_set, excluded) <= best[0][0]:
+                return
+
+            node_id = candidates[index]
+            includable = (node_id not in excluded and cost[node_id] <= budget_left
+                          and all(dep in done or dep in chosen_set for dep in requires[node_id]))
+            if includable and subtree_bound[node_id] > 0:
+                branches = (True, False)
+            else:
+                branches = (False,) if not includable else (False, True)
+            for include in branches:
+                if best and expansions_left[0] == 0:
+                    return # Node budget spent: don't set up branches that would stop right away
+                if include:
+                    newly_excluded = conflicts[node_id] - excluded
+                    chosen.append(node_id)
+                    chosen_set.add(node_id)
+                    excluded |= newly_excluded
+                    search(index + 1, budget_left - cost[node_id], value + node_value[node_id], chosen, chosen_set, excluded)
+                    excluded -= newly_excluded
+                    chosen_set.discard(node_id)
+                    chosen.pop()
+                else:
+                    # Skipping a node also rules out everything that requires it
+                    newly_excluded = {d for d in dependents.get(node_id, ()) if d not in excluded}
+                    if node_id not in excluded:
+                        newly_excluded.add(node_id)
+                    excluded |= newly_excluded
+                    search(index + 1, budget_left, value, chosen, chosen_set, excluded)
+                    excluded -= newly_excluded
+
+        search(0, budget, 0.0, [], set(), set())
+        return [self._plan_entry(value, chosen) for value, _, chosen in sorted(best, reverse=True)]
+
+    def _plan_entry(self, value: float, chosen: Tuple[str, ...]) -> Dict[str, Any]:
+        return {
+            "order": self._research_order(chosen),
+            "rp_cost": sum(self.cost[n] for n in chosen),
+            "race_time_gain": round(value, 3)
+        }
+
+    def _greedy_descent(self, budget: int) -> Tuple[float, Tuple[str, ...]]:
+        """
+        The search's first leaf without the recursion: every node in search order is taken when it can be (and
+        leads to any value), otherwise ruled out along with its dependents. Used as is for a zero node budget.
+        """
+        chosen: List[str] = []
+        chosen_set, excluded = set(), set()
+        value = 0.0
+        dependents = self.rd_manager._dependents
+        for node_id in self._candidates:
+            if (node_id not in excluded and self.cost[node_id] <= budget and self._subtree_bound[node_id] > 0
+                    and all(dep in self._done or dep in chosen_set for dep in self._requires[node_id])):
+                chosen.append(node_id)
+                chosen_set.add(node_id)
+                excluded |= self._conflicts[node_id]
+                budget -= self.cost[node_id]
+                value += self.value[node_id]
+            else:
+                excluded.add(node_id)
+                excluded.update(dependents.get(node_id, ()))
+        return value, tuple(chosen)
+
+    def _research_order(self, chosen: Tuple[str, ...]) -> List[str]:
+        """
+        Orders a plan so every node comes after its requirements. Nodes that can be started right away come first
+        (the others wait for running projects), then the best value-per-RP node.
+        """
+        nodes = self.rd_manager.nodes
+        remaining = set(chosen)
+        done = set(self._done)
+        order = []
+        while remaining:
+            ready = [n for n in remaining if all(dep in done for dep in nodes[n].dependencies)]
+            step = max(ready, key=lambda n: (nodes[n].state == "AVAILABLE", self.value[n] / max(1, self.cost[n]),
+                                             -self._position[n]))
+            order.append(step)
+            done.add(step)
+            remaining.discard(step)
+        return order
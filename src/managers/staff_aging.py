@@ -0,0 +1,115 @@
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.models.personnel.staff_member import StaffMember
+from src.models.personnel.driver import Driver
+from src.models.personnel.technical_director import TechnicalDirector
+from src.models.personnel.department_lead import DepartmentLead
+
+# An effect fires with probability p and then moves every listed field by a uniform integer in [low, high].
+# Positive ranges are capped at 100, negative ones floored at 1 (the same min/max the per-class rules use).
+Effect = Tuple[float, Tuple[Tuple[str, int, int], ...]]
+Bracket = Tuple[Callable[[float], bool], Tuple[Effect, ...]]
+
+# StaffMember.process_yearly_aging: the rating change every member gets (first matching bracket wins)
+BASE_RULES: Tuple[Bracket, ...] = (
+    (lambda age: age <= 22.0, ((0.9, (("rating", 1, 3),)),)),
+    (lambda age: age < 26.0, ((0.7, (("rating", 1, 2),)),)),
+    (lambda age: 38.0 <= age < 65.0, ((0.6, (("rating", -2, -1),)),)),
+    (lambda age: age >= 65.0, ((0.8, (("rating", -3, -1),)),)),
+)
+
+# Driver.process_yearly_aging
+DRIVER_RULES: Tuple[Bracket, ...] = (
+    (lambda age: age <= 22.0, ((1.0, (("speed", 1, 4), ("tire_management", 1, 3), ("consistency", 1, 3))),)),
+    (lambda age: age < 26.0, ((0.8, (("speed", 1, 2),)), (0.7, (("tire_management", 1, 2),)),
+                              (0.8, (("consistency", 1, 2),)))),
+    (lambda age: 33.0 < age < 38.0, ((0.4, (("speed", -1, -1),)), (0.3, (("consistency", 1, 1),)))),
+    (lambda age: age >= 38.0, ((0.8, (("speed", -3, -1),)), (0.6, (("consistency", -2, -1),)),
+                               (0.6, (("tire_management", -2, -1),)))),
+)
+
+# DepartmentLead.process_yearly_aging
+LEAD_RULES: Tuple[Bracket, ...] = (
+    (lambda age: age < 50.0, ((0.7, (("expertise", 1, 3),)),)),
+    (lambda age: age >= 65.0, ((0.8, (("expertise", -3, -1),)),)),
+)
+
+# TechnicalDirector.process_yearly_aging
+TD_RULES: Tuple[Bracket, ...] = (
+    (lambda age: age < 55.0, ((0.6, (("rating", 1, 2), ("aero_expertise", 0, 2), ("chassis_expertise", 0, 2),
+                                     ("powertrain_expertise", 0, 2))),)),
+    (lambda age: age >= 65.0, ((0.8, (("rating", -3, -1), ("aero_expertise", -2, 0), ("chassis_expertise", -2, 0),
+                                      ("powertrain_expertise", -2, 0))),)),
+)
+
+
+class StaffAging:
+    """
+    One batched end-of-season aging pass over any number of staff members.
+
+    Applies the same age-bracket rules as the per-class process_yearly_aging methods (mirrored in the tables
+    above), but member by rule group instead of object by object: everyone is bucketed by bracket, each bucket
+    draws its rolls in bulk from one seeded random.Random stream, and stat changes are applied column-wise.
+    Outcome distributions match the per-object rules; the exact draws differ, and never touch the global RNG.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None, seed=None):
+        self.rng = rng if rng is not None else random.Random(seed)
+
+    @staticmethod
+    def rule_sets(member: StaffMember) -> Tuple[Tuple[Bracket, ...], ...]:
+        """The rule tables a member's class runs, base rules first (matching the super() call order)."""
+        if isinstance(member, Driver):
+            return BASE_RULES, DRIVER_RULES
+        if isinstance(member, TechnicalDirector):
+            return BASE_RULES, TD_RULES
+        if isinstance(member, DepartmentLead):
+            return BASE_RULES, LEAD_RULES
+        return (BASE_RULES,)
+
+    def age(self, members: Iterable[StaffMember]) -> int:
+        """Ages every member by one season in place. Returns how many were processed."""
+        members = list(members)
+        for member in members:
+            member.age += 1.0
+
+        # Bucket (rule table, bracket) -> members, in first-seen order so the pass is deterministic for a given
+        # seed. The brackets a (class, age) pair falls into are resolved once, not per member.
+        buckets: Dict[Tuple[int, int], Tuple[Bracket, List[StaffMember]]] = {}
+        resolved: Dict[Tuple[type, float], List[List[StaffMember]]] = {}
+        for member in members:
+            key = (type(member), member.age)
+            groups = resolved.get(key)
+            if groups is None:
+                groups = resolved[key] = []
+                for rules in self.rule_sets(member):
+                    for b, bracket in enumerate(rules):
+                        if bracket[0](member.age):
+                            groups.append(buckets.setdefault((id(rules), b), (bracket, []))[1])
+                            break
+            for group in groups:
+                group.append(member)
+
+        for (_, effects), group in buckets.values():
+            for probability, changes in effects:
+                self._apply(group, probability, changes)
+        return len(members)
+
+    def _apply(self, group: Sequence[StaffMember], probability: float, changes: Tuple[Tuple[str, int, int], ...]):
+        roll = self.rng.random
+        # 1. Who this effect fires for
+        hit = group if probability >= 1.0 else [m for m, u in zip(group, [roll() for _ in group]) if u < probability]
+        if not hit:
+            return
+        # 2. One column of deltas per field, then a single gather / scatter per field
+        for field, low, high in changes:
+            span = high - low + 1
+            deltas = [low + int(roll() * span) for _ in hit]
+            values = [getattr(m, field) for m in hit]
+            if high > 0:
+                updated = [min(100, v + d) for v, d in zip(values, deltas)]
+            else:
+                updated = [max(1, v + d) for v, d in zip(values, deltas)]
+            for member, value in zip(hit, updated):
+                setattr(member, field, value)
@@ -0,0 +1,296 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from src.database.agent_pool import AgentPool
+from src.models.personnel.staff_member import StaffMember
+from src.models.personnel.driver import Driver
+from src.models.personnel.technical_director import TechnicalDirector
+from src.models.personnel.head_of_aero import HeadOfAerodynamics
+from src.models.personnel.powertrain_lead import PowertrainLead
+
+# Market role -> model class (the keys are the save file / API role names)
+ROLE_TYPES = {
+    "drivers": Driver,
+    "technical_directors": TechnicalDirector,
+    "head_of_aero": HeadOfAerodynamics,
+    "powertrain_leads": PowertrainLead
+}
+
+ALL_ROLES = "*" # Index scope spanning every role
+SORT_FIELDS = ("rating", "salary", "age", "expertise")
+
+
+class StaffMarket:
+    """
+    The free-agent pool, indexed for O(1) lookups by id and role and for sorted, filtered, paginated queries.
+
+    Members are either listed objects (the curated agents and anyone released back onto the market) or rows of
+    the season's generated AgentPool. Pool rows stay in their compact columns and are only materialized into
+    objects when a query returns them or they are looked up/hired; until hired they can always be rebuilt from
+    the pool, so saves don't store them.
+
+    Sorted indexes are lists of (value, staff_id) per (role, field), built on first use and kept in order by
+    add()/remove(). Anything that changes stats in place (yearly aging) must call refresh() afterwards.
+    """
+
+    def __init__(self, roles: Optional[Dict[str, List[StaffMember]]] = None):
+        self._by_id: Dict[str, StaffMember] = {}
+        self._role_of: Dict[str, str] = {}
+        self._by_role: Dict[str, Dict[str, StaffMember]] = {role: {} for role in ROLE_TYPES}
+        self._sorted: Dict[Tuple[str, str], List[Tuple[float, str]]] = {}
+        self.pool: Optional[AgentPool] = None
+        self._adopted: Dict[str, Tuple[str, int]] = {} # Materialized pool members still on the market -> (role, row)
+        for role, members in (roles or {}).items():
+            for member in members:
+                self.add(role, member)
+
+    @staticmethod
+    def sort_value(member: StaffMember, field: str) -> float:
+        """
+        Value a member is sorted/filtered on. "expertise" is the lead's department expertise, a Technical
+        Director's strongest area, and a driver's raw speed.
+        """
+        if field == "expertise":
+            if isinstance(member, TechnicalDirector):
+                return max(member.aero_expertise, member.chassis_expertise, member.powertrain_expertise)
+            if isinstance(member, Driver):
+                return member.speed
+            return getattr(member, "expertise", member.rating)
+        return getattr(member, field)
+
+    # --- Mutation ---
+
+    def add(self, role: str, member: StaffMember):
+        self._adopted.pop(member.id, None)
+        self._by_id[member.id] = member
+        self._role_of[member.id] = role
+        self._by_role.setdefault(role, {})[member.id] = member
+        for (scope, field), index in self._sorted.items():
+            if scope == role or scope == ALL_ROLES:
+                insort(index, (self.sort_value(member, field), member.id))
+
+    def remove(self, staff_id: str) -> Tuple[str, StaffMember]:
+        """Takes a member off the market. Raises KeyError if the id isn't listed."""
+        if self.get(staff_id) is None:
+            raise KeyError(staff_id)
+        self._adopted.pop(staff_id, None) # A hired pool member leaves the pool for good
+        member = self._by_id.pop(staff_id)
+        role = self._role_of.pop(staff_id)
+        del self._by_role[role][staff_id]
+        for (scope, field), index in self._sorted.items():
+            if scope == role or scope == ALL_ROLES:
+                position = bisect_left(index, (self.sort_value(member, field), staff_id))
+                del index[position]
+        return role, member
+
+    def refresh(self):
+        """Drops the sorted indexes after stats changed in place; they rebuild lazily on the next query."""
+        self._sorted.clear()
+
+    def regenerate_pool(self, seed: int, season: int, sizes: Optional[Dict[str, int]] = None):
+        """
+        Season rollover: replaces the generated agents nobody hired with a fresh seeded cohort.
+        Listed members (curated agents, released staff) stay on the market.
+        """
+        for staff_id, (role, _) in list(self._adopted.items()):
+            del self._by_id[staff_id]
+            del self._role_of[staff_id]
+            del self._by_role[role][staff_id]
+        self._adopted.clear()
+        self.pool = AgentPool(seed, season, sizes)
+        self.refresh()
+
+    def fork(self, copy_members: bool = False) -> 'StaffMarket':
+        """
+        Copy for a GameState fork. The listings and the pool's taken flags are its own; member objects are shared
+        unless copy_members (needed before aging them in place). Sorted indexes are left to rebuild on first use.
+        """
+        clone = StaffMarket.__new__(StaffMarket)
+        clone._by_id = {staff_id: member.copy() for staff_id, member in self._by_id.items()} if copy_members else dict(self._by_id)
+        clone._role_of = dict(self._role_of)
+        clone._by_role = {role: {staff_id: clone._by_id[staff_id] for staff_id in members}
+                          for role, members in self._by_role.items()}
+        clone._sorted = {}
+        clone.pool = self.pool.fork() if self.pool is not None else None
+        clone._adopted = dict(self._adopted)
+        return clone
+
+    # --- Lookup ---
+
+    def get(self, staff_id: str) -> Optional[StaffMember]:
+        """Looks a member up by id, materializing a generated agent on first access."""
+        member = self._by_id.get(staff_id)
+        if member is None and self.pool is not None:
+            located = self.pool.locate(staff_id)
+            if located is not None:
+                role, row = located
+                member = self.pool.role_columns(role).materialize(row)
+                self.pool.take(role, row)
+                # Listed without touching the sorted indexes, which already hold this row's (value, id)
+                self._by_id[staff_id] = member
+                self._role_of[staff_id] = role
+                self._by_role[role][staff_id] = member
+                self._adopted[staff_id] = located
+        return member
+
+    def role_of(self, staff_id: str) -> Optional[str]:
+        role = self._role_of.get(staff_id)
+        if role is None and self.pool is not None:
+            located = self.pool.locate(staff_id)
+            role = located[0] if located else None
+        return role
+
+    def members(self, role: str) -> List[StaffMember]:
+        """Listed (materialized) members of a role; generated pool rows are reached through query()/get()."""
+        return list(self._by_role.get(role, {}).values())
+
+    def items(self) -> Iterator[Tuple[str, List[StaffMember]]]:
+        """(role, listed members) pairs in listing order, like the old dict of lists."""
+        for role, members in self._by_role.items():
+            yield role, list(members.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id) + (len(self.pool) if self.pool is not None else 0)
+
+    def __contains__(self, staff_id: str) -> bool:
+        return staff_id in self._by_id or (self.pool is not None and self.pool.locate(staff_id) is not None)
+
+    # --- Queries ---
+
+    def _index(self, scope: str, field: str) -> List[Tuple[float, str]]:
+        key = (scope, field)
+        if key not in self._sorted:
+            members = self._by_id.values() if scope == ALL_ROLES else self._by_role.get(scope, {}).values()
+            index = [(self.sort_value(m, field), m.id) for m in members]
+            if self.pool is not None:
+                for role in (ROLE_TYPES if scope == ALL_ROLES else (scope,)):
+                    columns = self.pool.role_columns(role)
+                    index.extend((columns.value(row, field), columns.staff_id(row)) for row in columns.live_rows())
+            index.sort()
+            self._sorted[key] = index
+        return self._sorted[key]
+
+    def _field(self, staff_id: str, field: str) -> float:
+        """A member's sort/filter value without materializing generated agents."""
+        member = self._by_id.get(staff_id)
+        if member is not None:
+            return self.sort_value(member, field)
+        role, row = self.pool.locate(staff_id)
+        return self.pool.role_columns(role).value(row, field)
+
+    @staticmethod
+    def encode_cursor(value: float, staff_id: str) -> str:
+        return base64.urlsafe_b64encode(json.dumps([value, staff_id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, str]:
+        """Raises ValueError on a malformed cursor."""
+        try:
+            value, staff_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return value, staff_id
+        except Exception as e:
+            raise ValueError("Invalid cursor.") from e
+
+    def query(self, role: Optional[str] = None, sort: str = "rating", descending: bool = True, limit: int = 25,
+              cursor: Optional[str] = None, min_rating: Optional[int] = None, min_expertise: Optional[int] = None,
+              max_salary: Optional[int] = None, min_age: Optional[float] = None,
+              max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Filtered page of the market ordered by `sort`. Returns {"results": [members], "next_cursor"}; pass
+        next_cursor back to continue after the last result. Bounds on the sort field are applied by bisection.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort}'. Expected one of {', '.join(SORT_FIELDS)}.")
+        if role is not None and role not in self._by_role:
+            raise ValueError(f"Unknown role '{role}'.")
+        index = self._index(role or ALL_ROLES, sort)
+
+        bounds = {"rating": (min_rating, None), "expertise": (min_expertise, None),
+                  "salary": (None, max_salary), "age": (min_age, max_age)}
+        low_value, high_value = bounds[sort]
+        low = bisect_left(index, (low_value,)) if low_value is not None else 0
+        high = bisect_right(index, (high_value, "\U0010ffff")) if high_value is not None else len(index)
+        if cursor:
+            position = self.decode_cursor(cursor)
+            if descending:
+                high = min(high, bisect_left(index, position))
+            else:
+                low = max(low, bisect_right(index, position))
+
+        checks = [(field, low_bound, high_bound) for field, low_bound, high_bound in (
+            ("rating", min_rating, None), ("expertise", min_expertise, None),
+            ("salary", None, max_salary), ("age", min_age, max_age)
+        ) if low_bound is not None or high_bound is not None]
+
+        def matches(staff_id: str) -> bool:
+            for field, low_bound, high_bound in checks:
+                value = self._field(staff_id, field)
+                if (low_bound is not None and value < low_bound) or (high_bound is not None and value > high_bound):
+                    return False
+            return True
+
+        positions = range(high - 1, low - 1, -1) if descending else range(low, high)
+        selected: List[Tuple[float, str]] = []
+        next_cursor = None
+        for i in positions:
+            if not matches(index[i][1]):
+                continue
+            if len(selected) == limit:
+                next_cursor = self.encode_cursor(*selected[-1])
+                break
+            selected.append(index[i])
+        # Only the returned page is materialized
+        return {"results": [self.get(staff_id) for _, staff_id in selected], "next_cursor": next_cursor}
+
+    # --- Serialization ---
+
+    def to_dict(self, pool_limit: Optional[int] = 25) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Agents grouped by role: every listed member plus the best `pool_limit` generated agents per role by rating
+        (None: the whole pool). The rest of the pool is reached through query(). Nothing is materialized.
+        """
+        data = {role: [member.to_dict() for member in members.values()] for role, members in self._by_role.items()}
+        if self.pool is not None:
+            for role in ROLE_TYPES:
+                columns = self.pool.role_columns(role)
+                if pool_limit is None:
+                    rows = list(columns.live_rows())
+                else:
+                    rows = []
+                    for _, staff_id in reversed(self._index(role, "rating")):
+                        if len(rows) == pool_limit:
+                            break
+                        if staff_id not in self._by_id: # Listed members are already in
+                            rows.append(self.pool.locate(staff_id)[1])
+                data[role].extend(columns.materialize(row).to_dict() for row in rows)
+        return data
+
+    def to_save_dict(self) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[Dict[str, Any]]]:
+        """
+        Compact save form: (listed members by role, pool state). Untouched and merely viewed generated agents
+        are rebuilt from the pool's seed on load, so only hires are recorded as taken.
+        """
+        listed = {role: [member.to_dict() for staff_id, member in members.items() if staff_id not in self._adopted]
+                  for role, members in self._by_role.items()}
+        if self.pool is None:
+            return listed, None
+        pool_data = self.pool.to_dict()
+        viewed = {}
+        for role, row in self._adopted.values():
+            viewed.setdefault(role, set()).add(row)
+        pool_data["taken"] = {role: [row for row in rows if row not in viewed.get(role, ())]
+                              for role, rows in pool_data["taken"].items()}
+        return listed, pool_data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[Dict[str, Any]]], pool_data: Optional[Dict[str, Any]] = None) -> 'StaffMarket':
+        market = cls()
+        for role, staff_list in data.items():
+            if role in ROLE_TYPES:
+                for member_data in staff_list:
+                    market.add(role, ROLE_TYPES[role].from_dict(member_data))
+        if pool_data:
+            market.pool = AgentPool.from_dict(pool_data)
+        return market
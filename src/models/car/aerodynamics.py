@@ -2,6 +2,7 @@ from typing import Dict, Any
 
 class Aerodynamics:
     """Aerodynamics module of the car. Affects downforce and drag."""
+    __slots__ = ("downforce", "drag_efficiency", "development_potential")
     
     def __init__(self, downforce: int = 50, drag_efficiency: int = 50):
         self.downforce = downforce # Higher is better cornering
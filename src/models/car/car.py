@@ -1,10 +1,21 @@
-from typing import Dict, Any
+import copy
+from typing import Dict, Any, Sequence, Tuple
 from src.models.car.aerodynamics import Aerodynamics
 from src.models.car.chassis import Chassis
 from src.models.car.powertrain import Powertrain
 
 class Car:
     """The aggregate Car model combining Aero, Chassis, and Powertrain."""
+    __slots__ = ("aero", "chassis", "powertrain")
+    
+    # Canonical order of every developable stat. Stat vectors (R&D deltas, lap-time coefficients) use this order.
+    STAT_PATHS: Tuple[str, ...] = (
+        "aero.downforce", "aero.drag_efficiency",
+        "chassis.weight_reduction", "chassis.tire_preservation",
+        "powertrain.power_output", "powertrain.reliability"
+    )
+    # The same paths pre-split into (component attribute, stat attribute) handles
+    STAT_HANDLES: Tuple[Tuple[str, str], ...] = tuple(tuple(path.split(".")) for path in STAT_PATHS)
     
     def __init__(self):
         self.aero = Aerodynamics()
@@ -18,6 +29,25 @@ class Car:
                  self.powertrain.power_output + self.powertrain.reliability)
         return total // 6
 
+    def get_stat_vector(self) -> Tuple[int, ...]:
+        """Current stats in STAT_PATHS order."""
+        return tuple(getattr(getattr(self, component), stat) for component, stat in self.STAT_HANDLES)
+
+    def apply_stat_delta(self, delta: Sequence[int]):
+        """Adds a STAT_PATHS-ordered delta vector to the car's stats (zero entries are skipped)."""
+        for (component, stat), change in zip(self.STAT_HANDLES, delta):
+            if change:
+                module = getattr(self, component)
+                setattr(module, stat, getattr(module, stat) + change)
+
+    def copy(self) -> 'Car':
+        """An independent copy of the car's stats."""
+        car = Car.__new__(Car)
+        car.aero = copy.copy(self.aero)
+        car.chassis = copy.copy(self.chassis)
+        car.powertrain = copy.copy(self.powertrain)
+        return car
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "aero": self.aero.to_dict(),
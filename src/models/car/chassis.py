@@ -2,6 +2,7 @@ from typing import Dict, Any
 
 class Chassis:
     """Chassis module of the car. Affects weight and tire wear."""
+    __slots__ = ("weight_reduction", "tire_preservation", "development_potential")
     
     def __init__(self, weight_reduction: int = 50, tire_preservation: int = 50):
         self.weight_reduction = weight_reduction # Higher means lighter car, better overall pace
@@ -2,6 +2,7 @@ from typing import Dict, Any
 
 class Powertrain:
     """Powertrain module of the car. Affects acceleration and reliability."""
+    __slots__ = ("power_output", "reliability", "development_potential")
     
     def __init__(self, power_output: int = 50, reliability: int = 80):
         self.power_output = power_output # Overall engine horsepower
@@ -5,6 +5,10 @@ class RDNode:
     Represents a single focus tree node in the R&D system (HoI4 style).
     Contains requirements, costs, exact target stat tradeoffs, and tracking logic.
     """
+    __slots__ = (
+        "node_id", "name", "description", "rp_cost", "base_workload", "dependencies", "mutually_exclusive",
+        "effects", "state", "invested_work"
+    )
     
     def __init__(self, node_id: str, name: str, description: str, rp_cost: int, base_workload: int, effects: Dict[str, int]):
         self.node_id = node_id
@@ -31,6 +35,13 @@ class RDNode:
     def add_mutually_exclusive(self, node_id: str):
         self.mutually_exclusive.append(node_id)
 
+    def copy(self) -> 'RDNode':
+        """A node with its own state and progress; the static definition (effects, requirement lists) is shared."""
+        node = RDNode.__new__(RDNode)
+        for attr in RDNode.__slots__:
+            setattr(node, attr, getattr(self, attr))
+        return node
+
     def to_dict(self) -> Dict[str, Any]:
         """Serialize for both save state and API consumption."""
         return {
@@ -0,0 +1,104 @@
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict
+
+from src.models.car.tire.tire_compound import COMPOUNDS, TireCompound
+
+# Wear per lap on a 1.0x track before compound and car/driver effects
+BASE_WEAR_PER_LAP = 2.1
+# Up to this much wear the lap time loss is linear (1s at the threshold); past it the cliff kicks in
+CLIFF_WEAR = 60.0
+CLIFF_CAP = 40.0 # Overage beyond which the cliff penalty stops growing
+CARCASS_RISK_WEAR = 105.0 # Extra 5s per lap past this
+# Wear a stint is planned to end at: just past the cliff, before the penalty gets steep
+SAFE_WEAR = 65.0
+# Each of chassis tire_preservation and driver tire_management removes up to this share of the wear
+MAX_WEAR_REDUCTION = 0.3
+
+
+def wear_per_lap(compound: TireCompound, track_multiplier: float, tire_preservation: float = 0,
+                 tire_management: float = 0) -> float:
+    """Tire wear added per lap from compound softness, the TRACK multiplier, chassis preservation and driver management."""
+    chassis_eff = tire_preservation / 100
+    driver_eff = tire_management / 100
+
+    # Track specific multiplier
+    track_wear_base = BASE_WEAR_PER_LAP * track_multiplier
+
+    # Apply the compound's specific degradation multiplier
+    compound_wear = track_wear_base * compound.wear_rate
+
+    # High stats reduce wear by up to 30% each
+    return compound_wear * (1 - (chassis_eff * MAX_WEAR_REDUCTION)) * (1 - (driver_eff * MAX_WEAR_REDUCTION))
+
+
+def tire_penalty(tire_wear: float) -> float:
+    """Seconds lost to tire wear at the start of a lap."""
+    # Tire wear penalty: CLIFF EFFECT
+    if tire_wear <= CLIFF_WEAR:
+        # Gentle linear wear loss up to 1 second
+        penalty = (tire_wear / CLIFF_WEAR) * 1.0
+    else:
+        # Exponential cliff loss beyond 60%
+        overage = tire_wear - CLIFF_WEAR
+        penalty = 1.0 + (min(overage, CLIFF_CAP) ** 1.35) / 15.0 # Approaches ~4.0s penalty at 100%
+
+    if tire_wear > CARCASS_RISK_WEAR:
+        # Imminent carcass failure risk
+        penalty += 5.0
+    return penalty
+
+
+def safe_stint_laps(per_lap: float) -> int:
+    """Laps a set lasts at `per_lap` wear before reaching SAFE_WEAR."""
+    return int(SAFE_WEAR / per_lap) if per_lap > 0 else 0
+
+
+class StintTable:
+    """
+    Wear and time tables for one fresh set over a whole race distance, for a given track wear multiplier,
+    compound and car/driver tire stats. Index k is "after k laps of the stint":
+
+    - wear[k]: tire wear (accumulated lap by lap, exactly as the simulator does)
+    - penalty[k]: summed tire penalty of the first k laps (each lap is penalized by the wear it starts with)
+
+    so stint_time(k) is the stint's time relative to base pace in O(1): the compound's pace gain plus the
+    wear and cliff losses.
+    """
+
+    __slots__ = ("compound", "per_lap", "wear", "penalty")
+
+    def __init__(self, compound: TireCompound, per_lap: float, max_laps: int):
+        self.compound = compound
+        self.per_lap = per_lap
+        wear, penalty = [0.0], [0.0]
+        for _ in range(max_laps):
+            penalty.append(penalty[-1] + tire_penalty(wear[-1]))
+            wear.append(wear[-1] + per_lap)
+        self.wear = wear
+        self.penalty = penalty
+
+    def stint_time(self, laps: int) -> float:
+        """Seconds a stint of `laps` laps adds on top of `laps` laps at base pace (negative = faster)."""
+        return self.penalty[laps] - laps * self.compound.pace_advantage
+
+    def safe_laps(self) -> int:
+        return safe_stint_laps(self.per_lap)
+
+    def laps_until(self, wear: float) -> int:
+        """First lap count after which the set is past `wear` (len(self.wear) if it never gets there)."""
+        return bisect_right(self.wear, wear)
+
+
+@lru_cache(maxsize=4096)
+def stint_table(compound_name: str, track_multiplier: float, tire_preservation: float = 0,
+                tire_management: float = 0, max_laps: int = 100) -> StintTable:
+    """Cached StintTable per (compound, track multiplier, tire_preservation, tire_management, race length)."""
+    compound = COMPOUNDS[compound_name]
+    return StintTable(compound, wear_per_lap(compound, track_multiplier, tire_preservation, tire_management), max_laps)
+
+
+def safe_stints(track_multiplier: float, tire_preservation: float = 0, tire_management: float = 0) -> Dict[str, int]:
+    """Safe stint length of every compound."""
+    return {name: safe_stint_laps(wear_per_lap(compound, track_multiplier, tire_preservation, tire_management))
+            for name, compound in COMPOUNDS.items()}
@@ -1,22 +1,49 @@
-from typing import Dict, Any, List
+import random
+import threading
+import weakref
+from typing import Dict, Any, List, Optional
 from src.managers.finance_manager import FinanceManager
 from src.models.car.car import Car
 from src.managers.rd_manager import RDManager
+from src.managers.ai_rd_engine import AIResearchEngine
 from src.managers.championship_manager import ChampionshipManager
+from src.managers.staff_market import StaffMarket
+from src.managers.staff_aging import StaffAging
 from src.database.team_database import TeamDatabase
+from src.database.track_database import TrackDatabase
 from src.models.personnel.driver import Driver
 from src.models.personnel.technical_director import TechnicalDirector
 from src.models.personnel.head_of_aero import HeadOfAerodynamics
 from src.models.personnel.powertrain_lead import PowertrainLead
 from src.simulators.race_simulator import RaceEntry
 from src.database.market_database import MarketDatabase
+from src.utils.metrics import metrics
+
+_FORK_LOCK = threading.Lock() # Guards fork families (forks are made and mutated from API worker threads)
 
 class GameState:
     """
     The root data model holding everything in the current game.
     Provides methods to serialize the entire game to a dict for SaveLoadManager.
+
+    fork() makes a copy-on-write what-if copy: the fork and its parent share every component (AI teams, market,
+    R&D, finances, standings) until one of them is about to change it, at which point only that component is
+    copied (see _own). The GameState methods below own what they mutate; code that mutates a component directly
+    goes through own(name).
     """
     
+    # Team staff slot -> market role a hired/fired member of that slot belongs to
+    SLOT_ROLES = {
+        "driver_0": "drivers",
+        "driver_1": "drivers",
+        "technical_director": "technical_directors",
+        "head_of_aero": "head_of_aero",
+        "powertrain_lead": "powertrain_leads"
+    }
+    
+    # Components a fork shares with its parent until either side writes to them (see own)
+    FORKED_COMPONENTS = ("finance_manager", "championship_manager", "car", "rd_manager", "ai_teams", "staff_market")
+    
     def __init__(self):
         self.team_name = "Player Racing"
         self.finance_manager = FinanceManager()
@@ -33,11 +60,87 @@ class GameState:
         self.difficulty = "Normal"
         self.save_slot = "slot1"
         self.ai_teams: Dict[str, Dict[str, Any]] = {} # Populated later
-        self.staff_market: Dict[str, List[Any]] = {}
+        self.staff_market = StaffMarket()
+        # Seeds the procedurally generated free agents of every season. Drawn from a private RNG so it
+        # never disturbs the global random stream.
+        self.market_seed = random.Random().getrandbits(32)
+        # Live states sharing components with this one through fork() (a single set per family)
+        self._fork_family: "weakref.WeakSet[GameState]" = weakref.WeakSet()
+        # The AI teams' batched R&D engine, kept between advance_weeks calls (see _ai_research_engine)
+        self._ai_engine: Optional[AIResearchEngine] = None
         
+    # --- What-if forks ---
+
+    def fork(self) -> 'GameState':
+        """
+        A what-if copy that can be mutated and simulated forward, then discarded. O(1): components are shared
+        with this state until either side changes them, so dozens of live forks cost little more than one.
+        """
+        child = GameState.__new__(GameState)
+        child.__dict__.update(self.__dict__)
+        child.drivers = list(self.drivers) # Two references; hiring writes into the list
+        with _FORK_LOCK:
+            self._fork_family.add(self)
+            self._fork_family.add(child)
+        return child
+
+    def _has_peers(self) -> bool:
+        with _FORK_LOCK:
+            return any(peer is not self for peer in self._fork_family)
+
+    def _own(self, name: str):
+        """
+        Copies a component this state still shares with a live member of its fork family, so the change about
+        to be made stays private. The car goes with the R&D manager that develops it, as does the AI teams' pair.
+        """
+        component = getattr(self, name)
+        with _FORK_LOCK:
+            shared = any(peer is not self and peer.__dict__.get(name) is component for peer in self._fork_family)
+        if shared:
+            if name in ("car", "rd_manager"):
+                self.car = self.car.copy()
+                self.rd_manager = self.rd_manager.fork(self.car)
+            elif name == "ai_teams":
+                self.ai_teams = {team_name: self._fork_ai_team(data) for team_name, data in self.ai_teams.items()}
+            else:
+                setattr(self, name, component.fork())
+        return getattr(self, name)
+
+    def own(self, name: str):
+        """The named component, made private to this state first if a fork shares it. Use before mutating it directly."""
+        if name not in self.FORKED_COMPONENTS:
+            raise ValueError(f"Unknown game state component '{name}'.")
+        return self._own(name)
+
+    @staticmethod
+    def _fork_ai_team(data: Dict[str, Any]) -> Dict[str, Any]:
+        """An AI team with its own car and R&D progress; its drivers are only copied if they age (see _own_personnel)."""
+        team = dict(data)
+        team["car"] = data["car"].copy()
+        if data.get("rd_manager"):
+            team["rd_manager"] = data["rd_manager"].fork(team["car"])
+        return team
+
+    def _own_personnel(self):
+        """Gives this state its own copy of every staff member before they are changed in place (yearly aging)."""
+        if not self._has_peers():
+            return
+        self._own("ai_teams")
+        self.drivers = [d.copy() for d in self.drivers]
+        for slot in ("technical_director", "head_of_aero", "powertrain_lead"):
+            member = getattr(self, slot)
+            if member:
+                setattr(self, slot, member.copy())
+        for data in self.ai_teams.values():
+            data["drivers"] = [d.copy() for d in data.get("drivers", [])]
+        self.staff_market = self.staff_market.fork(copy_members=True)
+        self.relink_rd_manager()
+
     def relink_rd_manager(self):
         """Ensures the R&D manager is pointing to the active car object (fix for ghost car bug) and syncs difficulty."""
+        self._own("rd_manager")
         self.rd_manager.car = self.car
+        self.rd_manager.team_name = self.team_name
         self.rd_manager.difficulty = self.difficulty
         self.rd_manager.head_of_aero = self.head_of_aero
         self.rd_manager.powertrain_lead = self.powertrain_lead
@@ -45,13 +148,15 @@ class GameState:
     def initialize_ai_grid(self):
         """Builds the AI opposition, ensuring the player's team is excluded and setting up AI R&D Managers."""
         self.ai_teams = TeamDatabase.get_initial_teams()
-        self.staff_market = MarketDatabase.get_free_agents()
+        self.staff_market = StaffMarket(MarketDatabase.get_free_agents())
+        self.staff_market.regenerate_pool(self.market_seed, self.season)
         if self.team_name in self.ai_teams:
             self.ai_teams.pop(self.team_name)
             
         for team_name, data in self.ai_teams.items():
             ai_car = data["car"]
             ai_rd = RDManager(ai_car, is_ai=True)
+            ai_rd.team_name = team_name
             ai_rd.difficulty = self.difficulty
             
             # Apply Difficulty Scales to AI Engineering Workforce
@@ -80,9 +185,8 @@ class GameState:
                 
         return entries
         
-    def advance_week(self):
-        """Processes weekly events like aging staff and generating resource points."""
-        # 1. Generate RP based on personnel expertise
+    def get_weekly_rp_income(self) -> int:
+        """RP the player's team generates per race week from personnel expertise."""
         rp_gained = 150 # Base weekly infusion
         
         for d in self.drivers:
@@ -93,55 +197,184 @@ class GameState:
             # TD is the primary driver of development bandwidth
             rp_gained += (self.technical_director.rating * 1.5)
             
-        self.rd_manager.resource_points += int(rp_gained)
+        return int(rp_gained)
         
-        # 2. Advance Player R&D
-        self.rd_manager.advance_time(1)
+    @staticmethod
+    def get_ai_weekly_rp_income(team_data: Dict[str, Any]) -> int:
+        """Calculate AI Weekly Income (simulating their own staff quality)."""
+        ai_base_rp = 150
+        ai_driver_bonus = sum(d.rating * 0.5 for d in team_data.get("drivers", []))
+        ai_td_bonus = 80 * 1.5  # Flat assumption: AI has an ~80 OVR Technical Director
+        return int(ai_base_rp + ai_driver_bonus + ai_td_bonus)
         
-        # 4. Advance AI R&D and generate their Resource Points
-        for team_name, data in self.ai_teams.items():
-            ai_rd = data.get("rd_manager")
-            if ai_rd:
-                # Calculate AI Weekly Income (simulating their own staff quality)
-                ai_base_rp = 150
-                ai_driver_bonus = sum(d.rating * 0.5 for d in data.get("drivers", []))
-                ai_td_bonus = 80 * 1.5  # Flat assumption: AI has an ~80 OVR Technical Director
-                
-                ai_rd.resource_points += int(ai_base_rp + ai_driver_bonus + ai_td_bonus)
+    def advance_week(self):
+        """Processes weekly events like aging staff and generating resource points."""
+        self.advance_weeks(1)
+        
+    def advance_weeks(self, weeks: int):
+        """
+        Event-driven equivalent of calling advance_week() `weeks` times.
+        Every team jumps together to the next week in which anything can happen (a project completing,
+        or an AI being able to buy/reassign), so the cost scales with R&D events rather than weeks.
+        """
+        self._own("rd_manager")
+        self._own("ai_teams")
+        player_rp = self.get_weekly_rp_income()
+        ai_engine = self._ai_research_engine()
+        
+        remaining = weeks
+        while remaining > 0:
+            step = remaining
+            for eta in (self.rd_manager.next_completion_in(), ai_engine.next_event_in()):
+                if eta is not None:
+                    step = min(step, eta)
+                        
+            # 1. Generate RP & advance Player R&D
+            self.rd_manager.resource_points += player_rp * step
+            self.rd_manager.advance_time(step)
+            
+            # 2. Advance AI R&D, generate their Resource Points and run autonomous project selection (batched)
+            ai_engine.advance(step)
                 
-                # Advance active projects and execute autonomous project selection
-                ai_rd.advance_time(1)
-                ai_rd.update_availability()
+            remaining -= step
+        ai_engine.flush()
                 
-    def process_yearly_aging(self):
-        """Processes end-of-season aging for every staff member in the simulation."""
-        # Player Team
-        for d in self.drivers:
-            d.process_yearly_aging()
-        if self.technical_director:
-            self.technical_director.process_yearly_aging()
-        if self.head_of_aero:
-            self.head_of_aero.process_yearly_aging()
-        if self.powertrain_lead:
-            self.powertrain_lead.process_yearly_aging()
+    def _ai_research_engine(self) -> AIResearchEngine:
+        """
+        The AI teams' R&D engine, built once per set of AI R&D managers and synced with their RP income. Forks,
+        loads and new grids replace the managers, so the identity check in serves() is what invalidates it.
+        """
+        teams = [(data["rd_manager"], self.get_ai_weekly_rp_income(data))
+                 for data in self.ai_teams.values() if data.get("rd_manager")]
+        # The AI plans its research over the races still to come (after the finale, over next season's calendar)
+        race_index = self.current_race_index if self.current_race_index < len(TrackDatabase.get_calendar()) else 0
+        for rd, _ in teams:
+            rd.race_index = race_index
+        engine = self._ai_engine
+        if engine is None or not engine.serves([rd for rd, _ in teams]):
+            engine = self._ai_engine = AIResearchEngine(teams)
+        else:
+            engine.sync([weekly_rp for _, weekly_rp in teams])
+        return engine
+
+    def get_staff_in_slot(self, slot: str):
+        """The team member currently in a staff slot (None if empty). Raises ValueError for an unknown slot."""
+        if slot == "driver_0":
+            return self.drivers[0]
+        elif slot == "driver_1":
+            return self.drivers[1]
+        elif slot == "technical_director":
+            return self.technical_director
+        elif slot == "head_of_aero":
+            return self.head_of_aero
+        elif slot == "powertrain_lead":
+            return self.powertrain_lead
+        raise ValueError("Invalid slot.")
+
+    def _set_staff_in_slot(self, slot: str, member):
+        if slot == "driver_0":
+            self.drivers[0] = member
+        elif slot == "driver_1":
+            self.drivers[1] = member
+        elif slot == "technical_director":
+            self.technical_director = member
+        elif slot == "head_of_aero":
+            self.head_of_aero = member
+            self.relink_rd_manager()
+        elif slot == "powertrain_lead":
+            self.powertrain_lead = member
+            self.relink_rd_manager()
+
+    def hire_staff(self, slot: str, staff_id: str) -> Dict[str, int]:
+        """
+        Signs a free agent into a slot, paying a signing bonus (half a salary) plus the incumbent's severance.
+        The incumbent goes back onto the market. Raises KeyError if the agent isn't listed and ValueError for an
+        invalid slot or when the team can't afford it.
+        """
+        target_staff = self._own("staff_market").get(staff_id) # Looking up a generated agent lists it
+        if target_staff is None:
+            raise KeyError("Staff member not found in market.")
+        incumbent = self.get_staff_in_slot(slot)
+        
+        # Calculate costs
+        signing_bonus = int(target_staff.salary * 0.5)
+        severance = 0
+        if incumbent:
+            severance = int(incumbent.salary * incumbent.contract_length_years * 0.5)
+            
+        total_cost = signing_bonus + severance
+        costs = [(signing_bonus, "signing_bonus", target_staff.name)]
+        if severance:
+            costs.append((severance, "severance", incumbent.name))
+        self.stamp_finances()
+        if not self.finance_manager.charge(costs):
+            raise ValueError(f"Cannot afford ${total_cost:,} total cost (Signing + Severance).")
             
+        # Execute the swap. The incumbent is listed under the same role as the new hire.
+        target_role, _ = self.staff_market.remove(staff_id)
+        if incumbent:
+            self.staff_market.add(target_role, incumbent)
+        self._set_staff_in_slot(slot, target_staff)
+        return {"signing_bonus": signing_bonus, "severance": severance}
+
+    def fire_staff(self, slot: str) -> int:
+        """
+        Releases a department head onto the market, paying severance. Drivers can only be replaced via hiring.
+        Returns the severance paid; raises ValueError when the firing isn't possible or affordable.
+        """
+        if slot in ["driver_0", "driver_1"]:
+            raise ValueError("Drivers must be replaced via hiring, cannot be left empty.")
+        incumbent = self.get_staff_in_slot(slot)
+        if not incumbent:
+            raise ValueError("Slot is already empty.")
+            
+        severance = int(incumbent.salary * incumbent.contract_length_years * 0.5)
+        self.stamp_finances()
+        if not self.finance_manager.spend(severance, category="severance", note=incumbent.name):
+            raise ValueError(f"Cannot afford ${severance:,} severance.")
+            
+        self._own("staff_market").add(self.SLOT_ROLES[slot], incumbent)
+        self._set_staff_in_slot(slot, None)
+        return severance
+
+    def stamp_finances(self):
+        """Stamps ledger transactions recorded from here on with the current season and race."""
+        self._own("finance_manager").set_clock(self.season, self.current_race_index)
+
+    def roll_over_season(self):
+        """
+        Ages every staff member, starts the next season's calendar and brings in a fresh free-agent cohort.
+        Ledger entries of seasons past the kept window are compacted into their season totals.
+        """
+        self.process_yearly_aging()
+        self.season += 1
+        self.current_race_index = 0
+        self._own("staff_market").regenerate_pool(self.market_seed, self.season)
+        self.stamp_finances()
+        self.finance_manager.compact()
+
+    def process_yearly_aging(self):
+        """
+        Processes end-of-season aging for every staff member in the simulation, in one batched pass
+        (see StaffAging). The rolls come from a stream seeded by (market_seed, season), so a season's aging
+        replays identically from the same save. A forked state ages its own copies of everyone.
+        """
+        self._own_personnel()
+        personnel = list(self.drivers)
+        personnel.extend(s for s in (self.technical_director, self.head_of_aero, self.powertrain_lead) if s)
         # AI Teams
         for team_name, data in self.ai_teams.items():
-            for d in data.get("drivers", []):
-                d.process_yearly_aging()
-                
-        # Free Agent Market
+            personnel.extend(data.get("drivers", []))
+        # Free Agent Market (generated pool rows are replaced by a fresh cohort at rollover instead)
         for role, staff_list in self.staff_market.items():
-            for s in staff_list:
-                s.process_yearly_aging()
+            personnel.extend(staff_list)
+
+        StaffAging(random.Random(f"aging:{self.market_seed}:{self.season}")).age(personnel)
+        self.staff_market.refresh() # Ratings and ages moved, so the sorted indexes are stale
         
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the entire game state into a dictionary."""
-        staff_market_dict = {}
-        if self.staff_market:
-            for role, staff_list in self.staff_market.items():
-                staff_market_dict[role] = [s.to_dict() for s in staff_list]
-                
+        staff_market, staff_market_pool = self.staff_market.to_save_dict()
         return {
             "team_name": self.team_name,
             "season": self.season,
@@ -156,7 +389,9 @@ class GameState:
             "technical_director": self.technical_director.to_dict() if self.technical_director else None,
             "head_of_aero": self.head_of_aero.to_dict() if self.head_of_aero else None,
             "powertrain_lead": self.powertrain_lead.to_dict() if self.powertrain_lead else None,
-            "staff_market": staff_market_dict,
+            "staff_market": staff_market,
+            "staff_market_pool": staff_market_pool,
+            "market_seed": self.market_seed,
             "ai_teams": {
                 name: {
                     "car": data["car"].to_dict(),
@@ -167,6 +402,7 @@ class GameState:
             }
         }
         
+    @metrics.timed("state.load_from_dict")
     def load_from_dict(self, data: Dict[str, Any]):
         """Populate this GameState object using a loaded dictionary."""
         if not data:
@@ -174,6 +410,7 @@ class GameState:
             
         self.team_name = data.get("team_name", "Player Racing")
         self.season = data.get("season", 1)
+        self.market_seed = data.get("market_seed", self.market_seed)
         self.difficulty = data.get("difficulty", "Normal")
         self.save_slot = data.get("save_slot", "slot1")
         self.current_race_index = data.get("current_race_index", 0)
@@ -186,6 +423,7 @@ class GameState:
             for name, team_data in data["ai_teams"].items():
                 ai_car = Car.from_dict(team_data["car"])
                 ai_rd = RDManager(ai_car, is_ai=True)
+                ai_rd.team_name = name
                 if "rd_manager" in team_data and team_data["rd_manager"]:
                     ai_rd.load_from_dict(team_data["rd_manager"])
                 
@@ -230,16 +468,7 @@ class GameState:
             self.powertrain_lead = PowertrainLead.from_dict(data["powertrain_lead"])
             
         if "staff_market" in data:
-            self.staff_market = {}
-            for role, staff_list in data["staff_market"].items():
-                if role == "drivers":
-                    self.staff_market[role] = [Driver.from_dict(d) for d in staff_list]
-                elif role == "technical_directors":
-                    self.staff_market[role] = [TechnicalDirector.from_dict(d) for d in staff_list]
-                elif role == "head_of_aero":
-                    self.staff_market[role] = [HeadOfAerodynamics.from_dict(d) for d in staff_list]
-                elif role == "powertrain_leads":
-                    self.staff_market[role] = [PowertrainLead.from_dict(d) for d in staff_list]
+            self.staff_market = StaffMarket.from_dict(data["staff_market"], data.get("staff_market_pool"))
             
         # Re-link the newly loaded department leads to the R&D manager
         self.relink_rd_manager()
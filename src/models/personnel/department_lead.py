@@ -5,6 +5,7 @@ class DepartmentLead(StaffMember):
     """Base class for R&D Department Leads (e.g., Head of Aero).
     They provide flat stat bonuses to completed R&D nodes based on their expertise.
     """
+    __slots__ = ("expertise",)
     
     def __init__(self, name: str, salary: int, rating: int, expertise: int, age: int = 40, contract_length_years: int = 2):
         super().__init__(name, salary, rating, age, contract_length_years)
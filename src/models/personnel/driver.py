@@ -3,6 +3,7 @@ from src.models.personnel.staff_member import StaffMember
 
 class Driver(StaffMember):
     """Driver data model with specific performance attributes for the Simulator to use."""
+    __slots__ = ("speed", "consistency", "tire_management")
     
     def __init__(self, name: str, salary: int, rating: int, speed: int, consistency: int, tire_management: int, age: int = 25, contract_length_years: int = 2):
         super().__init__(name, salary, rating, age, contract_length_years)
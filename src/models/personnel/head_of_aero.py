@@ -3,6 +3,7 @@ from src.models.personnel.department_lead import DepartmentLead
 
 class HeadOfAerodynamics(DepartmentLead):
     """Lead tracking aerodynamic-specific parts to boost their quality."""
+    __slots__ = ()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'HeadOfAerodynamics':
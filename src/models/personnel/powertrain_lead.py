@@ -3,6 +3,7 @@ from src.models.personnel.department_lead import DepartmentLead
 
 class PowertrainLead(DepartmentLead):
     """Lead tracking powertrain-specific parts to boost their quality."""
+    __slots__ = ()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PowertrainLead':
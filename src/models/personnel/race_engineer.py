@@ -3,6 +3,7 @@ from src.models.personnel.staff_member import StaffMember
 
 class RaceEngineer(StaffMember):
     """Assigned 1:1 with a driver. A high-rating Race Engineer can mitigate consistency or tire wear penalties during races."""
+    __slots__ = ()
     
     def __init__(self, name: str, salary: int, rating: int, age: int = 35, contract_length_years: int = 2):
         super().__init__(name, salary, rating, age, contract_length_years)
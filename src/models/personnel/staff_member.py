@@ -1,8 +1,10 @@
 from typing import Dict, Any
+import copy
 import uuid
 
 class StaffMember:
     """Base class for all team personnel (Drivers, Tech Directors, etc.)."""
+    __slots__ = ("id", "name", "salary", "rating", "age", "contract_length_years") # Subclasses declare only the fields they add
     
     def __init__(self, name: str, salary: int, rating: int, age: int = 30, contract_length_years: int = 2):
         self.id = str(uuid.uuid4())
@@ -35,6 +37,10 @@ class StaffMember:
             if random.random() < 0.8: # 80% chance for rapid decline in old age
                 self.rating = max(1, self.rating - random.randint(1, 3))
 
+    def copy(self) -> 'StaffMember':
+        """Same person (id included) as an independent object, for forked game states that age staff in place."""
+        return copy.copy(self)
+
     def to_dict(self) -> Dict[str, Any]:
         """Serialize core attributes for save/load. Subclasses should call this and extend."""
         return {
@@ -3,6 +3,7 @@ from src.models.personnel.staff_member import StaffMember
 
 class TechnicalDirector(StaffMember):
     """Technical Director data model. Highly impacts R&D speed and cost efficiency."""
+    __slots__ = ("aero_expertise", "chassis_expertise", "powertrain_expertise")
     
     def __init__(self, name: str, salary: int, rating: int, aero_expertise: int, chassis_expertise: int, powertrain_expertise: int, age: int = 45, contract_length_years: int = 2):
         super().__init__(name, salary, rating, age, contract_length_years)
@@ -2,6 +2,10 @@ from typing import Dict, Any
 
 class Track:
     """Represents a racing circuit and its performance weightings."""
+    __slots__ = (
+        "name", "country", "laps", "base_lap_time", "tire_wear_multiplier", "aero_weight", "chassis_weight",
+        "powertrain_weight"
+    )
     
     def __init__(self, name: str, country: str, laps: int, base_lap_time: float, 
                  aero_weight: float = 1.0, 
@@ -0,0 +1,94 @@
+import random
+from collections import defaultdict
+from typing import List, Dict, Any, Tuple
+
+from src.models.car.tire import tire_model
+from src.models.world.track import Track
+
+Strategy = List[Dict[str, Any]]
+
+# Offsets (inclusive ranges) the AI adds to its safe stint lengths
+ONE_STOP_OFFSETS = (-2, 3)
+FIRST_STINT_OFFSETS = (-1, 2)
+SECOND_MEDIUM_OFFSETS = (-2, 2)
+SECOND_HARD_OFFSETS = (-2, 5)
+GAMBLE_CHANCE = 0.15 # Chance to do a really dumb strategy (staying out too long on Softs)
+
+
+def safe_stint_laps(track: Track) -> Dict[str, int]:
+    """Laps each compound lasts on this track before reaching the tire model's safe wear."""
+    return tire_model.safe_stints(track.tire_wear_multiplier)
+
+
+def plan_strategy(track: Track, safe: Dict[str, int], gamble: bool, num_stops: int, soft_medium: bool,
+                  first_offset: int, second_offset: int) -> Strategy:
+    """The strategy the AI rules produce for one set of decisions (no randomness here)."""
+    target_laps = track.laps
+    strategy = []
+    if gamble:
+        laps_first = min(target_laps - 1, int(safe["Soft"] * 1.5))
+        strategy.append({"compound": "Soft", "laps": laps_first})
+        if target_laps - laps_first > 0:
+            strategy.append({"compound": "Hard", "laps": target_laps - laps_first})
+    elif num_stops == 1:
+        # Medium -> Hard
+        laps_first = min(safe["Medium"] + first_offset, target_laps - 1)
+        strategy.append({"compound": "Medium", "laps": laps_first})
+        if target_laps - laps_first > 0:
+            strategy.append({"compound": "Hard", "laps": target_laps - laps_first})
+    else:
+        # Soft -> Medium -> Medium OR Soft -> Hard -> Soft
+        second, last = ("Medium", "Medium") if soft_medium else ("Hard", "Soft")
+        laps_first = min(safe["Soft"] + first_offset, target_laps - 2)
+        laps_second = min(safe[second] + second_offset, (target_laps - laps_first) - 1)
+        if laps_second <= 0: laps_second = 1
+        strategy.append({"compound": "Soft", "laps": laps_first})
+        strategy.append({"compound": second, "laps": laps_second})
+        if target_laps - laps_first - laps_second > 0:
+            strategy.append({"compound": last, "laps": target_laps - laps_first - laps_second})
+    return strategy
+
+
+def build_ai_strategy(track: Track, rng=random, safe: Dict[str, int] = None) -> Strategy:
+    """
+    Adaptive AI race strategy: a 1 or 2 stop plan sized around each compound's safe stint length on this track,
+    with some randomness. `rng` defaults to the global random module (what simulate_race uses).
+    """
+    safe = safe or safe_stint_laps(track)
+    num_stops = rng.choice([1, 2, 2]) # Bias towards 2 stops for safety
+    if rng.random() < GAMBLE_CHANCE:
+        return plan_strategy(track, safe, True, num_stops, False, 0, 0)
+    if num_stops == 1:
+        return plan_strategy(track, safe, False, 1, False, rng.randint(*ONE_STOP_OFFSETS), 0)
+    soft_medium = rng.choice([True, False])
+    first_offset = rng.randint(*FIRST_STINT_OFFSETS)
+    second_offset = rng.randint(*(SECOND_MEDIUM_OFFSETS if soft_medium else SECOND_HARD_OFFSETS))
+    return plan_strategy(track, safe, False, 2, soft_medium, first_offset, second_offset)
+
+
+def strategy_distribution(track: Track) -> List[Tuple[float, Strategy]]:
+    """
+    Every strategy build_ai_strategy can return on this track with its probability, found by walking the
+    same decision tree. Identical plans reached by different decisions are merged.
+    """
+    safe = safe_stint_laps(track)
+    weights: Dict[Tuple, float] = defaultdict(float)
+    plans: Dict[Tuple, Strategy] = {}
+
+    def add(probability: float, strategy: Strategy):
+        key = tuple((stint["compound"], stint["laps"]) for stint in strategy)
+        weights[key] += probability
+        plans[key] = strategy
+
+    add(GAMBLE_CHANCE, plan_strategy(track, safe, True, 1, False, 0, 0))
+    planned = 1.0 - GAMBLE_CHANCE
+    low, high = ONE_STOP_OFFSETS
+    for offset in range(low, high + 1):
+        add(planned / 3 / (high - low + 1), plan_strategy(track, safe, False, 1, False, offset, 0))
+    for soft_medium, (second_low, second_high) in ((True, SECOND_MEDIUM_OFFSETS), (False, SECOND_HARD_OFFSETS)):
+        first_low, first_high = FIRST_STINT_OFFSETS
+        probability = planned * 2 / 3 / 2 / (first_high - first_low + 1) / (second_high - second_low + 1)
+        for first_offset in range(first_low, first_high + 1):
+            for second_offset in range(second_low, second_high + 1):
+                add(probability, plan_strategy(track, safe, False, 2, soft_medium, first_offset, second_offset))
+    return [(weights[key], plans[key]) for key in weights]
@@ -0,0 +1,244 @@
+import math
+import multiprocessing
+import os
+import random
+from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Any, Optional, Sequence
+
+from src.models.world.track import Track
+
+
+class RaceStreams:
+    """
+    Pre-generated uniforms for every roll of one race: (mistake, mistake size, tire failure) per entry and lap,
+    drawn from a seed. A roll source for RaceSimulator(rolls=...).
+
+    Because every (entry, lap) has its own numbers, two races replaying the same streams get the same luck
+    wherever they differ (common random numbers), even when a changed stat alters which rolls come up.
+    mirrored() is the antithetic partner: every uniform u becomes 1 - u.
+    """
+
+    ROLLS_PER_LAP = 3
+    MISTAKE_MAX = 1.5 # Same range as SequentialRolls.mistake
+
+    __slots__ = ("entries", "laps", "uniforms", "flipped")
+
+    def __init__(self, seed, entries: int, laps: int, uniforms: Optional[array] = None, flipped: bool = False):
+        self.entries = entries
+        self.laps = laps
+        if uniforms is None:
+            draw = random.Random(seed).random
+            # Lap 0 is qualifying
+            uniforms = array('d', (draw() for _ in range((laps + 1) * entries * self.ROLLS_PER_LAP)))
+        self.uniforms = uniforms
+        self.flipped = flipped
+
+    def mirrored(self) -> 'RaceStreams':
+        return RaceStreams(None, self.entries, self.laps, self.uniforms, not self.flipped)
+
+    def _uniform(self, index: int, lap: int, roll: int) -> float:
+        u = self.uniforms[(lap * self.entries + index) * self.ROLLS_PER_LAP + roll]
+        return 1.0 - u if self.flipped else u
+
+    def mistake(self, index: int, lap: int, chance: float) -> float:
+        if self._uniform(index, lap, 0) < chance:
+            return self.MISTAKE_MAX * self._uniform(index, lap, 1)
+        return 0.0
+
+    def tire_failure(self, index: int, lap: int, chance: float) -> bool:
+        return self._uniform(index, lap, 2) < chance
+
+
+class RaceExperiment(ABC):
+    """
+    What a MonteCarloRunner samples. prepare() draws the per-sample inputs that aren't simulator rolls (AI
+    strategies, say); measure() runs every scenario race it needs on the same RaceStreams and returns one value
+    per name in `metrics` (outcomes, or differences between scenarios for common-random-number pairing).
+    Subclasses must pickle, since they are sent to worker processes.
+    """
+
+    metrics: Sequence[str] = ()
+    precision_metrics: Optional[Sequence[str]] = None # Metrics the early stop waits for (default: all)
+    races_per_measure = 1
+
+    def __init__(self, track: Track, entries: int):
+        self.track = track
+        self.entries = entries
+
+    def prepare(self, rng: random.Random) -> Any:
+        return None
+
+    @abstractmethod
+    def measure(self, prepared: Any, streams: RaceStreams) -> Sequence[float]:
+        ...
+
+
+class RunningEstimate:
+    """Count, sum and sum of squares per metric for sample means, their confidence intervals and merging."""
+
+    __slots__ = ("n", "sums", "squares")
+
+    def __init__(self, size: int):
+        self.n = 0
+        self.sums = [0.0] * size
+        self.squares = [0.0] * size
+
+    def add(self, values: Sequence[float]):
+        self.n += 1
+        for i, value in enumerate(values):
+            self.sums[i] += value
+            self.squares[i] += value * value
+
+    def merge(self, other: 'RunningEstimate'):
+        self.n += other.n
+        for i in range(len(self.sums)):
+            self.sums[i] += other.sums[i]
+            self.squares[i] += other.squares[i]
+
+    def mean(self, i: int) -> float:
+        return self.sums[i] / self.n if self.n else 0.0
+
+    def variance(self, i: int) -> float:
+        if self.n < 2:
+            return math.inf
+        mean = self.mean(i)
+        return max(0.0, (self.squares[i] - self.n * mean * mean) / (self.n - 1))
+
+    def half_width(self, i: int, z: float) -> float:
+        """Half width of the normal confidence interval of metric i's mean."""
+        return z * math.sqrt(self.variance(i) / self.n) if self.n >= 2 else math.inf
+
+
+def _run_block(experiment: RaceExperiment, seed, samples: int, antithetic: bool) -> Dict[str, RunningEstimate]:
+    """
+    `samples` samples from one seeded block. "estimate" holds the sample values (antithetic pair averages);
+    "single" holds the individual race values, to report how much the pairing saved.
+    """
+    rng = random.Random(seed)
+    size = len(experiment.metrics)
+    estimate, single = RunningEstimate(size), RunningEstimate(size)
+    laps = experiment.track.laps
+    for _ in range(samples):
+        prepared = experiment.prepare(rng)
+        streams = RaceStreams(rng.getrandbits(64), experiment.entries, laps)
+        values = list(experiment.measure(prepared, streams))
+        single.add(values)
+        if antithetic:
+            partner = experiment.measure(prepared, streams.mirrored())
+            single.add(partner)
+            values = [(a + b) / 2 for a, b in zip(values, partner)]
+        estimate.add(values)
+    return {"estimate": estimate, "single": single}
+
+
+_worker_experiment: Optional[RaceExperiment] = None
+
+def _init_worker(experiment: RaceExperiment):
+    global _worker_experiment
+    _worker_experiment = experiment
+
+def _worker_block(seed, samples: int, antithetic: bool) -> Dict[str, RunningEstimate]:
+    return _run_block(_worker_experiment, seed, samples, antithetic)
+
+
+class MonteCarloRunner:
+    """
+    Runs a RaceExperiment in seeded blocks until every metric's confidence interval is within `precision`
+    (absolute half width) or max_samples is reached, in process or across spawn workers.
+
+    Variance reduction: each sample's races share pre-generated per-entry/lap streams (common random numbers
+    across the experiment's scenarios). antithetic=True also averages each sample with a replay on the mirrored
+    streams; that doubles the races per sample, so it is opt-in and only pays when a metric's reported
+    antithetic_gain is well above 1 (position differences measure about 1).
+
+    Blocks are merged and checked in block order, so a seed gives the same answer and stopping point for any
+    worker count (workers may compute a few blocks past the stop, which are discarded). workers defaults to,
+    and is capped at, the CPU count.
+    """
+
+    BLOCK_SAMPLES = 10
+    MIN_SAMPLES = 20 # Before an interval is trusted for stopping
+
+    def __init__(self, experiment: RaceExperiment, antithetic: bool = False, confidence: float = 0.95):
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("confidence must be between 0 and 1.")
+        self.experiment = experiment
+        self.antithetic = antithetic
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def run(self, max_samples: int = 1_000, precision: Optional[float] = None, workers: Optional[int] = None,
+            seed=None) -> Dict[str, Any]:
+        if max_samples < 2:
+            raise ValueError("max_samples must be at least 2.")
+        seed = random.Random().getrandbits(32) if seed is None else seed
+        blocks = [(f"{seed}:{n}", min(self.BLOCK_SAMPLES, max_samples - start))
+                  for n, start in enumerate(range(0, max_samples, self.BLOCK_SAMPLES))]
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(workers or cpus, cpus, len(blocks))) # More processes than cores only adds spawn cost
+        size = len(self.experiment.metrics)
+        estimate, single = RunningEstimate(size), RunningEstimate(size)
+
+        def absorb(block: Dict[str, RunningEstimate]) -> bool:
+            estimate.merge(block["estimate"])
+            single.merge(block["single"])
+            return self._precise(estimate, precision)
+
+        stopped_early = False
+        if workers == 1:
+            for block in blocks:
+                if absorb(_run_block(self.experiment, *block, self.antithetic)):
+                    stopped_early = estimate.n < max_samples
+                    break
+        else:
+            # spawn, not fork: the server process has logging/metrics threads whose locks a fork could copy held
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker, initargs=(self.experiment,)) as pool:
+                # Rounds of one block per worker, so an early stop wastes at most a round
+                for start in range(0, len(blocks), workers):
+                    futures = [pool.submit(_worker_block, *block, self.antithetic) for block in blocks[start:start + workers]]
+                    done = False
+                    for future in futures:
+                        if not done and absorb(future.result()):
+                            done = True
+                    if done:
+                        stopped_early = estimate.n < max_samples
+                        break
+        return self._result(estimate, single, seed, workers, precision, stopped_early)
+
+    def _precise(self, estimate: RunningEstimate, precision: Optional[float]) -> bool:
+        if precision is None or estimate.n < self.MIN_SAMPLES:
+            return False
+        watched = self.experiment.precision_metrics or self.experiment.metrics
+        return all(estimate.half_width(self.experiment.metrics.index(name), self.z) <= precision for name in watched)
+
+    def _result(self, estimate: RunningEstimate, single: RunningEstimate, seed, workers: int,
+                precision: Optional[float], stopped_early: bool) -> Dict[str, Any]:
+        metrics = {}
+        for i, name in enumerate(self.experiment.metrics):
+            mean, half_width = estimate.mean(i), estimate.half_width(i, self.z)
+            races = 2 if self.antithetic else 1
+            pair_variance = estimate.variance(i)
+            # Independent races needed for this precision, relative to what the pairing needed
+            reduction = single.variance(i) / (races * pair_variance) if pair_variance > 0 else None
+            metrics[name] = {
+                "mean": round(mean, 4),
+                "ci_low": round(mean - half_width, 4),
+                "ci_high": round(mean + half_width, 4),
+                "half_width": round(half_width, 4),
+                "antithetic_gain": round(reduction, 2) if self.antithetic and reduction is not None else None
+            }
+        return {
+            "samples": estimate.n,
+            "races": estimate.n * self.experiment.races_per_measure * (2 if self.antithetic else 1),
+            "antithetic": self.antithetic,
+            "confidence": self.confidence,
+            "precision": precision,
+            "stopped_early": stopped_early,
+            "seed": seed,
+            "workers": workers,
+            "metrics": metrics
+        }
@@ -1,17 +1,21 @@
 import random
+from array import array
+from collections.abc import Sequence
 from typing import List, Dict, Any
 
 from src.models.car.car import Car
 from src.models.personnel.driver import Driver
 from src.models.world.track import Track
-from src.models.car.tire.tire_compound import COMPOUNDS, TireCompound
-
-from src.models.car.car import Car
-from src.models.personnel.driver import Driver
-from src.models.world.track import Track
+from src.models.car.tire.tire_compound import COMPOUNDS
+from src.models.car.tire import tire_model
 
 class RaceEntry:
     """Helper class to couple a driver and a car for the simulator."""
+    __slots__ = (
+        "driver", "car", "team_name", "stints_remaining", "current_compound", "current_target_laps",
+        "current_stint_laps", "current_lap_time", "total_race_time", "tire_wear", "pit_stops", "dnf"
+    )
+    
     def __init__(self, driver: Driver, car: Car, team_name: str, strategy: List[Dict[str, Any]] = None):
         self.driver = driver
         self.car = car
@@ -34,25 +38,157 @@ class RaceEntry:
         self.pit_stops = 0
         self.dnf = False
 
+class SequentialRolls:
+    """
+    The simulator's random rolls drawn one after another from a random.Random-like source, in lap and entry
+    order. How many numbers a lap consumes depends on what happens in it (a mistake takes a second draw).
+    """
+    __slots__ = ("rng",)
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def mistake(self, index: int, lap: int, chance: float) -> float:
+        """Seconds lost to a driver mistake this lap (0.0 if none)."""
+        return self.rng.uniform(0.0, 1.5) if self.rng.random() < chance else 0.0
+
+    def tire_failure(self, index: int, lap: int, chance: float) -> bool:
+        return self.rng.random() < chance
+
+class RunningOrder:
+    """
+    Entry indices by total race time, ties by index (the order sorted() gives the entries), kept up to date lap
+    to lap. Re-sorting last lap's order is an argsort of nearly sorted data, which the adaptive list.sort does in
+    close to linear time: only the overtakes move.
+    """
+    __slots__ = ("order",)
+
+    def __init__(self, size: int):
+        self.order = list(range(size))
+
+    def update(self, times: List[float]) -> List[int]:
+        order = self.order
+        order.sort(key=times.__getitem__)
+        if len(set(times)) < len(times):
+            self._order_ties(times)
+        return order
+
+    def _order_ties(self, times: List[float]):
+        """list.sort keeps tied entries in last lap's order; puts each tied run in index order."""
+        order = self.order
+        start = 0
+        for k in range(1, len(order) + 1):
+            if k == len(order) or times[order[k]] != times[order[start]]:
+                if k - start > 1:
+                    order[start:k] = sorted(order[start:k])
+                start = k
+
+class LapColumns:
+    """One lap of a large-grid race: the running order and each standings field in that order."""
+    __slots__ = ("lap", "order", "lap_times", "totals", "wear", "stops", "compounds", "dnf")
+
+    def __init__(self, lap: int, order: List[int], entries: List[RaceEntry]):
+        ranked = [entries[i] for i in order]
+        self.lap = lap
+        self.order = array('i', order)
+        self.lap_times = array('d', [e.current_lap_time for e in ranked])
+        self.totals = array('d', [e.total_race_time for e in ranked])
+        self.wear = array('d', [e.tire_wear for e in ranked])
+        self.stops = array('i', [e.pit_stops for e in ranked])
+        self.compounds = [e.current_compound.name for e in ranked]
+        self.dnf = bytes(e.dnf for e in ranked)
+
+class LapLog(Sequence):
+    """
+    race_log of a large-grid race. Laps are kept as LapColumns; a lap's standings dicts, intervals to the leader
+    included, are only built when that lap is read, in the same format as the default race_log.
+    """
+    __slots__ = ("names", "laps")
+
+    def __init__(self, entries: List[RaceEntry]):
+        self.names = [(e.driver.name, e.team_name) for e in entries]
+        self.laps: List[LapColumns] = []
+
+    def record(self, lap: int, order: List[int], entries: List[RaceEntry]):
+        self.laps.append(LapColumns(lap, order, entries))
+
+    def __len__(self) -> int:
+        return len(self.laps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._lap_data(columns) for columns in self.laps[index]]
+        return self._lap_data(self.laps[index])
+
+    def _lap_data(self, columns: LapColumns) -> Dict[str, Any]:
+        leader_time = columns.totals[0]
+        return {
+            "lap": columns.lap,
+            "standings": [
+                {
+                    "driver": self.names[i][0],
+                    "team": self.names[i][1],
+                    "lap_time": columns.lap_times[k],
+                    "total_time": columns.totals[k],
+                    "interval": "DNF" if columns.dnf[k] else columns.totals[k] - leader_time,
+                    "stops": columns.stops[k],
+                    "wear": columns.wear[k],
+                    "compound": columns.compounds[k]
+                }
+                for k, i in enumerate(columns.order)
+            ]
+        }
+
 class RaceSimulator:
     """
     Headless simulator execution engine. Completely decoupled from UI.
     Takes a list of RaceEntries and runs mathematical calculations out of them.
     """
     
-    def __init__(self, entries: List[RaceEntry], track: Track):
+    # Seconds of lap time a 100-rated (normalized) car gains over the track's base lap time
+    CAR_ADVANTAGE_SECONDS = 4.75
+    
+    # Race rules, shared with the compiled season projection and the R&D tire valuation
+    PIT_LOSS = 22.0 # Seconds a planned stop costs in the pitlane
+    EMERGENCY_PIT_LOSS = 25.0 # Unplanned stop on worn-out tires: slower pitbox interaction
+    EMERGENCY_WEAR = 100.0 # Tire wear that forces an unplanned stop when more stints are scheduled
+    FAILURE_WEAR = 110.0 # Tire wear past which every lap rolls for a failure
+    FAILURE_CHANCE = 0.3
+    DNF_LAP_PENALTY = 180.0 # Per remaining lap, pushing retirements to the bottom
+
+    # Which track weighting each car stat is scaled by in _calculate_lap_time
+    STAT_TRACK_WEIGHTS = {
+        "aero.downforce": "aero_weight",
+        "aero.drag_efficiency": "aero_weight",
+        "chassis.weight_reduction": "chassis_weight",
+        "chassis.tire_preservation": "chassis_weight",
+        "powertrain.power_output": "powertrain_weight",
+        "powertrain.reliability": "powertrain_weight"
+    }
+    
+    def __init__(self, entries: List[RaceEntry], track: Track, rng=None, rolls=None, large_grid: bool = False):
         self.entries = entries
         self.track = track
+        # Source of every mistake and tire-failure roll: sequential draws from the global random module unless
+        # a seeded random.Random (rng) or a roll source keyed by entry and lap (rolls, see monte_carlo.RaceStreams)
+        # is given
+        self.rolls = rolls if rolls is not None else SequentialRolls(rng if rng is not None else random)
+        self.lap = 0 # Lap being simulated (0 while qualifying)
+        self._car_advantages: Dict[int, float] = {} # id(car) -> car_advantage; cars don't change during a race
         self.total_laps = track.laps
         self.base_lap_time = track.base_lap_time
-        self.race_log = [] # Generates a lap-by-lap log
+        # Large-grid mode (custom leagues, batch runs with hundreds of entries) keeps the running order
+        # incrementally and the log as per-lap columns (LapLog) instead of re-sorting and building dicts every lap
+        self.large_grid = large_grid
+        self.race_log = LapLog(entries) if large_grid else [] # Generates a lap-by-lap log
         
-    def _calculate_lap_time(self, entry: RaceEntry) -> float:
-        """Calculates lap time based on driver skill, weighted car performance, and tire wear."""
+    @staticmethod
+    def car_advantage(car: Car, track: Track) -> float:
+        """Seconds the car's track-weighted performance takes off the base lap time."""
         # Calculate track-specific weighted car performance
-        aero_perf = (entry.car.aero.downforce + entry.car.aero.drag_efficiency) * self.track.aero_weight
-        chassis_perf = (entry.car.chassis.weight_reduction + entry.car.chassis.tire_preservation) * self.track.chassis_weight
-        powertrain_perf = (entry.car.powertrain.power_output + entry.car.powertrain.reliability) * self.track.powertrain_weight
+        aero_perf = (car.aero.downforce + car.aero.drag_efficiency) * track.aero_weight
+        chassis_perf = (car.chassis.weight_reduction + car.chassis.tire_preservation) * track.chassis_weight
+        powertrain_perf = (car.powertrain.power_output + car.powertrain.reliability) * track.powertrain_weight
         
         # Max theoretical rating per module is roughly 200 * weight. Average total around 600.
         weighted_car_perf = aero_perf + chassis_perf + powertrain_perf
@@ -60,76 +196,69 @@ class RaceSimulator:
         # Normalize back to a 100-scale roughly (can now exceed 100 for ultimate teams)
         normalized_car_perf = weighted_car_perf / 6
         
+        # The higher the rating, the more seconds we subtract from the base lap time
+        return (normalized_car_perf / 100) * RaceSimulator.CAR_ADVANTAGE_SECONDS
+        
+    def _calculate_lap_time(self, entry: RaceEntry, index: int = 0) -> float:
+        """Calculates lap time based on driver skill, weighted car performance, and tire wear. index is the entry's position in self.entries."""
+        car_advantage = self._car_advantages.get(id(entry.car))
+        if car_advantage is None:
+            car_advantage = self._car_advantages[id(entry.car)] = self.car_advantage(entry.car, self.track)
+        
         driver_speed = entry.driver.speed # 1-100
         driver_consist = entry.driver.consistency # 1-100
-        
-        # The higher the rating, the more seconds we subtract from the base lap time
-        car_advantage = (normalized_car_perf / 100) * 4.75 
         driver_advantage = (driver_speed / 100) * 2.0
         
         # Consistency affects the randomness of the lap
         mistake_chance = (100 - driver_consist) / 100 
-        mistake_penalty = random.uniform(0.0, 1.5) if random.random() < mistake_chance else 0.0
+        mistake_penalty = self.rolls.mistake(index, self.lap, mistake_chance)
         
-        # Tire wear penalty: CLIFF EFFECT
-        tire_penalty = 0.0
-        if entry.tire_wear <= 60.0:
-            # Gentle linear wear loss up to 1 second
-            tire_penalty = (entry.tire_wear / 60.0) * 1.0
-        else:
-            # Exponential cliff loss beyond 60%
-            overage = entry.tire_wear - 60.0
-            tire_penalty = 1.0 + (min(overage, 40.0) ** 1.35) / 15.0 # Approaches ~4.0s penalty at 100%
-            
-        if entry.tire_wear > 105.0:
-             # Imminent carcass failure risk
-             tire_penalty += 5.0
+        tire_penalty = tire_model.tire_penalty(entry.tire_wear)
         
         # Base math including the compound pace advantage
         raw_lap = self.base_lap_time - car_advantage - driver_advantage + mistake_penalty + tire_penalty
         raw_lap -= entry.current_compound.pace_advantage # Softs are fundamentally faster
         return raw_lap
         
+    @staticmethod
+    def stat_lap_time_coefficients(track: Track) -> Dict[str, float]:
+        """
+        Lap time change (seconds) per +1 of each car stat on this track. _calculate_lap_time is linear in
+        the car stats, so these coefficients value any stat change exactly (negative = faster).
+        """
+        scale = RaceSimulator.CAR_ADVANTAGE_SECONDS / 600
+        return {stat_path: -scale * getattr(track, weight_attr)
+                for stat_path, weight_attr in RaceSimulator.STAT_TRACK_WEIGHTS.items()}
+        
     def _apply_tire_wear(self, entry: RaceEntry):
-        """Calculates tire wear based on chassis preservation, driver management, compound softness, and TRACK multiplier."""
+        """Adds a lap of tire wear (see tire_model.wear_per_lap)."""
         if entry.dnf: return
-        
-        base_wear = 2.1 # Base wear per lap at 1.0x multiplier
-        chassis_eff = entry.car.chassis.tire_preservation / 100
-        driver_eff = entry.driver.tire_management / 100
-        
-        # Track specific multiplier
-        track_wear_base = base_wear * self.track.tire_wear_multiplier
-        
-        # Apply the compound's specific degradation multiplier
-        compound_wear = track_wear_base * entry.current_compound.wear_rate
-        
-        # High stats reduce wear by up to 30% each
-        wear = compound_wear * (1 - (chassis_eff * 0.3)) * (1 - (driver_eff * 0.3))
-        entry.tire_wear += wear
+        entry.tire_wear += tire_model.wear_per_lap(entry.current_compound, self.track.tire_wear_multiplier,
+                                                   entry.car.chassis.tire_preservation, entry.driver.tire_management)
 
     def run_race(self) -> Dict[str, Any]:
         """Executes the headless simulation and returns the logs/results."""
+        running_order = RunningOrder(len(self.entries)) if self.large_grid else None
         for lap in range(1, self.total_laps + 1):
-            
-            for entry in self.entries:
+            self.lap = lap
+            for index, entry in enumerate(self.entries):
                 if entry.dnf:
-                    entry.total_race_time += 180.0 # Huge penalty to push them to bottom
+                    entry.total_race_time += RaceSimulator.DNF_LAP_PENALTY
                     continue
                     
                 entry.current_stint_laps += 1
-                lap_time = self._calculate_lap_time(entry)
+                lap_time = self._calculate_lap_time(entry, index)
                 self._apply_tire_wear(entry)
                 
                 # Check for absolute tire failure (DNF)
-                if entry.tire_wear > 110.0 and random.random() < 0.3:
+                if entry.tire_wear > RaceSimulator.FAILURE_WEAR and self.rolls.tire_failure(index, lap, RaceSimulator.FAILURE_CHANCE):
                     entry.dnf = True
                     entry.current_lap_time = 0.0
                     continue
                 
                 # Pitstop Strategy logic: Pit if we hit our target laps for this stint AND we have more scheduled
                 if entry.current_stint_laps >= entry.current_target_laps and entry.stints_remaining:
-                    lap_time += 22.0 # Pitlane loss
+                    lap_time += RaceSimulator.PIT_LOSS
                     entry.tire_wear = 0.0
                     entry.current_stint_laps = 0
                     
@@ -137,9 +266,9 @@ class RaceSimulator:
                     entry.current_compound = COMPOUNDS.get(next_stint["compound"], COMPOUNDS["Hard"])
                     entry.current_target_laps = next_stint["laps"]
                     entry.pit_stops += 1
-                elif entry.tire_wear > 100.0 and entry.stints_remaining:
+                elif entry.tire_wear > RaceSimulator.EMERGENCY_WEAR and entry.stints_remaining:
                     # Emergency box if we are completely dead but had a larger target plan
-                    lap_time += 25.0 # Slower pitbox interaction
+                    lap_time += RaceSimulator.EMERGENCY_PIT_LOSS
                     entry.tire_wear = 0.0
                     entry.current_stint_laps = 0
                     
@@ -151,6 +280,11 @@ class RaceSimulator:
                 
                 entry.current_lap_time = lap_time
                 entry.total_race_time += lap_time
+
+            if running_order is not None:
+                order = running_order.update([e.total_race_time for e in self.entries])
+                self.race_log.record(lap, order, self.entries)
+                continue
                 
             # Sort current standings for this lap
             lap_standings = sorted(self.entries, key=lambda e: e.total_race_time)
@@ -176,7 +310,10 @@ class RaceSimulator:
             self.race_log.append(lap_data)
             
         # Sort final standings
-        standings = sorted(self.entries, key=lambda e: e.total_race_time)
+        if running_order is not None:
+            standings = [self.entries[i] for i in running_order.order]
+        else:
+            standings = sorted(self.entries, key=lambda e: e.total_race_time)
         return {
             "standings": [{"driver": e.driver.name, "team": e.team_name, "total_time": e.total_race_time, "stops": e.pit_stops, "dnf": e.dnf} for e in standings],
             "log": self.race_log
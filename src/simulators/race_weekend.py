@@ -0,0 +1,46 @@
+from typing import Dict, Any, List
+
+from src.models.world.track import Track
+from src.simulators.race_simulator import RaceSimulator, RaceEntry
+from src.simulators.ai_strategy import build_ai_strategy, safe_stint_laps
+from src.utils.metrics import metrics
+
+
+def run_race_weekend(game_state, track: Track, d1_strategy: List[Dict[str, Any]],
+                     d2_strategy: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Qualifying and the race for a GameState (the live one or a what-if fork), scoring championship points.
+    Returns {"grid", "results"}; recording the race, advancing time and saving are left to the caller.
+    """
+    entries = []
+    # Player Team
+    entries.append(RaceEntry(game_state.drivers[0], game_state.car, game_state.team_name, d1_strategy))
+    entries.append(RaceEntry(game_state.drivers[1], game_state.car, game_state.team_name, d2_strategy))
+
+    # AI Teams (Adaptive strategy generation)
+    with metrics.span("race.ai_strategies"):
+        safe = safe_stint_laps(track)
+        for team_name, data in game_state.ai_teams.items():
+            # Generate varied AI strategies per driver
+            for d in data["drivers"]:
+                entries.append(RaceEntry(d, data["car"], team_name, build_ai_strategy(track, safe=safe)))
+
+    # Simple Quali pace sort
+    with metrics.span("race.qualifying"):
+        q_sim = RaceSimulator(entries, track)
+        for e in entries:
+            e.current_lap_time = q_sim._calculate_lap_time(e)
+        entries = sorted(entries, key=lambda e: e.current_lap_time)
+
+    grid = [{"driver": e.driver.name, "team": e.team_name, "time": f"{e.current_lap_time:.3f}"} for e in entries]
+
+    # Full Simulation
+    with metrics.span("race.run"):
+        simulator = RaceSimulator(entries, track)
+        results = simulator.run_race()
+
+    # Payout Points
+    with metrics.span("race.score_points"):
+        game_state.own("championship_manager").score_points(results["standings"])
+
+    return {"grid": grid, "results": results}
@@ -0,0 +1,255 @@
+import math
+import multiprocessing
+import os
+import random
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+from src.managers.championship_manager import ChampionshipManager
+from src.models.car.car import Car
+from src.models.car.tire.tire_compound import COMPOUNDS
+from src.models.car.tire import tire_model
+from src.models.personnel.driver import Driver
+from src.models.world.track import Track
+from src.simulators.ai_strategy import strategy_distribution
+from src.simulators.race_simulator import RaceSimulator
+
+MISTAKE_MAX = 1.5 # RaceRolls.mistake's upper bound
+
+
+class TrackLapModel:
+    """
+    One track's race compiled for a fixed grid, so a simulated race costs a few random draws per car instead of
+    a lap-by-lap run.
+
+    For every car and every strategy the AI can pick here (ai_strategy.strategy_distribution), the lap-by-lap
+    RaceSimulator walk is done once: pace, compound, tire-wear penalty and pit losses collapse to a clean race
+    time, plus the laps where the tires are past failure wear (each a RaceSimulator.FAILURE_CHANCE DNF roll). Driver mistakes
+    are the only per-lap noise left; their sum over a race is drawn from its normal approximation.
+    """
+
+    __slots__ = ("name", "laps", "cum_weights", "clean", "risk")
+
+    def __init__(self, track: Track, grid: Sequence[Tuple[Driver, Car]]):
+        self.name = track.name
+        self.laps = track.laps
+        distribution = strategy_distribution(track)
+        self.cum_weights = []
+        total = 0.0
+        for probability, _ in distribution:
+            total += probability
+            self.cum_weights.append(total)
+        self.cum_weights[-1] = 1.0 # Guard against float drift leaving a sliver past the last strategy
+
+        self.clean: List[List[float]] = [] # [car][strategy] -> race time without mistakes
+        self.risk: List[List[tuple]] = [] # [car][strategy] -> ((race lap, time before that lap), ...) of failure rolls
+        for driver, car in grid:
+            lap_base = track.base_lap_time - RaceSimulator.car_advantage(car, track) - (driver.speed / 100) * 2.0
+            tables = {name: tire_model.stint_table(name, track.tire_wear_multiplier, car.chassis.tire_preservation,
+                                                   driver.tire_management, track.laps) for name in COMPOUNDS}
+            walks = [self._walk(strategy, lap_base, tables) for _, strategy in distribution]
+            self.clean.append([time for time, _ in walks])
+            self.risk.append([risk for _, risk in walks])
+
+    def _walk(self, strategy: List[Dict[str, Any]], lap_base: float, tables) -> Tuple[float, tuple]:
+        """Clean race time and failure-roll laps for one car on one strategy (pit rules as in run_race)."""
+        stints = strategy or [{"compound": "Hard", "laps": 100}]
+        time, lap, risk = 0.0, 0, []
+        for n, stint in enumerate(stints):
+            table = tables.get(stint["compound"], tables["Hard"])
+            remaining = self.laps - lap
+            length, loss = remaining, 0.0
+            if n < len(stints) - 1:
+                # Box at the planned lap, or earlier once the set is past emergency wear (the planned lap wins ties)
+                target, emergency = max(1, stint["laps"]), table.laps_until(RaceSimulator.EMERGENCY_WEAR)
+                if min(target, emergency) <= remaining:
+                    length, loss = ((target, RaceSimulator.PIT_LOSS) if target <= emergency
+                                    else (emergency, RaceSimulator.EMERGENCY_PIT_LOSS))
+            for k in range(table.laps_until(RaceSimulator.FAILURE_WEAR), length + 1):
+                risk.append((lap + k, time + (k - 1) * lap_base + table.stint_time(k - 1)))
+            time += length * lap_base + table.stint_time(length) + loss
+            lap += length
+            if lap >= self.laps:
+                break
+        return time, tuple(risk)
+
+
+class ProjectionModel:
+    """
+    Everything a worker needs to simulate the rest of a season: the grid (names, teams, mistake statistics),
+    the starting points and one TrackLapModel per remaining race. Plain data, so it pickles to worker processes.
+    """
+
+    def __init__(self, grid: Sequence[Tuple[Driver, Car, str]], tracks: Sequence[Track],
+                 driver_points: Dict[str, int], constructor_points: Dict[str, int]):
+        self.drivers = [driver.name for driver, _, _ in grid]
+        self.teams = sorted({team for _, _, team in grid} | set(constructor_points))
+        self.team_of = [self.teams.index(team) for _, _, team in grid]
+        self.start_driver_points = [driver_points.get(name, 0) for name in self.drivers]
+        self.start_team_points = [constructor_points.get(team, 0) for team in self.teams]
+        self.tracks = [TrackLapModel(track, [(driver, car) for driver, car, _ in grid]) for track in tracks]
+
+        # Per-lap mistake: uniform(0, MISTAKE_MAX) with probability (100 - consistency) / 100
+        self.mistake_mean, self.mistake_sd = [], []
+        for driver, _, _ in grid:
+            chance = (100 - driver.consistency) / 100
+            mean = chance * MISTAKE_MAX / 2
+            self.mistake_mean.append(mean)
+            self.mistake_sd.append(math.sqrt(max(0.0, chance * MISTAKE_MAX ** 2 / 3 - mean ** 2)))
+
+    def simulate(self, seed, seasons: int) -> Dict[str, List[float]]:
+        """Runs `seasons` seeded seasons and returns summed final points and title counts per driver and team."""
+        rng = random.Random(seed)
+        draw, gauss = rng.random, rng.gauss
+        points_system = ChampionshipManager.POINTS_SYSTEM
+        failure_chance, dnf_lap_penalty = RaceSimulator.FAILURE_CHANCE, RaceSimulator.DNF_LAP_PENALTY
+        entries = range(len(self.drivers))
+        team_of = self.team_of
+        driver_totals = [0.0] * len(self.drivers)
+        team_totals = [0.0] * len(self.teams)
+        driver_titles = [0] * len(self.drivers)
+        team_titles = [0] * len(self.teams)
+        times = [0.0] * len(self.drivers)
+        # Mistake mean/sd over a full race distance, per track and car
+        full_race = [([track.laps * mean for mean in self.mistake_mean],
+                      [math.sqrt(track.laps) * sd for sd in self.mistake_sd]) for track in self.tracks]
+
+        for _ in range(seasons):
+            points = list(self.start_driver_points)
+            for track, (race_mean, race_sd) in zip(self.tracks, full_race):
+                laps, cum_weights, clean, risk = track.laps, track.cum_weights, track.clean, track.risk
+                for i in entries:
+                    s = bisect_right(cum_weights, draw())
+                    rolls = risk[i][s]
+                    if rolls:
+                        for lap, before in rolls:
+                            if draw() < failure_chance:
+                                counted = lap - 1
+                                times[i] = (before + dnf_lap_penalty * (laps - lap) + counted * self.mistake_mean[i]
+                                            + math.sqrt(counted) * self.mistake_sd[i] * gauss(0.0, 1.0))
+                                break
+                        else:
+                            times[i] = clean[i][s] + race_mean[i] + race_sd[i] * gauss(0.0, 1.0)
+                    else:
+                        times[i] = clean[i][s] + race_mean[i] + race_sd[i] * gauss(0.0, 1.0)
+                for position, i in enumerate(sorted(entries, key=times.__getitem__)[:len(points_system)]):
+                    points[i] += points_system[position]
+
+            team_points = list(self.start_team_points)
+            for i in entries:
+                team_points[team_of[i]] += points[i] - self.start_driver_points[i]
+                driver_totals[i] += points[i]
+            for t, value in enumerate(team_points):
+                team_totals[t] += value
+            driver_titles[max(entries, key=points.__getitem__)] += 1
+            team_titles[max(range(len(team_points)), key=team_points.__getitem__)] += 1
+
+        return {"seasons": seasons, "driver_points": driver_totals, "team_points": team_totals,
+                "driver_titles": driver_titles, "team_titles": team_titles}
+
+
+# Worker processes receive the model once, through the pool initializer, rather than with every chunk
+_worker_model: Optional[ProjectionModel] = None
+
+def _init_worker(model: ProjectionModel):
+    global _worker_model
+    _worker_model = model
+
+def _simulate_chunk(seed, seasons: int) -> Dict[str, List[float]]:
+    return _worker_model.simulate(seed, seasons)
+
+
+class SeasonProjection:
+    """
+    Monte Carlo projection of the championship: simulates the remaining races many times over with the current
+    cars, drivers and standings, and reports title probabilities and expected final points.
+
+    Assumes today's cars for the rest of the season (no further upgrades) and the AI's strategy mix for every
+    car, the player's included. Seasons are split into seeded chunks (seed, chunk index), so results for a given
+    seed don't depend on how many worker processes ran them.
+    """
+
+    CHUNK_SEASONS = 250
+
+    def __init__(self, model: ProjectionModel):
+        self.model = model
+
+    @classmethod
+    def from_game_state(cls, game_state, calendar: Sequence[Track]) -> 'SeasonProjection':
+        grid = [(driver, game_state.car, game_state.team_name) for driver in game_state.drivers]
+        for team_name, data in game_state.ai_teams.items():
+            grid.extend((driver, data["car"], team_name) for driver in data["drivers"])
+        manager = game_state.championship_manager
+        return cls(ProjectionModel(grid, calendar[game_state.current_race_index:],
+                                   manager.driver_standings, manager.constructor_standings))
+
+    def run(self, seasons: int = 10_000, workers: Optional[int] = None, seed=None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields {"type": "progress", ...} after every finished chunk and finally {"type": "result", ...}.
+        workers defaults to, and is capped at, the CPU count; with one worker (or a single chunk) everything runs
+        in-process.
+        """
+        if seasons < 1:
+            raise ValueError("seasons must be at least 1.")
+        seed = random.Random().getrandbits(32) if seed is None else seed
+        chunks = [(f"{seed}:{n}", min(self.CHUNK_SEASONS, seasons - start))
+                  for n, start in enumerate(range(0, seasons, self.CHUNK_SEASONS))]
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(workers or cpus, cpus, len(chunks))) # More processes than cores only adds spawn cost
+
+        partials = []
+        if workers == 1:
+            for chunk in chunks:
+                partials.append(self.model.simulate(*chunk))
+                yield self._progress(partials, seasons)
+        else:
+            # spawn, not fork: the server process has logging/metrics threads whose locks a fork could copy held
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker, initargs=(self.model,)) as pool:
+                for future in as_completed([pool.submit(_simulate_chunk, *chunk) for chunk in chunks]):
+                    partials.append(future.result())
+                    yield self._progress(partials, seasons)
+        yield self._result(partials, seed, workers)
+
+    def project(self, seasons: int = 10_000, workers: Optional[int] = None, seed=None) -> Dict[str, Any]:
+        """Runs the projection to completion and returns only the result."""
+        for update in self.run(seasons, workers, seed):
+            pass
+        return update
+
+    @staticmethod
+    def _progress(partials: List[Dict[str, Any]], total: int) -> Dict[str, Any]:
+        return {"type": "progress", "completed": sum(p["seasons"] for p in partials), "total": total}
+
+    def _result(self, partials: List[Dict[str, Any]], seed, workers: int) -> Dict[str, Any]:
+        model = self.model
+        seasons = sum(p["seasons"] for p in partials)
+
+        def summed(key: str, size: int) -> List[float]:
+            return [sum(p[key][i] for p in partials) for i in range(size)]
+
+        driver_points, driver_titles = summed("driver_points", len(model.drivers)), summed("driver_titles", len(model.drivers))
+        team_points, team_titles = summed("team_points", len(model.teams)), summed("team_titles", len(model.teams))
+        drivers = [{
+            "driver": name,
+            "team": model.teams[model.team_of[i]],
+            "points": model.start_driver_points[i],
+            "expected_points": round(driver_points[i] / seasons, 2),
+            "title_probability": driver_titles[i] / seasons
+        } for i, name in enumerate(model.drivers)]
+        constructors = [{
+            "team": team,
+            "points": model.start_team_points[t],
+            "expected_points": round(team_points[t] / seasons, 2),
+            "title_probability": team_titles[t] / seasons
+        } for t, team in enumerate(model.teams)]
+        return {
+            "type": "result",
+            "seasons": seasons,
+            "races_remaining": len(model.tracks),
+            "seed": seed,
+            "workers": workers,
+            "drivers": sorted(drivers, key=lambda d: d["expected_points"], reverse=True),
+            "constructors": sorted(constructors, key=lambda c: c["expected_points"], reverse=True)
+        }
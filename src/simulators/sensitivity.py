@@ -0,0 +1,142 @@
+import random
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from src.managers.championship_manager import ChampionshipManager
+from src.models.car.car import Car
+from src.models.personnel.driver import Driver
+from src.models.world.track import Track
+from src.simulators.ai_strategy import build_ai_strategy, safe_stint_laps
+from src.simulators.monte_carlo import RaceExperiment, RaceStreams, MonteCarloRunner
+from src.simulators.race_simulator import RaceSimulator, RaceEntry
+
+DRIVER_STATS = ("driver.speed", "driver.consistency", "driver.tire_management")
+SENSITIVITY_STATS = Car.STAT_PATHS + DRIVER_STATS
+
+
+class SensitivityExperiment(RaceExperiment):
+    """
+    One race, one subject driver: how the subject's finishing position and points move per +1 of each car and
+    driver stat. Plain data, so it pickles to worker processes.
+
+    Each sample draws every car's strategy once, then runs the race at stat - step and stat + step for every stat
+    with exactly those strategies and the same per-entry/lap RaceStreams (common random numbers). The central
+    difference of the two outcomes therefore only reflects the stat change, not a different race.
+    """
+
+    def __init__(self, grid: Sequence[Tuple[Driver, Car, str]], track: Track, subject: int = 0, step: int = 2):
+        super().__init__(track, len(grid))
+        self.grid = list(grid)
+        self.subject = subject
+        self.step = step
+        self.safe = safe_stint_laps(track)
+        self.metrics = ["position", "points"]
+        for stat_path in SENSITIVITY_STATS:
+            self.metrics.extend((f"{stat_path}:position", f"{stat_path}:points"))
+        # The early stop waits for the position derivatives (points ones are on a ~3x larger scale)
+        self.precision_metrics = [f"{stat_path}:position" for stat_path in SENSITIVITY_STATS]
+        self.races_per_measure = 1 + 2 * len(SENSITIVITY_STATS)
+
+    def _outcome(self, strategies: List[List[Dict[str, Any]]], streams: RaceStreams,
+                 stat_path: Optional[str] = None, change: int = 0) -> Tuple[int, int]:
+        """(finishing position, points) of the subject in one race on `streams`, with one stat shifted by `change`."""
+        subject_driver, subject_car, _ = self.grid[self.subject]
+        driver, car = subject_driver, subject_car
+        if stat_path:
+            component, stat = stat_path.split(".")
+            if component == "driver":
+                driver = subject_driver.copy()
+                setattr(driver, stat, getattr(driver, stat) + change)
+            else:
+                # The car is shared with the teammate, who races the modified car too
+                car = subject_car.copy()
+                module = getattr(car, component)
+                setattr(module, stat, getattr(module, stat) + change)
+
+        entries = []
+        for i, (d, c, team) in enumerate(self.grid):
+            entry = RaceEntry(driver if i == self.subject else d, car if c is subject_car else c, team, strategies[i])
+            entries.append(entry)
+        subject_entry = entries[self.subject]
+        RaceSimulator(entries, self.track, rolls=streams).run_race()
+
+        position = 1 + sum(1 for e in entries if e.total_race_time < subject_entry.total_race_time)
+        points_system = ChampionshipManager.POINTS_SYSTEM
+        return position, points_system[position - 1] if position <= len(points_system) else 0
+
+    def prepare(self, rng: random.Random) -> List[List[Dict[str, Any]]]:
+        return [build_ai_strategy(self.track, rng, self.safe) for _ in self.grid]
+
+    def measure(self, strategies: List[List[Dict[str, Any]]], streams: RaceStreams) -> List[float]:
+        values = list(self._outcome(strategies, streams))
+        for stat_path in SENSITIVITY_STATS:
+            high = self._outcome(strategies, streams, stat_path, self.step)
+            low = self._outcome(strategies, streams, stat_path, -self.step)
+            values.append((high[0] - low[0]) / (2 * self.step))
+            values.append((high[1] - low[1]) / (2 * self.step))
+        return values
+
+
+class SensitivityAnalysis:
+    """
+    Finite-difference sensitivity of a driver's race result to every car and driver stat, estimated with common
+    random numbers by a MonteCarloRunner (antithetic replays are opt-in).
+
+    A run costs up to samples * (2 * len(SENSITIVITY_STATS) + 1) races, twice that with antithetic pairs, and
+    stops early once every position derivative is known to within `precision`. A given seed gives the same
+    estimates however many workers ran them.
+    """
+
+    def __init__(self, experiment: SensitivityExperiment):
+        self.experiment = experiment
+
+    @classmethod
+    def from_game_state(cls, game_state, track: Track, driver_index: int = 0, step: int = 2) -> 'SensitivityAnalysis':
+        grid = [(driver, game_state.car, game_state.team_name) for driver in game_state.drivers]
+        for team_name, data in game_state.ai_teams.items():
+            grid.extend((driver, data["car"], team_name) for driver in data["drivers"])
+        return cls(SensitivityExperiment(grid, track, driver_index, step))
+
+    @staticmethod
+    def races_for(samples: int, antithetic: bool = False) -> int:
+        return samples * (2 * len(SENSITIVITY_STATS) + 1) * (2 if antithetic else 1)
+
+    def run(self, samples: int = 200, workers: Optional[int] = None, seed=None, precision: Optional[float] = None,
+            antithetic: bool = False) -> Dict[str, Any]:
+        """
+        Estimates d(position)/d(stat) and d(points)/d(stat) per +1 of each stat, with standard errors and 95%
+        confidence intervals. `samples` is the cap when `precision` is given.
+        """
+        if samples < 2:
+            raise ValueError("samples must be at least 2.")
+        runner = MonteCarloRunner(self.experiment, antithetic=antithetic)
+        run = runner.run(samples, precision, workers, seed)
+        metrics = run["metrics"]
+
+        def estimate(name: str) -> Dict[str, Any]:
+            metric = metrics[name]
+            return {
+                "per_point": metric["mean"],
+                "standard_error": round(metric["half_width"] / runner.z, 4),
+                "ci_low": metric["ci_low"],
+                "ci_high": metric["ci_high"]
+            }
+
+        driver, _, team = self.experiment.grid[self.experiment.subject]
+        return {
+            "driver": driver.name,
+            "team": team,
+            "track": self.experiment.track.name,
+            "samples": run["samples"],
+            "races": run["races"],
+            "antithetic": antithetic,
+            "precision": precision,
+            "stopped_early": run["stopped_early"],
+            "step": self.experiment.step,
+            "seed": run["seed"],
+            "workers": run["workers"],
+            "expected_position": round(metrics["position"]["mean"], 3),
+            "expected_points": round(metrics["points"]["mean"], 3),
+            "stats": {stat_path: {"position": estimate(f"{stat_path}:position"),
+                                  "points": estimate(f"{stat_path}:points")}
+                      for stat_path in SENSITIVITY_STATS}
+        }
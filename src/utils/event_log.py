@@ -0,0 +1,231 @@
+import atexit
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+ROOT_LOGGER = "f1"
+
+
+class Sampler:
+    """
+    Keeps 1 in every N events per category. Counter based (not random) so it never touches the
+    simulation's RNG and batch runs stay reproducible. WARNING and above are always kept.
+    """
+
+    def __init__(self, every: Optional[Dict[str, int]] = None):
+        self.every: Dict[str, int] = dict(every or {})
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def keep(self, level: int, category: str) -> bool:
+        every = self.every.get(category, 1)
+        if every <= 1 or level >= logging.WARNING:
+            return True
+        with self._lock:
+            seen = self._seen.get(category, 0)
+            self._seen[category] = seen + 1
+        return seen % every == 0
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent events as structured dicts for the API (e.g. the R&D activity feed)."""
+
+    def __init__(self, capacity: int = 2000):
+        super().__init__()
+        self.buffer: deque = deque(maxlen=capacity)
+        self._sequence = itertools.count(1)
+
+    def emit(self, record: logging.LogRecord):
+        self.buffer.append({
+            "seq": next(self._sequence),
+            "time": record.created,
+            "level": record.levelname,
+            "category": getattr(record, "category", record.name),
+            "event": getattr(record, "event", ""),
+            "message": record.getMessage(),
+            **getattr(record, "fields", {})
+        })
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Copy of the buffer, safe while other threads keep logging."""
+        with self.lock:
+            return list(self.buffer)
+
+
+class EventLog:
+    """
+    Leveled, structured game event logger replacing the old unconditional prints.
+
+    Events are stdlib logging records on the "f1.<category>" loggers, carrying an event name and a dict of fields.
+    Every event that passes its category's level and sampling rate is:
+      - kept in an in-memory ring buffer, queryable through records(), and
+      - handed to a QueueHandler, so the console write happens on a listener thread instead of the simulation thread.
+
+    Configuration (environment, read once at import):
+      F1_LOG_LEVEL=INFO                      default level for every category
+      F1_LOG_LEVELS=rd.ai=WARNING,finance=DEBUG   per-category levels
+      F1_LOG_SAMPLE=rd.ai=10                 keep 1 in N events of a category
+      F1_LOG_CONSOLE=0                       don't echo events to stdout at all
+    """
+
+    def __init__(self, level: int = logging.INFO, capacity: int = 2000,
+                 sample_every: Optional[Dict[str, int]] = None, console: bool = True):
+        self.root = logging.getLogger(ROOT_LOGGER)
+        self.root.setLevel(level)
+        self.root.propagate = False # uvicorn/root handlers must not print events a second time
+        self.sampler = Sampler(sample_every)
+        self.ring = RingBufferHandler(capacity)
+        self.root.addHandler(self.ring)
+
+        self.console = console
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._listener_lock = threading.Lock()
+        if console:
+            self.root.addHandler(logging.handlers.QueueHandler(self._queue))
+            atexit.register(self.flush)
+        self._loggers: Dict[str, logging.Logger] = {}
+        self._muted = threading.local()
+
+    @classmethod
+    def from_env(cls) -> 'EventLog':
+        """
+        Builds the log from the F1_LOG_* variables. Unknown level names and non-numeric sample rates are skipped
+        with a warning instead of failing the import: the default level falls back to INFO, a category keeps
+        the default level and sampling.
+        """
+        def pairs(variable: str) -> Dict[str, str]:
+            raw = os.environ.get(variable, "")
+            return dict(item.split("=", 1) for item in raw.split(",") if "=" in item)
+
+        problems: List[str] = []
+
+        def level_of(variable: str, name: str) -> Optional[int]:
+            level = logging.getLevelName(name.strip().upper())
+            if isinstance(level, int):
+                return level
+            problems.append(f"{variable}: unknown level '{name}'")
+            return None
+
+        sample_every: Dict[str, int] = {}
+        for category, n in pairs("F1_LOG_SAMPLE").items():
+            try:
+                sample_every[category] = int(n)
+            except ValueError:
+                problems.append(f"F1_LOG_SAMPLE: '{n}' for {category} is not a number, keeping every event")
+
+        level = level_of("F1_LOG_LEVEL", os.environ.get("F1_LOG_LEVEL", "INFO"))
+        log = cls(level=logging.INFO if level is None else level,
+                  sample_every=sample_every,
+                  console=os.environ.get("F1_LOG_CONSOLE", "1") != "0")
+        for category, name in pairs("F1_LOG_LEVELS").items():
+            level = level_of("F1_LOG_LEVELS", name)
+            if level is not None: # Otherwise the category keeps inheriting the default level
+                log.set_level(category, level)
+        for problem in problems:
+            log.warning("log", "bad_config", f"Ignoring invalid log setting - {problem}")
+        return log
+
+    # --- Configuration ---
+
+    def logger(self, category: str) -> logging.Logger:
+        if category not in self._loggers:
+            self._loggers[category] = logging.getLogger(f"{ROOT_LOGGER}.{category}")
+        return self._loggers[category]
+
+    def set_level(self, category: str, level):
+        """Per-category level, e.g. set_level("rd.ai", "WARNING"). Sub-categories inherit it."""
+        self.logger(category).setLevel(level.upper() if isinstance(level, str) else level)
+
+    def set_sampling(self, category: str, every: int):
+        """Keep only 1 in `every` events below WARNING for this category."""
+        self.sampler.every[category] = max(1, every)
+
+    def is_enabled(self, level: int, category: str) -> bool:
+        """Cheap check for callers that want to skip building an expensive message."""
+        return self.logger(category).isEnabledFor(level)
+
+    # --- Emitting ---
+
+    @contextmanager
+    def muted(self):
+        """Drops every event emitted by this thread inside the block (hypothetical what-if runs)."""
+        previous = getattr(self._muted, "active", False)
+        self._muted.active = True
+        try:
+            yield
+        finally:
+            self._muted.active = previous
+
+    def emit(self, level: int, category: str, event: str, message: str, **fields):
+        if getattr(self._muted, "active", False):
+            return
+        logger = self.logger(category)
+        if not logger.isEnabledFor(level) or not self.sampler.keep(level, category):
+            return
+        if self.console and self._listener is None:
+            self._start_listener()
+        logger.log(level, message, extra={"category": category, "event": event, "fields": fields})
+
+    def debug(self, category: str, event: str, message: str, **fields):
+        self.emit(logging.DEBUG, category, event, message, **fields)
+
+    def info(self, category: str, event: str, message: str, **fields):
+        self.emit(logging.INFO, category, event, message, **fields)
+
+    def warning(self, category: str, event: str, message: str, **fields):
+        self.emit(logging.WARNING, category, event, message, **fields)
+
+    def error(self, category: str, event: str, message: str, **fields):
+        self.emit(logging.ERROR, category, event, message, **fields)
+
+    # --- Reading back ---
+
+    def records(self, category: Optional[str] = None, after: int = 0, limit: int = 100,
+                **match) -> List[Dict[str, Any]]:
+        """
+        Most recent structured events, oldest first. `category` matches itself and its sub-categories
+        ("rd" also returns "rd.ai"); `after` is a seq cursor; extra keyword filters match fields exactly (team=...).
+        """
+        prefix = f"{category}." if category else None
+        selected = []
+        for record in reversed(self.ring.snapshot()):
+            if record["seq"] <= after:
+                break
+            if category and record["category"] != category and not record["category"].startswith(prefix):
+                continue
+            if any(record.get(key) != value for key, value in match.items()):
+                continue
+            selected.append(record)
+            if len(selected) >= limit:
+                break
+        selected.reverse()
+        return selected
+
+    # --- Console listener ---
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener is not None:
+                return
+            console = logging.StreamHandler(sys.stdout)
+            console.setFormatter(logging.Formatter("%(message)s"))
+            self._listener = logging.handlers.QueueListener(self._queue, console)
+            self._listener.start()
+
+    def flush(self):
+        """Stops the listener thread after writing everything queued so far (it restarts on the next event)."""
+        with self._listener_lock:
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+
+
+event_log = EventLog.from_env()
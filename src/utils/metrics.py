@@ -0,0 +1,145 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Tuple
+
+# Latency buckets (seconds) shared by every span histogram
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (per-bucket counts; render() makes them cumulative)."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, bucket_count: int):
+        self.counts = [0] * (bucket_count + 1) # Last slot is the +Inf overflow
+        self.total = 0.0
+        self.count = 0
+
+
+class Metrics:
+    """
+    In-process counters and span latency histograms, rendered in the Prometheus text exposition format.
+
+    Spans time a block (`with metrics.span("race.run"):`) or a function (`@metrics.timed("save.save_game")`).
+    When disabled (F1_METRICS=0), span() hands back a shared no-op context manager and counters return
+    immediately, so instrumented hot paths pay one attribute check.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "f1"):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.prefix = prefix
+        self._spans: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._lock = threading.Lock()
+        self._disabled_span = nullcontext()
+
+    # --- Recording ---
+
+    def observe(self, span: str, seconds: float):
+        """Adds one duration to a span's histogram."""
+        with self._lock:
+            histogram = self._spans.get(span)
+            if histogram is None:
+                histogram = self._spans[span] = Histogram(len(self.buckets))
+            histogram.counts[bisect_left(self.buckets, seconds)] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    @contextmanager
+    def _timed_span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def span(self, name: str):
+        """Context manager timing the wrapped block into the `name` span."""
+        if not self.enabled:
+            return self._disabled_span
+        return self._timed_span(name)
+
+    def timed(self, name: str):
+        """Decorator form of span(). The enabled check happens per call, so toggling at runtime works."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increments a counter. `name` is used as is (Prometheus style, e.g. "f1_race_simulations_total")."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    # --- Reading ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON friendly summary: count, total and mean seconds per span, plus raw counters."""
+        with self._lock:
+            spans = {name: {"count": h.count, "total_seconds": round(h.total, 6),
+                            "mean_ms": round(h.total / h.count * 1000, 3) if h.count else None}
+                     for name, h in self._spans.items()}
+            counters = {name: {",".join(f"{k}={v}" for k, v in key): value for key, value in series.items()}
+                        for name, series in self._counters.items()}
+        return {"enabled": self.enabled, "spans": spans, "counters": counters}
+
+    @staticmethod
+    def _labels(pairs: LabelKey) -> str:
+        if not pairs:
+            return ""
+        escaped = (label + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                   for label, value in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4)."""
+        metric = f"{self.prefix}_span_seconds"
+        lines: List[str] = [
+            f"# HELP {metric} Time spent in instrumented code spans.",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            for name in sorted(self._spans):
+                h = self._spans[name]
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {h.total!r}')
+                lines.append(f'{metric}_count{{span="{name}"}} {h.count}')
+
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{self._labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Set F1_METRICS=0 to disable collection
+metrics = Metrics(enabled=os.environ.get("F1_METRICS", "1") != "0")
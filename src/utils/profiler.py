@@ -0,0 +1,131 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+
+class StackSampler:
+    """
+    Low-overhead wall-clock sampling profiler for a running server.
+
+    Every `interval` seconds it reads sys._current_frames() and counts each thread's call stack. Nothing is
+    installed in the interpreter (no settrace/setprofile), so threads run at full speed between samples.
+    The result is in the collapsed-stack format ("thread;module:func;module:func count") that flamegraph.pl,
+    speedscope and inferno read directly.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+        return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+    def _collapse(self, frame) -> List[str]:
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(self._frame_label(frame))
+            frame = frame.f_back
+        stack.reverse() # Root first
+        return stack
+
+    def sample(self, seconds: float, include_idle: bool = False) -> Dict[str, Any]:
+        """
+        Samples every thread except the caller for `seconds`. Idle threads (blocked in the threading/selector/queue
+        machinery) are left out unless include_idle is set, so the report shows where work actually happens.
+        """
+        me = threading.get_ident()
+        names = {}
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            names.update({t.ident: t.name for t in threading.enumerate()})
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = self._collapse(frame)
+                if not include_idle and stack and StackSampler._is_idle(stack[-1]):
+                    continue
+                stacks[";".join([names.get(ident, str(ident))] + stack)] += 1
+            samples += 1
+            time.sleep(self.interval)
+
+        return {
+            "seconds": seconds,
+            "interval_ms": self.interval * 1000,
+            "samples": samples,
+            "collapsed": "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        }
+
+    @staticmethod
+    def _is_idle(leaf: str) -> bool:
+        module = leaf.split(":", 1)[0]
+        return module in ("threading", "selectors", "queue", "concurrent.futures.thread", "asyncio.base_events")
+
+
+class MemoryTracker:
+    """
+    tracemalloc snapshot diffs. The first call starts tracing; each later diff compares against the previous
+    snapshot, so repeated calls show what grew in between (RDNode dicts, race logs, staff objects...).
+    Tracing costs memory and CPU, so stop() it once the investigation is over.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def diff(self, seconds: float = 0.0, top: int = 25, group_by: str = "lineno") -> Dict[str, Any]:
+        """
+        Top allocation sites by growth. With seconds > 0 it waits that long between snapshots; otherwise it
+        diffs against the previous call (or just starts tracing, if this is the first one).
+        """
+        started_now = not tracemalloc.is_tracing()
+        if started_now:
+            tracemalloc.start(self.frames)
+            self._baseline = None
+        if seconds > 0 or self._baseline is None:
+            self._baseline = self._snapshot()
+            if seconds <= 0:
+                return {"status": "tracing_started", "top": []}
+            time.sleep(seconds)
+
+        current = self._snapshot()
+        stats = current.compare_to(self._baseline, group_by)
+        self._baseline = current
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "status": "success",
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "top": [{
+                "site": str(stat.traceback[0]) if stat.traceback else "?",
+                "size_diff_bytes": stat.size_diff,
+                "size_bytes": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count
+            } for stat in stats[:top]]
+        }
+
+    def stop(self):
+        self._baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+# Debug endpoints are off unless F1_DEBUG_TOKEN is set; callers must send it in the X-Debug-Token header
+DEBUG_TOKEN = os.environ.get("F1_DEBUG_TOKEN")
@@ -1,6 +1,8 @@
 import json
 import os
 from typing import Dict, Any, Optional
+from src.utils.event_log import event_log
+from src.utils.metrics import metrics
 
 class SaveLoadManager:
     """Handles serializing the GameState to and from JSON format."""
@@ -38,19 +40,23 @@ class SaveLoadManager:
             with open(filepath, 'w') as f:
                 f.write(slot_name)
         except Exception as e:
-            print(f"Error writing last active slot: {e}")
+            event_log.error("save", "slot_write_failed", f"Error writing last active slot: {e}", slot=slot_name)
 
+    @metrics.timed("save.save_game")
     def save_game(self, slot_name: str, state_data: Dict[str, Any]) -> bool:
         """Saves a dictionary representing the game state to a JSON file."""
         filepath = os.path.join(self.save_dir, f"{slot_name}.json")
         try:
             with open(filepath, 'w') as f:
                 json.dump(state_data, f, indent=4)
+            metrics.inc("f1_saves_total", result="ok")
             return True
         except Exception as e:
-            print(f"Error saving game: {e}")
+            metrics.inc("f1_saves_total", result="error")
+            event_log.error("save", "save_failed", f"Error saving game: {e}", slot=slot_name)
             return False
 
+    @metrics.timed("save.load_game")
     def load_game(self, slot_name: str) -> Dict[str, Any]:
         """Loads a game state dictionary from a JSON file. Returns empty dict if not found."""
         filepath = os.path.join(self.save_dir, f"{slot_name}.json")
@@ -61,9 +67,17 @@ class SaveLoadManager:
             with open(filepath, 'r') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Error loading game: {e}")
+            event_log.error("save", "load_failed", f"Error loading game: {e}", slot=slot_name)
             return {}
 
+    def history_path(self, slot_name: str) -> str:
+        """Path of the slot's race history database (src/database/race_history.py), kept beside the save."""
+        return os.path.join(self.save_dir, f"{slot_name}.history.sqlite3")
+
+    def telemetry_dir(self, slot_name: str) -> str:
+        """Directory of the slot's per-race lap telemetry files (src/database/telemetry_archive.py)."""
+        return os.path.join(self.save_dir, f"{slot_name}.telemetry")
+
     def get_save_slots(self) -> list[str]:
         """Returns a list of available save slot names."""
         if not os.path.exists(self.save_dir):
@@ -0,0 +1,57 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+
+class StartupReport:
+    """
+    Records how long each phase of the API cold start takes (imports, catalog prebuild, save warm-up...).
+    Phases may finish on background threads, so recording is lock-protected.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, started: float, finished: float, **details):
+        """Stores a phase measured with time.perf_counter() stamps."""
+        with self._lock:
+            self.phases.append({
+                "phase": name,
+                "start_ms": round((started - self.origin) * 1000, 3),
+                "duration_ms": round((finished - started) * 1000, 3),
+                "thread": threading.current_thread().name,
+                **details
+            })
+
+    @contextmanager
+    def phase(self, name: str, **details):
+        """Context manager timing the wrapped block as a named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter(), **details)
+
+    def mark_ready(self):
+        """Marks the moment the server could accept its first request."""
+        self.ready_at = time.perf_counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = list(self.phases)
+        return {
+            "ready_ms": round((self.ready_at - self.origin) * 1000, 3) if self.ready_at else None,
+            "phases": phases
+        }
+
+    def format(self) -> str:
+        """Human readable table for the server log."""
+        report = self.to_dict()
+        lines = [f"Startup ready in {report['ready_ms']} ms"]
+        for p in report["phases"]:
+            lines.append(f"  {p['phase']:<24} {p['duration_ms']:>10.3f} ms  (t+{p['start_ms']:.1f} ms, {p['thread']})")
+        return "\n".join(lines)
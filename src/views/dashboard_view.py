@@ -129,6 +129,7 @@ class DashboardView(BaseView):
                 return "RACE_WEEKEND"
                 
             elif event.ui_element == self.btn_cheat:
+                self.game_state.stamp_finances()
                 self.game_state.finance_manager.cheat_add_funds(10_000_000)
                 self.on_exit()
                 self.on_enter()
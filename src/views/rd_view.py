@@ -123,7 +123,8 @@ class RDView(BaseView):
                 node_id = self.action_buttons[event.ui_element]
                 node = self.game_state.rd_manager.nodes.get(node_id)
                 # Attempt to spend money
-                if self.game_state.finance_manager.spend(node.cost):
+                self.game_state.stamp_finances()
+                if self.game_state.finance_manager.spend(node.cost, category="development", note=node.name):
                     self.game_state.rd_manager.start_project(node_id)
                     # Hack: reload the view completely to reflect new state
                     self.on_exit()